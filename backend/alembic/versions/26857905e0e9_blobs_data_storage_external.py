@@ -0,0 +1,32 @@
+"""blobs data storage external
+
+Revision ID: 26857905e0e9
+Revises: abc091f6e8e7
+Create Date: 2026-10-18 12:29:12.872220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26857905e0e9'
+down_revision: Union[str, Sequence[str], None] = 'abc091f6e8e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: uncompressed out-of-line TOAST lets substr() read just the slice.
+    # Applies to values written from now on; existing rows keep their storage until rewritten.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE blobs ALTER COLUMN data SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE blobs ALTER COLUMN data SET STORAGE EXTENDED")
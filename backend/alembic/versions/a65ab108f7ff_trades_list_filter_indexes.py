@@ -0,0 +1,47 @@
+"""trades list filter indexes
+
+Revision ID: a65ab108f7ff
+Revises: ea524e8b1970
+Create Date: 2026-10-18 11:10:12.036276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a65ab108f7ff'
+down_revision: Union[str, Sequence[str], None] = 'ea524e8b1970'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_trades_user_id_status_symbol_closed_at',
+        'trades',
+        ['user_id', 'status', 'symbol', 'closed_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_trades_user_id_status_created_at',
+        'trades',
+        ['user_id', 'status', 'created_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_trades_user_id_symbol_created_at',
+        'trades',
+        ['user_id', 'symbol', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trades_user_id_symbol_created_at', table_name='trades')
+    op.drop_index('ix_trades_user_id_status_created_at', table_name='trades')
+    op.drop_index('ix_trades_user_id_status_symbol_closed_at', table_name='trades')
@@ -0,0 +1,58 @@
+"""blobs table for chart image dedup
+
+Revision ID: abc091f6e8e7
+Revises: c95af06ee2b2
+Create Date: 2026-10-18 11:54:50.253126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'abc091f6e8e7'
+down_revision: Union[str, Sequence[str], None] = 'c95af06ee2b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('byte_size', sa.Integer(), nullable=False),
+    sa.Column('refcount', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+
+    # One blob per distinct hash, refcount = rows using it; DB-resident bytes move over once
+    op.execute("""
+        INSERT INTO blobs (sha256, byte_size, refcount, data)
+        SELECT sha256, MIN(byte_size), COUNT(*),
+               (SELECT ti.data FROM trade_images ti
+                 WHERE ti.sha256 = g.sha256 AND ti.data IS NOT NULL LIMIT 1)
+          FROM trade_images g
+         GROUP BY sha256
+    """)
+
+    with op.batch_alter_table('trade_images') as batch_op:
+        batch_op.drop_column('data')
+        batch_op.create_foreign_key('fk_trade_images_sha256_blobs', 'blobs', ['sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trade_images') as batch_op:
+        batch_op.drop_constraint('fk_trade_images_sha256_blobs', type_='foreignkey')
+        batch_op.add_column(sa.Column('data', sa.LargeBinary(), nullable=True))
+
+    op.execute("""
+        UPDATE trade_images
+           SET data = (SELECT b.data FROM blobs b WHERE b.sha256 = trade_images.sha256)
+    """)
+    op.drop_table('blobs')
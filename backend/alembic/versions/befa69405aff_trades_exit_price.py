@@ -0,0 +1,30 @@
+"""trades exit price
+
+Revision ID: befa69405aff
+Revises: e562cd66c194
+Create Date: 2026-10-18 11:25:16.699661
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'befa69405aff'
+down_revision: Union[str, Sequence[str], None] = 'e562cd66c194'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.add_column(sa.Column('exit_price', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.drop_column('exit_price')
@@ -0,0 +1,32 @@
+"""trade images data nullable
+
+Revision ID: c95af06ee2b2
+Revises: bb6067be13fa
+Create Date: 2026-10-18 11:33:47.274220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c95af06ee2b2'
+down_revision: Union[str, Sequence[str], None] = 'bb6067be13fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Metadata-only rows for file/object stores
+    with op.batch_alter_table('trade_images') as batch_op:
+        batch_op.alter_column('data', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if metadata-only rows exist; move their bytes back into the DB first
+    with op.batch_alter_table('trade_images') as batch_op:
+        batch_op.alter_column('data', existing_type=sa.LargeBinary(), nullable=False)
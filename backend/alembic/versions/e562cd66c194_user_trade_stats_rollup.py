@@ -0,0 +1,45 @@
+"""user trade stats rollup
+
+Revision ID: e562cd66c194
+Revises: a65ab108f7ff
+Create Date: 2026-10-18 11:22:01.110104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e562cd66c194'
+down_revision: Union[str, Sequence[str], None] = 'a65ab108f7ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing journals are backfilled with `poetry run rebuild-stats`
+    op.create_table('user_trade_stats',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('symbol', sa.String(length=32), nullable=False),
+    sa.Column('period', sa.String(length=7), nullable=False),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.Column('win_count', sa.Integer(), nullable=False),
+    sa.Column('loss_count', sa.Integer(), nullable=False),
+    sa.Column('pnl_sum_chf', sa.Float(), nullable=False),
+    sa.Column('gross_profit_chf', sa.Float(), nullable=False),
+    sa.Column('gross_loss_chf', sa.Float(), nullable=False),
+    sa.Column('r_count', sa.Integer(), nullable=False),
+    sa.Column('r_sum', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'symbol', 'period')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_trade_stats')
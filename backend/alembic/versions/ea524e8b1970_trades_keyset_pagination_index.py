@@ -0,0 +1,42 @@
+"""trades keyset pagination index
+
+Revision ID: ea524e8b1970
+Revises: 9ce67416e9b3
+Create Date: 2026-10-18 11:08:38.352546
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea524e8b1970'
+down_revision: Union[str, Sequence[str], None] = '9ce67416e9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite stores CURRENT_TIMESTAMP without fractional seconds, while SQLAlchemy
+    # binds datetimes with microseconds. Normalize old rows so keyset comparisons
+    # on created_at are consistent (string comparison in SQLite).
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "UPDATE trades SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+
+    op.create_index(
+        'ix_trades_user_id_created_at_id',
+        'trades',
+        ['user_id', sa.text('created_at DESC'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trades_user_id_created_at_id', table_name='trades')
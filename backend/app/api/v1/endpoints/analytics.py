@@ -1,2 +1,70 @@
 # app/api/v1/endpoints/analytics.py
 
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_user, get_db
+from app.crud.trade_stats import get_trade_stats
+from app.models.trade_stats import ALL, UserTradeStats
+from app.models.user import User
+from app.schemas.analytics import AnalyticsSummaryOut, MonteCarloOut, MonteCarloRequest, TradeStatsOut
+from app.services.analytics import summary_for_user
+from app.services.monte_carlo import MonteCarloError, monte_carlo_for_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummaryOut)
+def analytics_summary(
+    symbol: str | None = Query(None, min_length=1, max_length=32),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return summary_for_user(db, user_id=current_user.id, symbol=symbol)
+
+
+def _to_stats_out(row: UserTradeStats | None, *, symbol: str, period: str) -> TradeStatsOut:
+    if row is None:
+        return TradeStatsOut(
+            symbol=symbol, period=period, trade_count=0, win_count=0, loss_count=0, total_pnl_chf=0.0
+        )
+    n = row.trade_count
+    return TradeStatsOut(
+        symbol=symbol,
+        period=period,
+        trade_count=n,
+        win_count=row.win_count,
+        loss_count=row.loss_count,
+        win_rate=row.win_count / n if n else None,
+        total_pnl_chf=row.pnl_sum_chf,
+        expectancy_chf=row.pnl_sum_chf / n if n else None,
+        expectancy_r=row.r_sum / row.r_count if row.r_count else None,
+        profit_factor=row.gross_profit_chf / row.gross_loss_chf if row.gross_loss_chf > 0 else None,
+    )
+
+
+@router.get("/stats", response_model=TradeStatsOut)
+def analytics_stats(
+    symbol: str = Query(ALL, min_length=1, max_length=32),
+    month: str = Query(ALL, pattern=r"^(\*|\d{4}-\d{2})$", description="YYYY-MM or * for all time"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    row = get_trade_stats(db, user_id=current_user.id, symbol=symbol, period=month)
+    return _to_stats_out(row, symbol=symbol, period=month)
+
+
+# Sync endpoint: runs on the threadpool and only waits on the CPU process pool,
+# so the event loop and the request thread's core stay free while paths are simulated.
+@router.post("/monte-carlo", response_model=MonteCarloOut)
+def analytics_monte_carlo(
+    payload: MonteCarloRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        return monte_carlo_for_user(db, user_id=current_user.id, req=payload)
+    except MonteCarloError as e:
+        raise HTTPException(status_code=422, detail=str(e))
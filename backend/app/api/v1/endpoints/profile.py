@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user, get_db
+from app.core.deps_storage import get_trade_image_store
 from app.core.security import verify_password
 from app.crud.user import (
     get_by_email,
@@ -14,6 +15,7 @@ from app.crud.user import (
 )
 from app.schemas.user import UserOut, UserUpdate, PasswordChange, DeleteAccount
 from app.models.user import User
+from app.services.storage.base import TradeImageStore
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
@@ -69,9 +71,11 @@ def delete_profile(
     payload: DeleteAccount,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    store: TradeImageStore = Depends(get_trade_image_store),
 ):
     try:
         delete_user(db, current_user, current_password=payload.current_password)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid current password")
+    store.collect_garbage()  # blobs only this account's charts used
     return None
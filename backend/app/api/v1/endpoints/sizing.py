@@ -0,0 +1,64 @@
+# app/api/v1/endpoints/sizing.py
+
+from __future__ import annotations
+
+import numpy as np
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.schemas.sizing import GridRange, SizingGridOut, SizingGridRequest
+from app.services.sizing import size_grid
+
+router = APIRouter(prefix="/sizing", tags=["sizing"])
+
+
+def _axis(r: GridRange) -> np.ndarray:
+    return np.linspace(r.start, r.stop, r.num)
+
+
+def _column(values: np.ndarray, valid: np.ndarray) -> list[float | None]:
+    col = values.ravel().astype(object)
+    col[~valid.ravel()] = None # NaN is not valid JSON
+    return col.tolist()
+
+
+@router.post("/grid", response_model=SizingGridOut)
+def sizing_grid(
+    payload: SizingGridRequest,
+    _current_user: User = Depends(get_current_user),
+):
+    risk_axis = _axis(payload.risk_pct)
+    stop_axis = _axis(payload.stop_distance)
+    tp_axis = _axis(payload.tp_r_multiple)
+
+    grid = size_grid(
+        symbol=payload.symbol,
+        direction=payload.direction.value,
+        entry_price=payload.entry_price,
+        balance_chf=payload.balance_chf,
+        lot_step=payload.lot_step,
+        usdchf_rate=payload.usdchf_rate,
+        tick_size=payload.tick_size,
+        contract_size=payload.contract_size,
+        risk_pct=risk_axis,
+        stop_distance=stop_axis,
+        tp_r_multiple=tp_axis,
+    )
+    valid = grid["valid"]
+
+    out = SizingGridOut.model_construct(
+        shape=list(valid.shape),
+        risk_pct=risk_axis.tolist(),
+        stop_distance=stop_axis.tolist(),
+        tp_r_multiple=tp_axis.tolist(),
+        lots=_column(grid["lots"], valid),
+        risk_chf=_column(grid["risk_chf"], valid),
+        reward_chf=_column(grid["reward_chf"], valid),
+        sl_price=_column(grid["sl_price"], valid),
+        tp_price=_column(grid["tp_price"], valid),
+    )
+    # Values come straight from numpy, so skip re-validating ~500k floats and
+    # serialize once in pydantic-core.
+    return Response(content=out.model_dump_json(), media_type="application/json")
@@ -2,37 +2,89 @@
 
 from __future__ import annotations
 
+import itertools
+import mimetypes
+from pathlib import Path
+from typing import Annotated
+
 from fastapi import (
     APIRouter, Depends, 
     HTTPException, status,
-    File, UploadFile
+    File, UploadFile, Query, Request, Header
 )
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_db
+from app.core.config import settings
+from app.core.deps import get_async_db, get_current_user, get_current_user_async, get_db
 from app.core.deps_storage import get_trade_image_store
+from app.core.executors import ExecutorSaturatedError, run_in_image_pool
 
+from app.crud.chart_ingest import create_chart_ingest_job, get_latest_chart_ingest_job
 from app.crud.trade import (
-    create_trade, get_trade_for_user, 
-    list_trades_for_user, update_trade_for_user,
-    list_trades_for_user_with_chart_flag
+    create_trade, get_trade_for_user, get_trade_for_user_sync, update_trade_for_user,
+    list_trades_for_user_with_chart_flag,
+    iter_trade_export_batches, EXPORT_COLUMNS,
+    get_chart_images_for_user_sync
 )
 
-from app.services.storage.base import TradeImageStore
-from app.services.storage.image_processing import ImageTooLargeError, InvalidImageError, compress_chart_image
+from app.services.chart_ingest import chart_ingest_worker, save_chart_renditions, spool_chart_upload
+from app.services.export import iter_csv, iter_ndjson, iter_zip
+from app.services.pnl import recompute_realized_pnl
+from app.services.sizing import SizingError
+from app.services.storage.base import (
+    FileBackedImageStore, PresignedUrlImageStore, StoredImage, TradeImageStore
+)
+from app.services.storage.image_processing import (
+    CHART_KIND, CHART_KINDS, CHART_MEDIUM_KIND, CHART_THUMB_KIND, MAX_UPLOAD_BYTES,
+    ImageTooLargeError, InvalidImageError, compress_chart_renditions
+)
 
 from app.models.user import User
 from app.models.trade import Trade
 
 from app.schemas.trade import (
-    TradeCreate, TradeDetailOut, TradeSummaryOut, 
-    TradeUpdate, TradeInputs, TradeOutputs, TradeJournal
+    TradeCreate, TradeDetailOut, TradeSummaryOut, TradePage,
+    TradeListQuery, TradeExportQuery, ExportFormat, OutputsPolicy, TradeUpdate, TradeInputs, TradeOutputs, TradeJournal,
+    TradePnlRecompute, TradePnlRecomputeOut
+)
+from app.schemas.trade_image import (
+    ChartBatchFormat, ChartBatchGet, ChartBatchOut, ChartIngestJobOut, ChartIngestMode, ChartMetaOut, ChartSize
 )
 
 router = APIRouter(prefix="/trades", tags=["trades"])
 
+# Journal endpoints are `async def` on the AsyncSession (app/db/session.py), so waiting
+# on the DB ties up a pooled connection rather than a threadpool thread. Chart and
+# export endpoints stay sync: file/spool I/O, the image pool and streaming cursors
+# are blocking work that belongs in the threadpool anyway. Each endpoint sticks to
+# one session kind, so a request holds one pooled connection.
+
+
+async def get_owned_trade(
+    trade_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> Trade:
+    trade = await get_trade_for_user(db, user_id=current_user.id, trade_id=trade_id)
+    if not trade:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    return trade
+
+
+def get_owned_trade_sync(
+    trade_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Trade:
+    """get_owned_trade() for sync endpoints (same Session as the image store)."""
+    trade = get_trade_for_user_sync(db, user_id=current_user.id, trade_id=trade_id)
+    if not trade:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    return trade
+
 
 def _to_detail_out(t: Trade) -> TradeDetailOut:
     return TradeDetailOut(
@@ -72,6 +124,7 @@ def _to_detail_out(t: Trade) -> TradeDetailOut:
             status=t.status,
             opened_at=t.opened_at,
             closed_at=t.closed_at,
+            exit_price=t.exit_price,
             realized_pnl_chf=t.realized_pnl_chf,
             realized_r_multiple=t.realized_r_multiple,
         ),
@@ -105,102 +158,341 @@ def _to_summary_out(t: Trade, has_charts: bool) -> TradeSummaryOut:
 
 
 @router.post("", response_model=TradeDetailOut, status_code=status.HTTP_201_CREATED)
-def create_planned_trade(
+async def create_planned_trade(
     payload: TradeCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    outputs_policy: OutputsPolicy = OutputsPolicy.CLIENT,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    trade = create_trade(db, user_id=current_user.id, payload=payload)
+    try:
+        trade = await create_trade(db, user_id=current_user.id, payload=payload, outputs_policy=outputs_policy)
+    except SizingError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return _to_detail_out(trade)
 
 
-@router.get("", response_model=list[TradeSummaryOut])
-def list_my_trades(
+@router.get("", response_model=TradePage)
+async def list_my_trades(
+    query: Annotated[TradeListQuery, Query()],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        rows, next_cursor = await list_trades_for_user_with_chart_flag(
+            db,
+            user_id=current_user.id,
+            filters=query,
+            sort_by=query.sort_by,
+            sort_dir=query.sort_dir,
+            limit=query.limit,
+            cursor=query.cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return TradePage(
+        items=[_to_summary_out(t, has_chart) for (t, has_chart) in rows],
+        next_cursor=next_cursor,
+    )
+
+
+
+@router.get("/export")
+def export_my_trades(
+    query: Annotated[TradeExportQuery, Query()],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    rows = list_trades_for_user_with_chart_flag(db, user_id=current_user.id)
-    return [_to_summary_out(t, has_chart) for (t, has_chart) in rows]
+    columns = [c.key for c in EXPORT_COLUMNS]
+    batches = iter_trade_export_batches(db, user_id=current_user.id, filters=query)
+
+    if query.format == ExportFormat.NDJSON:
+        body, media_type, ext = iter_ndjson(columns, batches), "application/x-ndjson", "ndjson"
+    else:
+        body, media_type, ext = iter_csv(columns, batches), "text/csv", "csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="trades.{ext}"'},
+    )
 
 
+@router.post("/recompute-pnl", response_model=TradePnlRecomputeOut)
+def recompute_my_trades_pnl(
+    payload: TradePnlRecompute,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    updated = recompute_realized_pnl(
+        db, user_id=current_user.id, symbol=payload.symbol, usdchf_rate=payload.usdchf_rate
+    )
+    return TradePnlRecomputeOut(updated=updated)
 
-@router.get("/{trade_id}", response_model=TradeDetailOut)
-def get_my_trade(
-    trade_id: str,
+
+@router.post(
+    "/charts:batchGet",
+    response_model=ChartBatchOut,
+    responses={200: {"content": {"application/zip": {}}, "description": "format=zip: manifest.json + images as a ZIP stream"}},
+)
+def batch_get_trade_charts(
+    payload: ChartBatchGet,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    store: TradeImageStore = Depends(get_trade_image_store),
 ):
-    trade = get_trade_for_user(db, user_id=current_user.id, trade_id=trade_id)
-    if not trade:
-        raise HTTPException(status_code=404, detail="Trade not found")
+    # One query authorizes every id and yields the metadata; bytes only for format=zip.
+    # Sync like the other chart endpoints: the ZIP streams through the store's Session,
+    # so the request holds one pooled connection while it drains.
+    trade_ids = list(dict.fromkeys(payload.trade_ids))
+    found = get_chart_images_for_user_sync(
+        db, user_id=current_user.id, trade_ids=trade_ids, kind=CHART_SIZE_KINDS[payload.size]
+    )
+    items = [ChartMetaOut.model_validate(found[t]) for t in trade_ids if t in found]
+    missing = [t for t in trade_ids if t not in found]
+
+    if payload.format == ChartBatchFormat.METADATA:
+        return ChartBatchOut(items=items, missing=missing)
+
+    # manifest.json first (same body as format=metadata), then one file per image
+    manifest = ChartBatchOut(items=items, missing=missing).model_dump_json().encode()
+    entries = itertools.chain(
+        [("manifest.json", len(manifest), [manifest])],
+        (
+            (
+                f"{item.trade_id}{mimetypes.guess_extension(item.mime) or ''}",
+                item.byte_size,
+                store.iter_bytes(StoredImage(**item.model_dump())),
+            )
+            for item in items
+        ),
+    )
+    return StreamingResponse(
+        iter_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="charts.zip"'},
+    )
+
+
+@router.get("/{trade_id}", response_model=TradeDetailOut)
+async def get_my_trade(trade: Trade = Depends(get_owned_trade)):
     return _to_detail_out(trade)
 
 
 @router.patch("/{trade_id}", response_model=TradeDetailOut)
-def patch_my_trade(
+async def patch_my_trade(
     trade_id: str,
     payload: TradeUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    trade = update_trade_for_user(db, user_id=current_user.id, trade_id=trade_id, payload=payload)
+    trade = await update_trade_for_user(db, user_id=current_user.id, trade_id=trade_id, payload=payload)
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
     return _to_detail_out(trade)
 
-CHART_KIND = "CHART"
+CHART_SIZE_KINDS = {
+    ChartSize.FULL: CHART_KIND,
+    ChartSize.MEDIUM: CHART_MEDIUM_KIND,
+    ChartSize.THUMB: CHART_THUMB_KIND,
+}
 
-@router.post("/{trade_id}/chart", status_code=status.HTTP_204_NO_CONTENT)
+@router.post(
+    "/{trade_id}/chart",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={202: {"model": ChartIngestJobOut, "description": "mode=async: queued for processing"}},
+)
 def upload_trade_chart(
     trade_id: str,
+    request: Request,
     file: UploadFile = File(...),
+    mode: ChartIngestMode = ChartIngestMode.SYNC,
+    _trade: Trade = Depends(get_owned_trade_sync),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
     store: TradeImageStore = Depends(get_trade_image_store),
 ):
-    trade = get_trade_for_user(db, user_id=current_user.id, trade_id=trade_id)
-    if not trade:
-        raise HTTPException(status_code=404, detail="Trade not found")
-
     ct = (file.content_type or "").lower()
     if ct not in {"image/png", "image/jpeg", "image/webp"}:
         raise HTTPException(status_code=400, detail="Unsupported image type")
 
-    raw = file.file.read()
+    if mode == ChartIngestMode.ASYNC:
+        status_url = request.url_for("get_trade_chart_status", trade_id=trade_id).path
+        return _enqueue_chart_upload(db, trade_id=trade_id, file=file, status_url=status_url)
 
+    # Chunked copy to a spool file, aborted at the cap: the upload is never held in
+    # memory, and the worker decodes from the path instead of a pickled bytes copy.
     try:
-        compressed, mime, _sha = compress_chart_image(raw)
+        spool_path, _size = spool_chart_upload(file.file, max_bytes=MAX_UPLOAD_BYTES)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Encoding runs in the bounded image process pool; this thread only waits,
+    # and at most workers + queue upload threads can be waiting at once.
+    try:
+        renditions = run_in_image_pool(compress_chart_renditions, spool_path)
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Image processing is busy, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     except ImageTooLargeError as e:
         raise HTTPException(status_code=413, detail=str(e))
     except InvalidImageError:
         raise HTTPException(status_code=400, detail="Invalid image")
+    finally:
+        Path(spool_path).unlink(missing_ok=True)
 
-    store.save(trade_id=trade_id, kind=CHART_KIND, data=compressed, mime=mime)
+    save_chart_renditions(store, trade_id=trade_id, renditions=renditions)
     return None
 
 
+def _enqueue_chart_upload(db: Session, *, trade_id: str, file: UploadFile, status_url: str) -> JSONResponse:
+    # Latency = time to receive the bytes; encoding happens in services.chart_ingest
+    try:
+        spool_path, size = spool_chart_upload(file.file, max_bytes=MAX_UPLOAD_BYTES)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    job = create_chart_ingest_job(db, trade_id=trade_id, kind=CHART_KIND, spool_path=spool_path, byte_size=size)
+    chart_ingest_worker.submit(job.id, db.get_bind())
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=ChartIngestJobOut.model_validate(job).model_dump(mode="json"),
+        headers={"Location": status_url},
+    )
+
+
+@router.get("/{trade_id}/chart/status", response_model=ChartIngestJobOut)
+def get_trade_chart_status(
+    trade_id: str,
+    _trade: Trade = Depends(get_owned_trade_sync),
+    db: Session = Depends(get_db),
+):
+    job = get_latest_chart_ingest_job(db, trade_id=trade_id, kind=CHART_KIND)
+    if not job:
+        raise HTTPException(status_code=404, detail="No chart upload job")
+    return job
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Accepts the bare sha we send, quoted and weak forms, lists and "*"
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def _byte_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Single `bytes=` range -> (start, end_exclusive); None = send the whole image
+    (no/unsupported header, or several ranges). ValueError if unsatisfiable.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) + 1 if last else size
+        else:
+            start, end = max(size - int(last), 0), size  # suffix: last N bytes
+    except ValueError:
+        return None
+    end = min(end, size)
+    if start >= size or start >= end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
 @router.get("/{trade_id}/chart")
 def get_trade_chart(
     trade_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    size: ChartSize = ChartSize.FULL,
+    if_none_match: str | None = Header(default=None),
+    range_header: str | None = Header(default=None, alias="Range"),
+    if_range: str | None = Header(default=None),
+    _trade: Trade = Depends(get_owned_trade_sync),
     store: TradeImageStore = Depends(get_trade_image_store),
 ):
-    trade = get_trade_for_user(db, user_id=current_user.id, trade_id=trade_id)
-    if not trade:
-        raise HTTPException(status_code=404, detail="Trade not found")
-
-    img = store.get(trade_id=trade_id, kind=CHART_KIND)
-    if not img:
+    headers = {"Cache-Control": "private, max-age=0"}
+
+    # Revalidation is answered from metadata alone; bytes are only read on a miss
+    kind = CHART_SIZE_KINDS[size]
+    meta = store.head(trade_id=trade_id, kind=kind)
+    if not meta and kind != CHART_KIND:
+        # Uploaded before renditions existed: serve the full chart
+        kind = CHART_KIND
+        meta = store.head(trade_id=trade_id, kind=kind)
+    if not meta:
         raise HTTPException(status_code=404, detail="No chart image")
-
-    return Response(
-        content=img.data,
-        media_type=img.mime,
+    if _etag_matches(if_none_match, meta.sha256):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": meta.sha256, **headers})
+
+    if settings.S3_PRESIGNED_REDIRECTS and isinstance(store, PresignedUrlImageStore):
+        found = store.presigned_url(trade_id=trade_id, kind=kind, expires_in=settings.S3_PRESIGN_EXPIRES_S)
+        if found:
+            meta, url = found
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers={"ETag": meta.sha256, **headers})
+
+    if isinstance(store, FileBackedImageStore):
+        # FileResponse does Range / If-Range itself
+        found = store.open_path(trade_id=trade_id, kind=kind)
+        if found:
+            meta, path = found
+            return FileResponse(path, media_type=meta.mime, headers={"ETag": meta.sha256, **headers})
+
+    headers = {"ETag": meta.sha256, "Accept-Ranges": "bytes", **headers}
+
+    # If-Range: only honour Range when the client's copy is still current
+    if if_range is not None and not _etag_matches(if_range, meta.sha256):
+        range_header = None
+    try:
+        byte_range = _byte_range(range_header, meta.byte_size)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{meta.byte_size}"},
+        )
+
+    if byte_range is None:
+        return StreamingResponse(
+            store.iter_bytes(meta),
+            media_type=meta.mime,
+            headers={"Content-Length": str(meta.byte_size), **headers},
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        store.iter_bytes(meta, start=start, end=end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=meta.mime,
         headers={
-            "ETag": img.sha256,
-            "Content-Length": str(img.byte_size),
-            "Cache-Control": "private, max-age=0",
+            "Content-Range": f"bytes {start}-{end - 1}/{meta.byte_size}",
+            "Content-Length": str(end - start),
+            **headers,
         },
     )
 
+
+@router.delete("/{trade_id}/chart", status_code=status.HTTP_204_NO_CONTENT)
+def delete_trade_chart(
+    trade_id: str,
+    _trade: Trade = Depends(get_owned_trade_sync),
+    store: TradeImageStore = Depends(get_trade_image_store),
+):
+    if not store.head(trade_id=trade_id, kind=CHART_KIND):
+        raise HTTPException(status_code=404, detail="No chart image")
+
+    # Full chart + renditions; each blob is dropped once no other trade uses it
+    for kind in CHART_KINDS:
+        store.delete(trade_id=trade_id, kind=kind)
+    return None
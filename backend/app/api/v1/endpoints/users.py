@@ -6,10 +6,12 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_admin, get_current_user
+from app.core.deps_storage import get_trade_image_store
 from app.crud.user import get_by_username, get_by_email, update_user, delete_user, change_password
 
 from app.schemas.user import UserAdminOut, UserOut, UserUpdate, DeleteAccount, PasswordChange
 from app.models.user import User
+from app.services.storage.base import TradeImageStore
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -71,9 +73,11 @@ def delete_my_account(
     payload: DeleteAccount,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    store: TradeImageStore = Depends(get_trade_image_store),
 ):
     try:
         delete_user(db, current_user, current_password=payload.current_password)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid current password")
+    store.collect_garbage()  # blobs only this account's charts used
     return None
\ No newline at end of file
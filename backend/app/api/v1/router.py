@@ -5,7 +5,9 @@ from app.api.v1.endpoints import (
   auth,
   users,
   profile,
-  trades
+  trades,
+  sizing,
+  analytics
 )
 
 router = APIRouter(prefix="/api/v1")
@@ -13,3 +15,5 @@ router.include_router(auth.router)
 router.include_router(users.router)
 router.include_router(profile.router)
 router.include_router(trades.router)
+router.include_router(sizing.router)
+router.include_router(analytics.router)
@@ -0,0 +1,119 @@
+# app/core/auth_cache.py
+
+# Short-lived caches for get_current_user: decoded tokens (token -> sub) and
+# user principals (sub -> column values). Per process; crud.user invalidates
+# on update / password change / delete, and AUTH_CACHE_TTL_S bounds how long
+# another process's change (or a direct DB edit) can go unnoticed.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU with per-entry expiry, bounded by entry count."""
+
+    def __init__(self, *, max_entries: int, ttl_s: float):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0 and self.max_entries > 0
+
+    def get(self, key: K) -> V | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: K, value: V, *, ttl_s: float | None = None) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl_s if ttl_s is None else min(ttl_s, self.ttl_s)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# token -> user id (sub); entries never outlive the token's own exp
+token_cache: TTLCache[str, str] = TTLCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_SIZE, ttl_s=settings.AUTH_CACHE_TTL_S
+)
+
+# user id -> User column values
+principal_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE, ttl_s=settings.AUTH_CACHE_TTL_S
+)
+
+
+def cache_token(token: str, sub: str, exp: int | None) -> None:
+    ttl = None if exp is None else exp - time.time()
+    token_cache.put(token, sub, ttl_s=ttl)
+
+
+def cache_principal(user: User) -> None:
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    principal_cache.put(user.id, values)
+
+
+def _detached_principal(user_id: str) -> User | None:
+    values = principal_cache.get(user_id)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def cached_principal(db: Session, user_id: str) -> User | None:
+    """Rebuild the cached user inside `db` without a query (None on miss)."""
+    user = _detached_principal(user_id)
+    # load=False: trust the cached state, attach as persistent, emit no SQL
+    return None if user is None else db.merge(user, load=False)
+
+
+async def cached_principal_async(db: AsyncSession, user_id: str) -> User | None:
+    """cached_principal() for an AsyncSession."""
+    user = _detached_principal(user_id)
+    return None if user is None else await db.merge(user, load=False)
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.pop(user_id)
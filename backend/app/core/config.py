@@ -7,10 +7,34 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     DATABASE_URL: str = "sqlite:///./dev.db"
+    # Async engine (app/db/session.py); unset = DATABASE_URL with its async driver
+    # (sqlite -> aiosqlite, postgresql -> asyncpg)
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool (both engines); in-memory SQLite ignores size/overflow
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 30.0
+    DB_POOL_RECYCLE_S: int = 1800  # -1 = never; keep below the server's idle timeout
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite pragmas, set on every new connection (app/db/session.py). WAL lets readers
+    # run alongside the single writer; NORMAL only syncs at checkpoints, which is safe
+    # in WAL (a power loss can drop the last commits, never corrupt the file)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
 
     JWT_SECRET: str = "change-me"
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # get_current_user caches decoded tokens and user rows this long (0 disables);
+    # profile changes invalidate locally, other processes catch up within the TTL
+    AUTH_CACHE_TTL_S: float = 30.0
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10_000
 
     # comma-separated list
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -24,5 +48,49 @@ class Settings(BaseSettings):
     ROOT_ADMIN_USERNAME: str | None = None
     ROOT_ADMIN_PASSWORD: str | None = None
 
+    # CPU-bound work (app/core/executors.py); unset = one worker per core
+    CPU_POOL_WORKERS: int | None = None
+
+    # Any request body above this gets 413 before it is parsed (chart uploads are
+    # capped at 10 MB; the margin covers multipart framing)
+    MAX_REQUEST_BODY_BYTES: int = 11 * 1024 * 1024
+
+    # Chart image encoding pool; uploads beyond workers + queue get 503
+    IMAGE_POOL_WORKERS: int = 2
+    IMAGE_POOL_MAX_QUEUE: int = 4
+
+    # bcrypt for login / register / password checks; calls beyond workers + queue get 503,
+    # so a login burst cannot occupy every request thread
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_QUEUE: int = 16
+
+    # Chart image storage backend: "db" (BLOB column) | "fs" (sha256-sharded files under TRADE_IMAGE_FS_ROOT)
+    # | "s3" (S3-compatible bucket, needs the `s3` extra)
+    TRADE_IMAGE_STORE: str = "db"
+    TRADE_IMAGE_FS_ROOT: str = "./var/trade_images"
+    # Chart downloads are streamed in chunks of this size (bounds memory per request)
+    TRADE_IMAGE_CHUNK_BYTES: int = 64 * 1024
+    # In-process LRU of chart bytes for the db/s3 stores (0 disables); larger images bypass it
+    TRADE_IMAGE_CACHE_BYTES: int = 64 * 1024 * 1024
+    TRADE_IMAGE_CACHE_MAX_ITEM_BYTES: int = 1024 * 1024
+
+    # S3 / MinIO (TRADE_IMAGE_STORE=s3); credentials fall back to the AWS default chain
+    S3_BUCKET: str = "trade-calc"
+    S3_PREFIX: str = "trade-images"
+    S3_ENDPOINT_URL: str | None = None # e.g. http://localhost:9000 for MinIO
+    S3_REGION: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_MULTIPART_THRESHOLD_BYTES: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNK_BYTES: int = 8 * 1024 * 1024
+    # Redirect chart downloads to a presigned URL instead of proxying bytes
+    S3_PRESIGNED_REDIRECTS: bool = False
+    S3_PRESIGN_EXPIRES_S: int = 300
+
+    # Async chart uploads: raw bytes wait here until the ingest worker picks them up
+    CHART_SPOOL_DIR: str = "./var/chart_spool"
+    CHART_INGEST_WORKERS: int = 2
+
 
 settings = Settings()
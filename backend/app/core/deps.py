@@ -3,10 +3,15 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import (
+    cache_principal, cache_token, cached_principal, cached_principal_async, token_cache
+)
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
@@ -20,28 +25,64 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def parse_user_id(sub: str) -> str:
     if not sub or not isinstance(sub, str):
         raise HTTPException(status_code=401, detail="Invalid token")
     return sub
 
 
+def _token_user_id(token: str) -> str:
+    # Verified `sub`; cached per token until its exp, so repeat requests skip jwt.decode
+    user_id = token_cache.get(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+            sub = payload.get("sub")
+            if not sub:
+                raise ValueError("Missing subject")
+            # TODO: Make a function to extract user id, in case I switch from ints to UUID or something
+            user_id = parse_user_id(sub)
+        except (JWTError, ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        cache_token(token, user_id, payload.get("exp"))
+    return user_id
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-        sub = payload.get("sub")
-        if not sub:
-            raise ValueError("Missing subject")
-        # TODO: Make a function to extract user id, in case I switch from ints to UUID or something
-        user_id = parse_user_id(sub)
-    except (JWTError, ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # Hot path: signature check + user row both cached (app/core/auth_cache.py)
+    user_id = _token_user_id(token)
+    user = cached_principal(db, user_id)
+    if user is not None:
+        return user
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    cache_principal(user)
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user() for async endpoints; the user is attached to their AsyncSession."""
+    user_id = _token_user_id(token)
+    user = await cached_principal_async(db, user_id)
+    if user is not None:
+        return user
+
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    cache_principal(user)
     return user
 
 
@@ -5,11 +5,43 @@ from __future__ import annotations
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.deps import get_db
 from app.services.storage.base import TradeImageStore
+from app.services.storage.cache import CachingTradeImageStore, chart_image_cache
 from app.services.storage.db_store import DbTradeImageStore
+from app.services.storage.fs_store import FsTradeImageStore
+from app.services.storage.s3_store import S3TradeImageStore, get_s3_client
+
+
+def _cached(store: TradeImageStore) -> TradeImageStore:
+    if settings.TRADE_IMAGE_CACHE_BYTES <= 0:
+        return store
+    return CachingTradeImageStore(store, chart_image_cache)
+
+
+def build_trade_image_store(db: Session) -> TradeImageStore:
+    # Also used outside requests (chart ingest worker) with its own session.
+    backend = settings.TRADE_IMAGE_STORE.lower()
+    if backend == "fs":
+        # Not cached: FileResponse + the OS page cache already serve these cheaply
+        return FsTradeImageStore(db, settings.TRADE_IMAGE_FS_ROOT, chunk_size=settings.TRADE_IMAGE_CHUNK_BYTES)
+    if backend == "s3":
+        store = S3TradeImageStore(
+            db,
+            client=get_s3_client(),
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_BYTES,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_BYTES,
+            chunk_size=settings.TRADE_IMAGE_CHUNK_BYTES,
+        )
+        # Presigned redirects never proxy bytes; wrapping would also hide presigned_url()
+        return store if settings.S3_PRESIGNED_REDIRECTS else _cached(store)
+    if backend == "db":
+        return _cached(DbTradeImageStore(db, chunk_size=settings.TRADE_IMAGE_CHUNK_BYTES))
+    raise RuntimeError(f"Unknown TRADE_IMAGE_STORE: {settings.TRADE_IMAGE_STORE!r}")
 
 
 def get_trade_image_store(db: Session = Depends(get_db)) -> TradeImageStore:
-    # Later: return S3TradeImageStore(...) here
-    return DbTradeImageStore(db)
+    return build_trade_image_store(db)
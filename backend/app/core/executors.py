@@ -0,0 +1,213 @@
+# app/core/executors.py
+
+# Pools for CPU-bound work (NumPy simulations, image encoding, password hashing),
+# created lazily on first use and shut down with the app (see main.lifespan).
+# Processes where the work holds the GIL; bcrypt releases it, so password hashing
+# runs on threads. Request threads only wait on futures.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Admits at most `capacity` jobs (running + queued) into the wrapped executor;
+    submit() fails fast with ExecutorSaturatedError beyond that instead of queueing
+    without limit. Callers turn that into a 503 so a burst cannot pile up request
+    threads waiting on a long queue.
+    """
+
+    def __init__(self, executor: Executor, *, capacity: int, workers: int | None = None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.executor = executor
+        self.capacity = capacity
+        # Only used to split in_flight into running vs queued in stats()
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latency_total_s = 0.0
+        self.latency_max_s = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Admitted jobs not yet running (needs `workers`; 0 otherwise)."""
+        if self.workers is None:
+            return 0
+        return max(0, self._in_flight - self.workers)
+
+    def _release(self, _fut: Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _done(self, submitted_at: float, _fut: Future) -> None:
+        latency = time.monotonic() - submitted_at
+        with self._lock:
+            self.completed += 1
+            self._latency_total_s += latency
+            self.latency_max_s = max(self.latency_max_s, latency)
+        self._release()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorSaturatedError("Executor is saturated, retry later")
+        with self._lock:
+            self._in_flight += 1
+            self.submitted += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        submitted_at = time.monotonic()
+        try:
+            fut = self.executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        fut.add_done_callback(lambda f: self._done(submitted_at, f))
+        return fut
+
+    def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """submit() and wait for the result (exceptions from fn propagate)."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stats(self) -> dict[str, int | float | None]:
+        """
+        Queueing metrics. Latency is submit -> done, so it includes time spent
+        queued: with a steady per-job cost, latency above that cost is queue wait.
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "queued": self.queued,
+                "peak_in_flight": self.peak_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_avg_ms": round(1000 * self._latency_total_s / self.completed, 2) if self.completed else 0.0,
+                "latency_max_ms": round(1000 * self.latency_max_s, 2),
+            }
+
+    def shutdown(self, *, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_lock = threading.Lock()
+_cpu_pool: ProcessPoolExecutor | None = None
+_image_pool: BoundedExecutor | None = None
+_password_pool: BoundedExecutor | None = None
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    # Never fork: by the time a pool starts, ingest worker threads and DB pool locks
+    # exist, and a forked child can inherit a lock held by another thread.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def cpu_pool_workers() -> int:
+    return settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    with _lock:
+        if _cpu_pool is None:
+            _cpu_pool = ProcessPoolExecutor(max_workers=cpu_pool_workers(), mp_context=_process_context())
+        return _cpu_pool
+
+
+def get_image_pool() -> BoundedExecutor:
+    """Chart image encoding: IMAGE_POOL_WORKERS processes + IMAGE_POOL_MAX_QUEUE waiting jobs."""
+    global _image_pool
+    with _lock:
+        if _image_pool is None:
+            workers = settings.IMAGE_POOL_WORKERS
+            _image_pool = BoundedExecutor(
+                ProcessPoolExecutor(max_workers=workers, mp_context=_process_context()),
+                capacity=workers + settings.IMAGE_POOL_MAX_QUEUE,
+                workers=workers,
+            )
+        return _image_pool
+
+
+def get_password_pool() -> BoundedExecutor:
+    """bcrypt hash/verify: PASSWORD_POOL_WORKERS threads + PASSWORD_POOL_MAX_QUEUE waiting calls."""
+    global _password_pool
+    with _lock:
+        if _password_pool is None:
+            workers = settings.PASSWORD_POOL_WORKERS
+            _password_pool = BoundedExecutor(
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password"),
+                capacity=workers + settings.PASSWORD_POOL_MAX_QUEUE,
+                workers=workers,
+            )
+        return _password_pool
+
+
+def run_in_password_pool(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn in the password pool. Raises ExecutorSaturatedError when it is full, so
+    a login burst gets fast 503s instead of every request thread sitting in bcrypt.
+    """
+    return get_password_pool().run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict[str, dict[str, int | float | None]]:
+    """stats() of the bounded pools that have been started."""
+    with _lock:
+        pools = {"image": _image_pool, "password": _password_pool}
+    return {name: pool.stats() for name, pool in pools.items() if pool is not None}
+
+
+def run_in_image_pool(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn in the image pool. Raises ExecutorSaturatedError when the pool is full,
+    or when a worker died (e.g. killed for memory) -- the broken pool is replaced
+    for the next caller.
+    """
+    global _image_pool
+    pool = get_image_pool()
+    try:
+        return pool.run(fn, *args, **kwargs)
+    except BrokenProcessPool as e:
+        with _lock:
+            if _image_pool is pool:
+                _image_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise ExecutorSaturatedError("Image worker crashed, retry later") from e
+
+
+def shutdown_executors() -> None:
+    global _cpu_pool, _image_pool, _password_pool
+    with _lock:
+        pools = [p for p in (_cpu_pool, _image_pool, _password_pool) if p is not None]
+        _cpu_pool = _image_pool = _password_pool = None
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -6,20 +6,23 @@ from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.executors import run_in_password_pool
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+# bcrypt costs ~100-300 ms of CPU per call, so both run in the bounded password pool
+# and raise ExecutorSaturatedError (-> 503, see main.py) when it is full
+
+
 def hash_password(password: str) -> str:
     assert password == "test1234" or len(password) < 50
-    
-    hash = pwd_context.hash(password)
-    print(f"{password} {hash = }")
-    return hash
+
+    return run_in_password_pool(pwd_context.hash, password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return run_in_password_pool(pwd_context.verify, password, password_hash)
 
 
 def create_access_token(subject: str) -> str:
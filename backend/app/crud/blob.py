@@ -0,0 +1,101 @@
+# app/crud/blob.py
+
+# Reference counting for content-addressed image blobs. Every trade_images row
+# holds one reference to blobs[sha256]; stores call acquire/release around row
+# writes (same transaction) and then take_garbage() to drop blobs nobody uses.
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.blob import Blob
+from app.models.trade import Trade
+from app.models.trade_image import TradeImage
+
+
+def acquire_blob(db: Session, *, sha256: str, byte_size: int) -> None:
+    """+1 reference, creating the blob row (without bytes) on first use."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        stmt = insert(Blob).values(sha256=sha256, byte_size=byte_size, refcount=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sha256"],
+            set_={"refcount": Blob.refcount + 1, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+        return
+
+    res = db.execute(update(Blob).where(Blob.sha256 == sha256).values(refcount=Blob.refcount + 1))
+    if res.rowcount == 0:
+        db.add(Blob(sha256=sha256, byte_size=byte_size, refcount=1))
+        db.flush()
+
+
+def release_blob(db: Session, sha256: str) -> None:
+    db.execute(update(Blob).where(Blob.sha256 == sha256).values(refcount=Blob.refcount - 1))
+
+
+def release_user_blobs(db: Session, user_id: str) -> None:
+    """
+    Drop the references held by a user's images. Call before deleting the user:
+    the trades -> trade_images cascade runs in the DB and bypasses the stores.
+    """
+    counts = db.execute(
+        select(TradeImage.sha256, func.count())
+        .join(Trade, Trade.id == TradeImage.trade_id)
+        .where(Trade.user_id == user_id)
+        .group_by(TradeImage.sha256)
+    ).all()
+    if not counts:
+        return
+    # Core table, not the ORM entity: an executemany on the entity would be a bulk UPDATE by PK
+    blobs = Blob.__table__
+    db.execute(
+        update(blobs)
+        .where(blobs.c.sha256 == bindparam("b_sha256"))
+        .values(refcount=blobs.c.refcount - bindparam("b_n")),
+        [{"b_sha256": sha, "b_n": n} for sha, n in counts],
+    )
+
+
+def blob_has_data(db: Session, sha256: str) -> bool:
+    return bool(db.scalar(select(Blob.data.is_not(None)).where(Blob.sha256 == sha256)))
+
+
+def write_blob_data(db: Session, sha256: str, data: bytes) -> None:
+    db.execute(update(Blob).where(Blob.sha256 == sha256).values(data=data))
+
+
+def read_blob_data(db: Session, sha256: str) -> bytes | None:
+    return db.scalar(select(Blob.data).where(Blob.sha256 == sha256))
+
+
+def take_garbage(db: Session, shas: Iterable[str] | None = None) -> list[str]:
+    """
+    Delete unreferenced blob rows (optionally only among `shas`) and return their
+    hashes, so the caller can remove bytes kept outside the DB.
+    """
+    stmt = delete(Blob).where(Blob.refcount <= 0)
+    if shas is not None:
+        stmt = stmt.where(Blob.sha256.in_(list(shas)))
+    return list(db.scalars(stmt.returning(Blob.sha256)))
+
+
+def recount_blob_refs(db: Session) -> int:
+    """Repair refcounts from trade_images (e.g. after manual deletes). Returns blobs updated."""
+    refs = (
+        select(func.count())
+        .where(TradeImage.sha256 == Blob.sha256)
+        .correlate(Blob)
+        .scalar_subquery()
+    )
+    res = db.execute(
+        update(Blob).where(Blob.refcount != refs).values(refcount=refs).execution_options(synchronize_session=False)
+    )
+    return res.rowcount
@@ -0,0 +1,55 @@
+# app/crud/chart_ingest.py
+
+from __future__ import annotations
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.chart_ingest_job import ChartIngestJob
+from app.schemas.trade_image import ChartIngestStatus
+
+
+def create_chart_ingest_job(
+    db: Session, *, trade_id: str, kind: str, spool_path: str, byte_size: int
+) -> ChartIngestJob:
+    job = ChartIngestJob(
+        trade_id=trade_id,
+        kind=kind,
+        status=ChartIngestStatus.QUEUED.value,
+        spool_path=spool_path,
+        byte_size=byte_size,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_latest_chart_ingest_job(db: Session, *, trade_id: str, kind: str) -> ChartIngestJob | None:
+    stmt = (
+        select(ChartIngestJob)
+        .where(ChartIngestJob.trade_id == trade_id, ChartIngestJob.kind == kind)
+        .order_by(ChartIngestJob.created_at.desc(), ChartIngestJob.id.desc())
+        .limit(1)
+    )
+    return db.scalars(stmt).first()
+
+
+def requeue_unfinished_chart_ingest_jobs(db: Session) -> list[str]:
+    """Jobs interrupted by a restart go back to QUEUED; returns their ids in creation order."""
+    unfinished = (ChartIngestStatus.QUEUED.value, ChartIngestStatus.PROCESSING.value)
+    ids = list(
+        db.scalars(
+            select(ChartIngestJob.id)
+            .where(ChartIngestJob.status.in_(unfinished))
+            .order_by(ChartIngestJob.created_at)
+        )
+    )
+    if ids:
+        db.execute(
+            update(ChartIngestJob)
+            .where(ChartIngestJob.id.in_(ids))
+            .values(status=ChartIngestStatus.QUEUED.value)
+        )
+        db.commit()
+    return ids
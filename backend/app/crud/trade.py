@@ -2,19 +2,42 @@
 
 from __future__ import annotations
 
-from sqlalchemy import desc, select, exists, literal
+import base64
+import json
+from datetime import datetime
+
+from typing import Any, Iterator
+
+from sqlalchemy import ColumnElement, Row, Select, and_, select, exists, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.crud.trade_stats import TradeStatsSnapshot, apply_trade_change
 from app.models.trade import Trade
 from app.models.trade_image import TradeImage
-from app.schemas.trade import TradeCreate, TradeUpdate
+from app.schemas.trade import (
+    OutputsPolicy, SortDirection, TradeCreate, TradeListFilters, 
+    TradeSortKey, TradeUpdate
+)
+from app.services.pnl import derive_realized_pnl
+from app.services.sizing import resolve_outputs
+from app.services.storage.image_processing import CHART_KIND
 
 
+# Journal CRUD is async (AsyncSession, see app/db/session.py); the rollup upsert in
+# crud.trade_stats stays sync and runs through AsyncSession.run_sync in the same transaction.
+# Exports keep a sync Session: they stream a server-side cursor from a threadpool iterator.
 
-CHART_KIND = "CHART"
+async def create_trade(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    payload: TradeCreate,
+    outputs_policy: OutputsPolicy = OutputsPolicy.CLIENT,
+) -> Trade:
+    # Raises SizingError (ValueError) for VERIFY mismatches / unsizable inputs
+    outputs = resolve_outputs(payload.inputs, payload.outputs, outputs_policy)
 
-def create_trade(db: Session, *, user_id: str, payload: TradeCreate) -> Trade:
-    
     # TODO: See if there is a better way to create the Trade ORM instance from the payload (using a dict and pasting it?)
     t = Trade(
         user_id=user_id,
@@ -34,50 +57,50 @@ def create_trade(db: Session, *, user_id: str, payload: TradeCreate) -> Trade:
         contract_size=payload.inputs.contract_size,
 
         # outputs
-        sl_price=payload.outputs.sl_price,
-        tp_price=payload.outputs.tp_price,
-        risk_distance_price=payload.outputs.risk_distance_price,
-        reward_distance_price=payload.outputs.reward_distance_price,
-        lots=payload.outputs.lots,
-        risk_chf=payload.outputs.risk_chf,
-        reward_chf=payload.outputs.reward_chf,
-        reward_to_risk=payload.outputs.reward_to_risk,
-        value_per_unit_1lot_chf=payload.outputs.value_per_unit_1lot_chf,
-        stop_value_1lot_chf=payload.outputs.stop_value_1lot_chf,
-        exposure_units=payload.outputs.exposure_units,
+        sl_price=outputs.sl_price,
+        tp_price=outputs.tp_price,
+        risk_distance_price=outputs.risk_distance_price,
+        reward_distance_price=outputs.reward_distance_price,
+        lots=outputs.lots,
+        risk_chf=outputs.risk_chf,
+        reward_chf=outputs.reward_chf,
+        reward_to_risk=outputs.reward_to_risk,
+        value_per_unit_1lot_chf=outputs.value_per_unit_1lot_chf,
+        stop_value_1lot_chf=outputs.stop_value_1lot_chf,
+        exposure_units=outputs.exposure_units,
 
         # journal
         note=payload.journal.note,
         status=payload.journal.status.value,
         opened_at=payload.journal.opened_at,
         closed_at=payload.journal.closed_at,
+        exit_price=payload.journal.exit_price,
         realized_pnl_chf=payload.journal.realized_pnl_chf,
         realized_r_multiple=payload.journal.realized_r_multiple,
     )
+    if payload.journal.realized_pnl_chf is None and payload.journal.realized_r_multiple is None:
+        derive_realized_pnl(t)
     db.add(t)
-    db.commit()
-    db.refresh(t)
+    await db.flush()  # populate created_at (month bucket fallback) before the rollup update
+    await db.run_sync(apply_trade_change, TradeStatsSnapshot(None), TradeStatsSnapshot(t))
+    await db.commit()
+    await db.refresh(t)
     return t
 
 
-def list_trades_for_user(db: Session, *, user_id: str, limit: int = 50, offset: int = 0) -> list[Trade]:
-    stmt = (
-        select(Trade)
-        .where(Trade.user_id == user_id)
-        .order_by(desc(Trade.created_at))
-        .limit(limit)
-        .offset(offset)
-    )
-    return list(db.scalars(stmt).all())
+async def get_trade_for_user(db: AsyncSession, *, user_id: str, trade_id: str) -> Trade | None:
+    stmt = select(Trade).where(Trade.id == trade_id, Trade.user_id == user_id)
+    return (await db.scalars(stmt)).first()
 
 
-def get_trade_for_user(db: Session, *, user_id: str, trade_id: str) -> Trade | None:
+def get_trade_for_user_sync(db: Session, *, user_id: str, trade_id: str) -> Trade | None:
+    """get_trade_for_user() for sync endpoints, on the Session they already hold."""
     stmt = select(Trade).where(Trade.id == trade_id, Trade.user_id == user_id)
     return db.scalars(stmt).first()
 
 
-def update_trade_for_user(db: Session, *, user_id: str, trade_id: str, payload: TradeUpdate) -> Trade | None:
-    trade = get_trade_for_user(db, user_id=user_id, trade_id=trade_id)
+async def update_trade_for_user(db: AsyncSession, *, user_id: str, trade_id: str, payload: TradeUpdate) -> Trade | None:
+    trade = await get_trade_for_user(db, user_id=user_id, trade_id=trade_id)
     if not trade:
         return None
     
@@ -86,21 +109,163 @@ def update_trade_for_user(db: Session, *, user_id: str, trade_id: str, payload:
     if "status" in data and data["status"] is not None:
         data["status"] = data["status"].value
 
+    before = TradeStatsSnapshot(trade)
     for k, v in data.items():
         setattr(trade, k, v)
 
+    # Closing / repricing re-derives PnL unless the client sent realized values itself
+    if data.keys() & {"status", "exit_price"} and not data.keys() & {"realized_pnl_chf", "realized_r_multiple"}:
+        derive_realized_pnl(trade)
+
     db.add(trade)
-    db.commit()
-    db.refresh(trade)
+    await db.run_sync(apply_trade_change, before, TradeStatsSnapshot(trade))
+    await db.commit()
+    await db.refresh(trade)
     return trade
 
-def list_trades_for_user_with_chart_flag(
-    db: Session,
+# (column, nullable) per whitelisted sort key
+_SORT_COLUMNS = {
+    TradeSortKey.CREATED_AT: (Trade.created_at, False),
+    TradeSortKey.CLOSED_AT: (Trade.closed_at, True),
+    TradeSortKey.SYMBOL: (Trade.symbol, False),
+    TradeSortKey.REALIZED_PNL_CHF: (Trade.realized_pnl_chf, True),
+    TradeSortKey.REALIZED_R_MULTIPLE: (Trade.realized_r_multiple, True),
+}
+
+_DATETIME_SORT_KEYS = {TradeSortKey.CREATED_AT, TradeSortKey.CLOSED_AT}
+
+
+def encode_trade_cursor(
+    sort_by: TradeSortKey, sort_dir: SortDirection, value: Any, trade_id: str
+) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_by.value, sort_dir.value, value, trade_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_trade_cursor(
+    cursor: str, *, sort_by: TradeSortKey, sort_dir: SortDirection
+) -> tuple[Any, str]:
+    """
+    Returns (sort_value, trade_id).
+    Raises ValueError on anything that is not a cursor we issued for this sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, direction, value, trade_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if key != sort_by.value or direction != sort_dir.value:
+            raise ValueError("Cursor was issued for a different sort order")
+        if value is not None and sort_by in _DATETIME_SORT_KEYS:
+            value = datetime.fromisoformat(value)
+        return value, str(trade_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def trade_filter_clauses(*, user_id: str, filters: TradeListFilters | None = None) -> list[ColumnElement[bool]]:
+    """
+    WHERE clauses for a user's trades. The leading (user_id, status|symbol, ...) columns
+    line up with the composite indexes on `trades`, so these become index range scans.
+    """
+    clauses: list[ColumnElement[bool]] = [Trade.user_id == user_id]
+    if filters is None:
+        return clauses
+
+    if filters.status is not None:
+        clauses.append(Trade.status == filters.status.value)
+    if filters.symbol is not None:
+        clauses.append(Trade.symbol == filters.symbol)
+    if filters.direction is not None:
+        clauses.append(Trade.direction == filters.direction.value)
+
+    if filters.created_from is not None:
+        clauses.append(Trade.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        clauses.append(Trade.created_at < filters.created_to)
+    if filters.closed_from is not None:
+        clauses.append(Trade.closed_at >= filters.closed_from)
+    if filters.closed_to is not None:
+        clauses.append(Trade.closed_at < filters.closed_to)
+
+    return clauses
+
+
+def apply_trade_sort(
+    stmt: Select,
+    *,
+    sort_by: TradeSortKey = TradeSortKey.CREATED_AT,
+    sort_dir: SortDirection = SortDirection.DESC,
+    after: tuple[Any, str] | None = None,
+) -> Select:
+    """
+    ORDER BY <sort column> [NULLS LAST], id  plus an optional keyset predicate that
+    continues after (value, id). Trade.id breaks ties so every row has a unique position.
+    """
+    col, nullable = _SORT_COLUMNS[sort_by]
+    is_desc = sort_dir == SortDirection.DESC
+
+    order = col.desc() if is_desc else col.asc()
+    if nullable:
+        order = order.nulls_last()
+    stmt = stmt.order_by(order, Trade.id)
+
+    if after is None:
+        return stmt
+
+    value, after_id = after
+    if value is None:
+        # Only the NULL tail (ordered by id) is left
+        return stmt.where(col.is_(None), Trade.id > after_id)
+
+    past = col < value if is_desc else col > value
+    keyset = or_(past, and_(col == value, Trade.id > after_id))
+    if nullable:
+        keyset = or_(keyset, col.is_(None))
+    return stmt.where(keyset)
+
+
+def get_chart_images_for_user_sync(
+    db: Session, *, user_id: str, trade_ids: list[str], kind: str = CHART_KIND
+) -> dict[str, TradeImage]:
+    """
+    trade_id -> image metadata for the caller's trades among `trade_ids`, in one
+    query (ownership check included). Falls back to the full chart when `kind`
+    (a rendition) is missing. Unknown / foreign / chartless ids are absent.
+    Sync: the chart batch endpoint streams bytes through the same Session.
+    """
+    rows = db.scalars(
+        select(TradeImage)
+        .join(Trade, Trade.id == TradeImage.trade_id)
+        .where(
+            Trade.user_id == user_id,
+            TradeImage.trade_id.in_(trade_ids),
+            TradeImage.kind.in_({kind, CHART_KIND}),
+        )
+    ).all()
+
+    found: dict[str, TradeImage] = {}
+    for row in rows:
+        if row.kind == kind or row.trade_id not in found:
+            found[row.trade_id] = row
+    return found
+
+
+async def list_trades_for_user_with_chart_flag(
+    db: AsyncSession,
     *,
     user_id: str,
+    filters: TradeListFilters | None = None,
+    sort_by: TradeSortKey = TradeSortKey.CREATED_AT,
+    sort_dir: SortDirection = SortDirection.DESC,
     limit: int = 50,
-    offset: int = 0,
-) -> list[tuple[Trade, bool]]:
+    cursor: str | None = None,
+) -> tuple[list[tuple[Trade, bool]], str | None]:
+    """
+    Filtered, sorted, keyset-paginated journal list.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor or one issued for another sort order.
+    """
     has_chart_expr = exists(
         select(literal(1)).where(
             TradeImage.trade_id == Trade.id,
@@ -108,12 +273,79 @@ def list_trades_for_user_with_chart_flag(
         )
     )
 
-    stmt = (
-        select(Trade, has_chart_expr.label("has_chart"))
-        .where(Trade.user_id == user_id)
-        .order_by(desc(Trade.created_at))
-        .limit(limit)
-        .offset(offset)
+    after = None
+    if cursor is not None:
+        after = decode_trade_cursor(cursor, sort_by=sort_by, sort_dir=sort_dir)
+
+    stmt = select(Trade, has_chart_expr.label("has_chart")).where(
+        *trade_filter_clauses(user_id=user_id, filters=filters)
     )
+    stmt = apply_trade_sort(stmt, sort_by=sort_by, sort_dir=sort_dir, after=after)
+    stmt = stmt.limit(limit + 1)  # one extra row tells us whether there is a next page
+
+    rows = list((await db.execute(stmt)).tuples().all())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last, _ = rows[-1]
+    col, _ = _SORT_COLUMNS[sort_by]
+    return rows, encode_trade_cursor(sort_by, sort_dir, getattr(last, col.key), last.id)
+
+
+# Flat column set for exports (inputs + outputs + journal), in CSV header order
+EXPORT_COLUMNS = (
+    Trade.id,
+    Trade.created_at,
+    Trade.updated_at,
+    Trade.symbol,
+    Trade.direction,
+    Trade.status,
+    Trade.balance_chf,
+    Trade.risk_pct,
+    Trade.entry_price,
+    Trade.stop_distance,
+    Trade.stop_unit,
+    Trade.tp_r_multiple,
+    Trade.lot_step,
+    Trade.usdchf_rate,
+    Trade.tick_size,
+    Trade.contract_size,
+    Trade.sl_price,
+    Trade.tp_price,
+    Trade.risk_distance_price,
+    Trade.reward_distance_price,
+    Trade.lots,
+    Trade.risk_chf,
+    Trade.reward_chf,
+    Trade.reward_to_risk,
+    Trade.value_per_unit_1lot_chf,
+    Trade.stop_value_1lot_chf,
+    Trade.exposure_units,
+    Trade.opened_at,
+    Trade.closed_at,
+    Trade.exit_price,
+    Trade.realized_pnl_chf,
+    Trade.realized_r_multiple,
+    Trade.note,
+)
+
+
+def iter_trade_export_batches(
+    db: Session,
+    *,
+    user_id: str,
+    filters: TradeListFilters | None = None,
+    batch_size: int = 1000,
+) -> Iterator[list[Row]]:
+    """
+    Yields batches of plain column Rows (no ORM instances), oldest first.
+    yield_per streams from a server-side cursor where the driver supports it,
+    so memory stays flat regardless of journal size.
+    """
+    stmt = select(*EXPORT_COLUMNS).where(*trade_filter_clauses(user_id=user_id, filters=filters))
+    stmt = apply_trade_sort(stmt, sort_by=TradeSortKey.CREATED_AT, sort_dir=SortDirection.ASC)
 
-    return db.execute(stmt).tuples().all()
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for batch in result.partitions():
+        yield batch
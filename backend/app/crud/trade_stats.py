@@ -0,0 +1,194 @@
+# app/crud/trade_stats.py
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.trade import Trade
+from app.models.trade_stats import ALL, UserTradeStats
+from app.schemas.trade import TradeStatus
+
+_COUNTERS = (
+    "trade_count",
+    "win_count",
+    "loss_count",
+    "pnl_sum_chf",
+    "gross_profit_chf",
+    "gross_loss_chf",
+    "r_count",
+    "r_sum",
+)
+
+Delta = dict[str, float]
+
+
+def _month(closed_at: datetime | None, created_at: datetime | None) -> str:
+    ts = closed_at or created_at
+    return ts.strftime("%Y-%m") if ts else ALL
+
+
+def trade_contribution(
+    *,
+    status: str,
+    pnl: float | None,
+    r: float | None,
+) -> Delta | None:
+    """What one trade adds to its buckets; None if it does not count (not CLOSED)."""
+    if status != TradeStatus.CLOSED.value:
+        return None
+    d = dict.fromkeys(_COUNTERS, 0)
+    if pnl is not None:
+        d["trade_count"] = 1
+        d["win_count"] = 1 if pnl > 0 else 0
+        d["loss_count"] = 1 if pnl < 0 else 0
+        d["pnl_sum_chf"] = pnl
+        d["gross_profit_chf"] = max(pnl, 0.0)
+        d["gross_loss_chf"] = max(-pnl, 0.0)
+    if r is not None:
+        d["r_count"] = 1
+        d["r_sum"] = r
+    return d
+
+
+def _buckets(symbol: str, month: str) -> list[tuple[str, str]]:
+    keys = [(ALL, ALL), (symbol, ALL)]
+    if month != ALL:
+        keys += [(ALL, month), (symbol, month)]
+    return keys
+
+
+class TradeStatsSnapshot:
+    """
+    Captures a trade's rollup contribution so a later change can be applied as a delta:
+
+        before = TradeStatsSnapshot(trade)
+        ... mutate trade ...
+        apply_trade_change(db, before, TradeStatsSnapshot(trade))
+    """
+
+    __slots__ = ("user_id", "symbol", "month", "contribution")
+
+    def __init__(self, trade: Trade | None):
+        if trade is None:
+            self.user_id = self.symbol = self.month = ""
+            self.contribution = None
+            return
+        self.user_id = trade.user_id
+        self.symbol = trade.symbol
+        self.month = _month(trade.closed_at, trade.created_at)
+        self.contribution = trade_contribution(
+            status=trade.status, pnl=trade.realized_pnl_chf, r=trade.realized_r_multiple
+        )
+
+
+def _increment(db: Session, user_id: str, deltas: dict[tuple[str, str], Delta]) -> None:
+    """Atomic `col = col + delta` per bucket, inserting missing buckets (upsert)."""
+    rows = [
+        {"user_id": user_id, "symbol": symbol, "period": period, **delta}
+        for (symbol, period), delta in deltas.items()
+        if any(delta.values())
+    ]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        stmt = insert(UserTradeStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "symbol", "period"],
+            set_={
+                **{c: getattr(UserTradeStats, c) + getattr(stmt.excluded, c) for c in _COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        key = {k: row[k] for k in ("user_id", "symbol", "period")}
+        res = db.execute(
+            update(UserTradeStats)
+            .filter_by(**key)
+            .values({c: getattr(UserTradeStats, c) + row[c] for c in _COUNTERS})
+        )
+        if res.rowcount == 0:
+            db.add(UserTradeStats(**row))
+            db.flush()
+
+
+def apply_trade_change(db: Session, before: TradeStatsSnapshot, after: TradeStatsSnapshot) -> None:
+    """
+    Apply (after - before) to the rollup. Call inside the same transaction as the
+    trade write, before commit.
+    """
+    deltas: dict[tuple[str, str], Delta] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+
+    if before.contribution is not None:
+        for key in _buckets(before.symbol, before.month):
+            for c, v in before.contribution.items():
+                deltas[key][c] -= v
+    if after.contribution is not None:
+        for key in _buckets(after.symbol, after.month):
+            for c, v in after.contribution.items():
+                deltas[key][c] += v
+
+    user_id = after.user_id or before.user_id
+    if user_id:
+        _increment(db, user_id, deltas)
+
+
+def get_trade_stats(
+    db: Session, *, user_id: str, symbol: str = ALL, period: str = ALL
+) -> UserTradeStats | None:
+    return db.get(UserTradeStats, (user_id, symbol, period))
+
+
+def rebuild_trade_stats(db: Session, *, user_ids: Iterable[str] | None = None, batch_size: int = 5000) -> int:
+    """
+    Recompute rollups from the trades table (backfill / repair).
+    Rebuilds every user when user_ids is None. Returns the number of bucket rows written.
+    Commits.
+    """
+    ids = list(user_ids) if user_ids is not None else None
+
+    stmt = select(
+        Trade.user_id,
+        Trade.symbol,
+        Trade.closed_at,
+        Trade.created_at,
+        Trade.realized_pnl_chf,
+        Trade.realized_r_multiple,
+    ).where(Trade.status == TradeStatus.CLOSED.value)
+    wipe = delete(UserTradeStats)
+    if ids is not None:
+        stmt = stmt.where(Trade.user_id.in_(ids))
+        wipe = wipe.where(UserTradeStats.user_id.in_(ids))
+
+    totals: dict[tuple[str, str, str], Delta] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for user_id, symbol, closed_at, created_at, pnl, r in result:
+        contribution = trade_contribution(status=TradeStatus.CLOSED.value, pnl=pnl, r=r)
+        for symbol_key, period in _buckets(symbol, _month(closed_at, created_at)):
+            bucket = totals[(user_id, symbol_key, period)]
+            for c, v in contribution.items():
+                bucket[c] += v
+
+    db.execute(wipe)
+    if totals:
+        db.execute(
+            UserTradeStats.__table__.insert(),
+            [
+                {"user_id": u, "symbol": s, "period": p, **counters}
+                for (u, s, p), counters in totals.items()
+            ],
+        )
+    db.commit()
+    return len(totals)
@@ -1,9 +1,12 @@
 # app/crud/user.py
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import invalidate_principal
 from app.core.security import hash_password, verify_password
+from app.crud.blob import release_user_blobs
+from app.models.trade import Trade
 from app.models.user import User
 
 
@@ -17,7 +20,6 @@ def get_by_id(db: Session, id: str) -> User | None:
     return db.execute(select(User).where(User.id == id)).scalars().first()
 
 def create(db: Session, email: str, username: str, password: str) -> User:
-    print(f"In crud/user.py, {email = } {username = } {password = }")
     user = User(email=email, password_hash=hash_password(password), username=username)
     db.add(user)
     db.commit()
@@ -31,6 +33,7 @@ def update_user(db: Session, user: User, *, email: str | None, username: str | N
         user.username = username
     db.add(user)
     db.commit()
+    invalidate_principal(user.id)
     db.refresh(user)
     return user
 
@@ -40,10 +43,17 @@ def change_password(db: Session, user: User, *, current_password: str, new_passw
     user.password_hash = hash_password(new_password)
     db.add(user)
     db.commit()
+    invalidate_principal(user.id)
 
 def delete_user(db: Session, user: User, *, current_password: str) -> None:
     if not verify_password(current_password, user.password_hash):
         raise ValueError("Invalid current password")
+    # Cascaded image rows still hold blob references; the caller then runs store.collect_garbage()
+    release_user_blobs(db, user.id)
+    # trades.user_id has no ON DELETE CASCADE; images and ingest jobs cascade from trades
+    user_id = user.id
+    db.execute(delete(Trade).where(Trade.user_id == user_id))
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
 
@@ -2,7 +2,8 @@
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
@@ -10,17 +11,66 @@ from app.core.config import settings
 isDB_SQLite = settings.DATABASE_URL.startswith("sqlite")
 connect_args = {"check_same_thread": False} if isDB_SQLite  else {}
 
+
+def pool_kwargs(url: str) -> dict:
+  """Pool settings for create_engine / create_async_engine."""
+  kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE_S}
+  u = make_url(url)
+  if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+    return kwargs  # single-connection pool; size/overflow don't apply
+  return {
+    **kwargs,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_S,
+  }
+
+
+def sqlite_pragmas() -> list[str]:
+  return [
+    "PRAGMA foreign_keys=ON",
+    f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+    f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+    f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_BYTES}",
+    f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",  # negative = KiB, not pages
+  ]
+
+
 engine = create_engine(
   settings.DATABASE_URL, 
   connect_args=connect_args, 
-  future=True
+  future=True,
+  **pool_kwargs(settings.DATABASE_URL)
 )
 
+
+def async_database_url(url: str) -> str:
+  """
+  Same database through its asyncio driver: sqlite -> aiosqlite (a dependency),
+  postgresql -> asyncpg (`poetry install -E postgres`; async_engine is built at
+  import, so a Postgres deployment without it fails on startup).
+  """
+  u = make_url(url)
+  backend = u.get_backend_name()
+  if backend == "sqlite":
+    return u.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+  if backend == "postgresql":
+    return u.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+  return url
+
+
+# Async endpoints hold a connection, not a threadpool thread, while they wait on the DB
+async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(async_url, future=True, **pool_kwargs(async_url))
+
+# Listens on the Engine class, so it also covers async_engine (its sync_engine underneath)
 if isDB_SQLite:
   @event.listens_for(Engine, "connect")
   def _set_sqlite_pragma(dbapi_connection, connection_record):
       cursor = dbapi_connection.cursor()
-      cursor.execute("PRAGMA foreign_keys=ON")
+      for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
       cursor.close()
 
 SessionLocal = sessionmaker(
@@ -29,3 +79,10 @@ SessionLocal = sessionmaker(
   autocommit=False, # If changes are to persist, they must be committed; no exceptions
   future=True
 )
+
+AsyncSessionLocal = async_sessionmaker(
+  bind=async_engine,
+  autoflush=False,
+  # Attributes stay loaded after commit: an expired one would need a lazy load, which asyncio can't do implicitly
+  expire_on_commit=False
+)
@@ -1,12 +1,17 @@
 # app/main.py
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.api.v1.router import router as v1_router
 
+from app.core.executors import ExecutorSaturatedError, executor_stats, shutdown_executors
+from app.core.middleware import BodySizeLimitMiddleware
+from app.db.session import SessionLocal, async_engine
+from app.services.chart_ingest import chart_ingest_worker, resume_chart_ingest_jobs
 from app.db.init_db import bootstrap_root_admin, ensure_admin_exists
 from app.db.migrations_check import ensure_db_is_at_head
 
@@ -22,15 +27,23 @@ async def lifespan(app: FastAPI):
     if settings.REQUIRE_ADMIN_ON_STARTUP:
         ensure_admin_exists()
 
+    with SessionLocal() as db:
+        resume_chart_ingest_jobs(db)
+
     yield
 
     # --- Shutdown (optional cleanup) ---
-    # nothing needed for now
+    chart_ingest_worker.stop()
+    shutdown_executors()
+    await async_engine.dispose()
 
 app = FastAPI(title="Trade Calc API", lifespan=lifespan)
 
 origins = [o.strip() for o in settings.CORS_ORIGINS.split(",") if o.strip()]
 
+# Added before CORSMiddleware so CORS wraps it: a 413 still carries access-control-* headers
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.MAX_REQUEST_BODY_BYTES)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins or ["*"],
@@ -42,10 +55,20 @@ app.add_middleware(
 app.include_router(v1_router)
 
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated(_request: Request, _exc: ExecutorSaturatedError):
+    # Any bounded pool that is full (password hashing on login/register/profile)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def index_page():
     return {"status": "ok", "msg": "go explore other pages"}
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "executors": executor_stats()}
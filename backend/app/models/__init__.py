@@ -2,7 +2,10 @@
 
 from app.models.user import User
 from app.models.trade import Trade
+from app.models.blob import Blob
 from app.models.trade_image import TradeImage
+from app.models.trade_stats import UserTradeStats
+from app.models.chart_ingest_job import ChartIngestJob
 
-__all__ = ["User", "Trade", "TradeImage"]
+__all__ = ["User", "Trade", "Blob", "TradeImage", "UserTradeStats", "ChartIngestJob"]
 
@@ -0,0 +1,36 @@
+# app/models/blob.py
+
+from __future__ import annotations
+
+from sqlalchemy import DDL, LargeBinary, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins.timestamps import TimestampMixin
+
+
+class Blob(Base, TimestampMixin):
+    """
+    Image content, stored once per sha256 however many trade_images rows use it.
+    refcount is maintained by app/crud/blob.py; rows at 0 are garbage.
+    """
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    byte_size: Mapped[int] = mapped_column(nullable=False)
+
+    # Number of trade_images rows pointing here
+    refcount: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+
+    # NULL when the bytes live outside the DB (fs / s3 stores).
+    # Deferred: loading a Blob never pulls the bytes unless asked for.
+    data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+
+
+# Postgres: keep the bytes out of line and uncompressed (WebP doesn't compress anyway),
+# so substr() in DbTradeImageStore.iter_bytes fetches only the TOAST chunks it needs
+event.listen(
+    Blob.__table__,
+    "after_create",
+    DDL("ALTER TABLE blobs ALTER COLUMN data SET STORAGE EXTERNAL").execute_if(dialect="postgresql"),
+)
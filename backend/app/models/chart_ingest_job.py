@@ -0,0 +1,43 @@
+# app/models/chart_ingest_job.py
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins.timestamps import TimestampMixin
+
+
+# Async chart upload (POST /trades/{id}/chart?mode=async): raw bytes wait in the
+# spool dir until a worker compresses them and hands them to the image store.
+class ChartIngestJob(Base, TimestampMixin):
+    __tablename__ = "chart_ingest_jobs"
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+    )
+
+    trade_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("trades.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    kind: Mapped[str] = mapped_column(String(16), nullable=False, server_default="CHART")
+
+    # "QUEUED" | "PROCESSING" | "DONE" | "FAILED"
+    status: Mapped[str] = mapped_column(String(12), nullable=False, server_default="QUEUED")
+    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    spool_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    byte_size: Mapped[int] = mapped_column(nullable=False)  # raw upload size
+
+
+# Status lookups: latest job for a trade
+Index("ix_chart_ingest_jobs_trade_id_created_at", ChartIngestJob.trade_id, ChartIngestJob.created_at)
+# Startup recovery: unfinished jobs
+Index("ix_chart_ingest_jobs_status", ChartIngestJob.status)
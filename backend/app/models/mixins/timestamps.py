@@ -1,12 +1,20 @@
 # app/models/mixins/timestamps.py
 
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
 
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class TimestampMixin:
+    # App-side default (microsecond precision) so values round-trip exactly when
+    # used as keyset cursors; server_default stays for raw SQL inserts.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False,
     )
@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -49,6 +49,7 @@ class Trade(
 
     opened_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    exit_price: Mapped[float | None] = mapped_column(nullable=True)  # realized_* derive from it (services.pnl)
     realized_pnl_chf: Mapped[float | None] = mapped_column(nullable=True)
     realized_r_multiple: Mapped[float | None] = mapped_column(nullable=True)
 
@@ -59,3 +60,13 @@ class Trade(
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+
+
+# Keyset pagination for the journal list: WHERE user_id = ? ORDER BY created_at DESC, id
+Index("ix_trades_user_id_created_at_id", Trade.user_id, Trade.created_at.desc(), Trade.id)
+
+# Journal list filters (see crud.trade.trade_filter_clauses), e.g.
+# "CLOSED XAUUSD trades last quarter" -> (user_id, status, symbol) equality + closed_at range
+Index("ix_trades_user_id_status_symbol_closed_at", Trade.user_id, Trade.status, Trade.symbol, Trade.closed_at)
+Index("ix_trades_user_id_status_created_at", Trade.user_id, Trade.status, Trade.created_at)
+Index("ix_trades_user_id_symbol_created_at", Trade.user_id, Trade.symbol, Trade.created_at)
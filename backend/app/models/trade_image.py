@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import ForeignKey, LargeBinary, String, UniqueConstraint
+from sqlalchemy import ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -30,14 +30,13 @@ class TradeImage(Base, TimestampMixin):
         nullable=False,
     )
 
-    # For now: only "CHART"
+    # "CHART" plus its renditions ("CHART_MEDIUM", "CHART_THUMB")
     kind: Mapped[str] = mapped_column(String(16), nullable=False, server_default="CHART")
 
     mime: Mapped[str] = mapped_column(String(64), nullable=False)
-    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    # The bytes live in blobs (or the fs/s3 store), shared by every row with this hash
+    sha256: Mapped[str] = mapped_column(String(64), ForeignKey("blobs.sha256", name="fk_trade_images_sha256_blobs"), nullable=False, index=True)
 
     byte_size: Mapped[int] = mapped_column(nullable=False)
 
-    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
-
     trade = relationship("Trade", back_populates="images")
@@ -0,0 +1,40 @@
+# app/models/trade_stats.py
+
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins.timestamps import TimestampMixin
+
+# Bucket wildcard for symbol / period
+ALL = "*"
+
+
+# Per-user rollup of CLOSED trades, maintained incrementally by crud.trade_stats.
+# One row per (user, symbol, period) bucket; symbol/period are "*" for "all",
+# period is otherwise the close month "YYYY-MM".
+class UserTradeStats(Base, TimestampMixin):
+    __tablename__ = "user_trade_stats"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    symbol: Mapped[str] = mapped_column(String(32), primary_key=True)
+    period: Mapped[str] = mapped_column(String(7), primary_key=True)
+
+    # Closed trades with a realized PnL
+    trade_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    win_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    loss_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    pnl_sum_chf: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    gross_profit_chf: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    gross_loss_chf: Mapped[float] = mapped_column(nullable=False, default=0.0)  # positive number
+
+    # Closed trades with a realized R multiple
+    r_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    r_sum: Mapped[float] = mapped_column(nullable=False, default=0.0)
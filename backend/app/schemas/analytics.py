@@ -0,0 +1,100 @@
+# app/schemas/analytics.py
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class EquityCurve(BaseModel):
+    # Columnar, one entry per CLOSED trade with a realized PnL, in close order
+    closed_at: list[Optional[datetime]]
+    equity_chf: list[float]
+    drawdown_chf: list[float]
+
+
+class RHistogram(BaseModel):
+    # counts[i] covers [edges[i], edges[i+1]); outliers are clipped into the outer bins
+    edges: list[float]
+    counts: list[int]
+
+
+class AnalyticsSummaryOut(BaseModel):
+    trade_count: int
+    win_count: int
+    loss_count: int
+    win_rate: Optional[float] = None
+
+    total_pnl_chf: float
+    avg_win_chf: Optional[float] = None
+    avg_loss_chf: Optional[float] = None
+    expectancy_chf: Optional[float] = None
+    expectancy_r: Optional[float] = None
+    profit_factor: Optional[float] = None # None when there are no losing trades
+
+    max_drawdown_chf: float
+
+    equity_curve: EquityCurve
+    r_histogram: RHistogram
+
+
+class TradeStatsOut(BaseModel):
+    # O(1) read from the user_trade_stats rollup
+    symbol: str # "*" = all symbols
+    period: str # "YYYY-MM" or "*" = all time
+
+    trade_count: int
+    win_count: int
+    loss_count: int
+    win_rate: Optional[float] = None
+
+    total_pnl_chf: float
+    expectancy_chf: Optional[float] = None
+    expectancy_r: Optional[float] = None
+    profit_factor: Optional[float] = None
+
+
+MONTE_CARLO_MAX_PATHS = 100_000
+MONTE_CARLO_MAX_TRADES = 1_000
+
+
+class MonteCarloRequest(BaseModel):
+    # Bootstrap-resampled equity paths from the user's historical R multiples
+    paths: int = Field(default=10_000, ge=100, le=MONTE_CARLO_MAX_PATHS)
+    trades: int = Field(default=100, ge=1, le=MONTE_CARLO_MAX_TRADES)
+
+    risk_pct: Optional[float] = Field(default=None, gt=0, le=5) # None = median risk_pct of the sampled trades
+    ruin_drawdown_pct: float = Field(default=50.0, gt=0, lt=100) # ruin = equity at or below (100 - x)% of start
+
+    symbol: Optional[str] = Field(default=None, min_length=1, max_length=32)
+    seed: Optional[int] = Field(default=None, ge=0) # fixed seed -> reproducible result
+
+
+class EquityBands(BaseModel):
+    # Columnar: equity as a multiple of starting balance, one row per percentile;
+    # step[i] is the trade number (0 = start), down-sampled to at most 101 points
+    percentiles: list[float]
+    step: list[int]
+    equity: list[list[float]]
+
+
+class MaxDrawdownDistribution(BaseModel):
+    # Per-path max drawdown (fraction of the running peak)
+    percentiles: list[float]
+    values: list[float]
+    mean: float
+    edges: list[float]
+    counts: list[int]
+
+
+class MonteCarloOut(BaseModel):
+    paths: int
+    trades: int
+    risk_pct: float
+    sample_size: int # historical R multiples resampled from
+
+    risk_of_ruin: float # fraction of paths that hit the ruin level at any point
+    equity_bands: EquityBands
+    max_drawdown: MaxDrawdownDistribution
@@ -0,0 +1,57 @@
+# app/schemas/sizing.py
+
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.trade import TradeDirection
+
+MAX_GRID_POINTS = 250_000
+
+
+class GridRange(BaseModel):
+    # Inclusive, evenly spaced (numpy.linspace)
+    start: float
+    stop: float
+    num: int = Field(ge=1, le=1000)
+
+
+class SizingGridRequest(BaseModel):
+    symbol: str = Field(min_length=1, max_length=32)
+    direction: TradeDirection
+    entry_price: float
+    balance_chf: float
+    lot_step: float = 0.01
+    usdchf_rate: float
+    tick_size: Optional[float] = None # XAUUSD only
+    contract_size: Optional[float] = None # XAUUSD only
+
+    risk_pct: GridRange
+    stop_distance: GridRange
+    tp_r_multiple: GridRange
+
+    @model_validator(mode="after")
+    def _check_size(self) -> SizingGridRequest:
+        points = self.risk_pct.num * self.stop_distance.num * self.tp_r_multiple.num
+        if points > MAX_GRID_POINTS:
+            raise ValueError(f"Grid too large ({points} points > {MAX_GRID_POINTS})")
+        return self
+
+
+class SizingGridOut(BaseModel):
+    # Columnar payload: every value array is the grid flattened in C order over
+    # shape = [len(risk_pct), len(stop_distance), len(tp_r_multiple)].
+    # Points that cannot be sized (e.g. lots round down to 0) are null.
+    shape: list[int]
+
+    risk_pct: list[float]
+    stop_distance: list[float]
+    tp_r_multiple: list[float]
+
+    lots: list[Optional[float]]
+    risk_chf: list[Optional[float]]
+    reward_chf: list[Optional[float]]
+    sl_price: list[Optional[float]]
+    tp_price: list[Optional[float]]
@@ -23,6 +23,28 @@ class TradeStatus(str, Enum):
     CLOSED = "CLOSED"
     CANCELLED = "CANCELLED"
 
+class TradeSortKey(str, Enum):
+    # Whitelist of columns the journal list can be ordered by
+    CREATED_AT = "created_at"
+    CLOSED_AT = "closed_at"
+    SYMBOL = "symbol"
+    REALIZED_PNL_CHF = "realized_pnl_chf"
+    REALIZED_R_MULTIPLE = "realized_r_multiple"
+
+class SortDirection(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class OutputsPolicy(str, Enum):
+    # How POST /trades treats client-computed outputs (see services.sizing)
+    CLIENT = "client" # store as posted
+    VERIFY = "verify" # reject if they disagree with server sizing
+    RECOMPUTE = "recompute" # replace with server sizing
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
 class TradeInputs(BaseModel):
     balance_chf: Optional[float] = None
     risk_pct: Optional[float] = None
@@ -63,7 +85,9 @@ class TradeJournal(BaseModel):
 
     opened_at: Optional[datetime] = None
     closed_at: Optional[datetime] = None
+    exit_price: Optional[float] = Field(default=None, gt=0)
 
+    # Derived from exit_price on CLOSED trades unless given explicitly (fees, swaps, ...)
     realized_pnl_chf: Optional[float] = None
     realized_r_multiple: Optional[float] = None
 
@@ -82,9 +106,40 @@ class TradeUpdate(BaseModel):
     status: Optional[TradeStatus] = None
     opened_at: Optional[datetime] = None
     closed_at: Optional[datetime] = None
+    exit_price: Optional[float] = Field(default=None, gt=0)
     realized_pnl_chf: Optional[float] = None
     realized_r_multiple: Optional[float] = None
 
+class TradePnlRecompute(BaseModel):
+    # Bulk PnL recompute for CLOSED trades with an exit price
+    symbol: Optional[str] = Field(default=None, min_length=1, max_length=32)
+    usdchf_rate: Optional[float] = Field(default=None, gt=0) # corrected USD->CHF rate to apply first
+
+class TradePnlRecomputeOut(BaseModel):
+    updated: int
+
+class TradeListFilters(BaseModel):
+    # All optional; ranges are [from, to)
+    status: Optional[TradeStatus] = None
+    symbol: Optional[str] = Field(default=None, min_length=1, max_length=32)
+    direction: Optional[TradeDirection] = None
+
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    closed_from: Optional[datetime] = None
+    closed_to: Optional[datetime] = None
+
+class TradeListQuery(TradeListFilters):
+    # GET /trades query string: filters + sort + keyset paging
+    sort_by: TradeSortKey = TradeSortKey.CREATED_AT
+    sort_dir: SortDirection = SortDirection.DESC
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None # next_cursor from the previous page
+
+class TradeExportQuery(TradeListFilters):
+    # GET /trades/export query string: same filters as the list, no paging
+    format: ExportFormat = ExportFormat.CSV
+
 class TradeSummaryOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -98,6 +153,10 @@ class TradeSummaryOut(BaseModel):
 
     outputs: TradeOutputs
 
+class TradePage(BaseModel):
+    items: list[TradeSummaryOut]
+    next_cursor: Optional[str] = None # opaque; pass back as ?cursor= to get the next page (None = last page)
+
 class TradeDetailOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
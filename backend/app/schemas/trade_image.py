@@ -0,0 +1,67 @@
+# app/schemas/trade_image.py
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ChartIngestMode(str, Enum):
+    SYNC = "sync"    # 204 once the image is compressed and stored
+    ASYNC = "async"  # 202 + job id as soon as the bytes are spooled
+
+
+class ChartSize(str, Enum):
+    FULL = "full"      # up to 1600px
+    MEDIUM = "medium"  # 800px
+    THUMB = "thumb"    # 320px, for list/gallery views
+
+
+class ChartIngestStatus(str, Enum):
+    QUEUED = "QUEUED"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class ChartIngestJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    trade_id: str
+    kind: str
+    status: ChartIngestStatus
+    error: Optional[str] = None
+    byte_size: int # raw upload size
+
+    created_at: datetime
+    updated_at: datetime
+
+
+class ChartBatchFormat(str, Enum):
+    METADATA = "metadata"  # JSON list, no bytes
+    ZIP = "zip"            # application/zip stream, one <trade_id>.<ext> entry per image
+
+
+class ChartBatchGet(BaseModel):
+    trade_ids: list[str] = Field(min_length=1, max_length=200)
+    size: ChartSize = ChartSize.FULL
+    format: ChartBatchFormat = ChartBatchFormat.METADATA
+
+
+class ChartMetaOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    trade_id: str
+    kind: str
+    mime: str
+    sha256: str
+    byte_size: int
+
+
+class ChartBatchOut(BaseModel):
+    items: list[ChartMetaOut]
+    missing: list[str]  # unknown, not yours, or no chart
@@ -45,6 +45,42 @@ def prod() -> None:
     raise SystemExit(subprocess.call(cmd))
 
 
+def rebuild_stats() -> None:
+    """
+    Backfill / repair the user_trade_stats rollup from the trades table.
+    Optional user ids as arguments; rebuilds everyone otherwise.
+    """
+    from app.crud.trade_stats import rebuild_trade_stats
+    from app.db.session import SessionLocal
+
+    user_ids = sys.argv[1:] or None
+    db = SessionLocal()
+    try:
+        n = rebuild_trade_stats(db, user_ids=user_ids)
+    finally:
+        db.close()
+    print(f"Rebuilt {n} stats buckets")
+
+
+def gc_blobs() -> None:
+    """
+    Repair chart blob refcounts from trade_images and delete unreferenced blobs
+    (including their files / objects for the fs and s3 stores).
+    """
+    from app.core.deps_storage import build_trade_image_store
+    from app.crud.blob import recount_blob_refs
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        fixed = recount_blob_refs(db)
+        db.commit()
+        removed = build_trade_image_store(db).collect_garbage()
+    finally:
+        db.close()
+    print(f"Fixed {fixed} refcounts, removed {removed} unreferenced blobs")
+
+
 if __name__ == "__main__":
     mode = (sys.argv[1] if len(sys.argv) > 1 else "dev").lower()
     prod() if mode == "prod" else dev()
@@ -1,2 +1,90 @@
 # app/services/analytics.py
 
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.trade import Trade
+from app.schemas.analytics import AnalyticsSummaryOut, EquityCurve, RHistogram
+from app.schemas.trade import TradeStatus
+
+# Half-R buckets from -3R to +5R
+R_HISTOGRAM_EDGES = np.arange(-3.0, 5.0 + 0.5, 0.5)
+
+
+def load_closed_trade_columns(
+    db: Session, *, user_id: str, symbol: str | None = None
+) -> tuple[list[datetime | None], np.ndarray, np.ndarray]:
+    """
+    One query, returned as columns: (closed_at, realized_pnl_chf, realized_r_multiple).
+    Missing numeric values come back as NaN. Rows are in close order
+    (created_at stands in for trades closed without a timestamp).
+    """
+    stmt = (
+        select(Trade.closed_at, Trade.realized_pnl_chf, Trade.realized_r_multiple)
+        .where(Trade.user_id == user_id, Trade.status == TradeStatus.CLOSED.value)
+        .order_by(func.coalesce(Trade.closed_at, Trade.created_at), Trade.id)
+    )
+    if symbol is not None:
+        stmt = stmt.where(Trade.symbol == symbol)
+
+    rows = db.execute(stmt).all()
+    if not rows:
+        return [], np.empty(0), np.empty(0)
+
+    closed_at, pnl, r = zip(*rows)
+    return list(closed_at), np.array(pnl, dtype=np.float64), np.array(r, dtype=np.float64)
+
+
+def r_histogram(r: np.ndarray) -> RHistogram:
+    r = r[~np.isnan(r)]
+    clipped = np.clip(r, R_HISTOGRAM_EDGES[0], np.nextafter(R_HISTOGRAM_EDGES[-1], -np.inf))
+    counts, _ = np.histogram(clipped, bins=R_HISTOGRAM_EDGES)
+    return RHistogram(edges=R_HISTOGRAM_EDGES.tolist(), counts=counts.tolist())
+
+
+def summarize(closed_at: list[datetime | None], pnl: np.ndarray, r: np.ndarray) -> AnalyticsSummaryOut:
+    """Vectorized reductions over column arrays (see load_closed_trade_columns)."""
+    has_pnl = ~np.isnan(pnl)
+    p = pnl[has_pnl]
+
+    wins = p[p > 0]
+    losses = p[p < 0]
+    gross_profit = float(wins.sum())
+    gross_loss = float(-losses.sum())
+
+    equity = np.cumsum(p)
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    drawdown = peak - equity
+
+    r_valid = r[~np.isnan(r)]
+    n = int(p.size)
+
+    return AnalyticsSummaryOut(
+        trade_count=n,
+        win_count=int(wins.size),
+        loss_count=int(losses.size),
+        win_rate=float(wins.size / n) if n else None,
+        total_pnl_chf=float(p.sum()),
+        avg_win_chf=float(wins.mean()) if wins.size else None,
+        avg_loss_chf=float(losses.mean()) if losses.size else None,
+        expectancy_chf=float(p.mean()) if n else None,
+        expectancy_r=float(r_valid.mean()) if r_valid.size else None,
+        profit_factor=gross_profit / gross_loss if gross_loss > 0 else None,
+        max_drawdown_chf=float(drawdown.max()) if n else 0.0,
+        equity_curve=EquityCurve(
+            closed_at=[c for c, keep in zip(closed_at, has_pnl) if keep],
+            equity_chf=equity.tolist(),
+            drawdown_chf=drawdown.tolist(),
+        ),
+        r_histogram=r_histogram(r),
+    )
+
+
+def summary_for_user(db: Session, *, user_id: str, symbol: str | None = None) -> AnalyticsSummaryOut:
+    closed_at, pnl, r = load_closed_trade_columns(db, user_id=user_id, symbol=symbol)
+    return summarize(closed_at, pnl, r)
@@ -0,0 +1,157 @@
+# app/services/chart_ingest.py
+
+# Async chart uploads: the request spools the raw bytes and records a job, then
+# returns 202. ChartIngestWorker threads pick jobs off an in-process queue, encode
+# in the image process pool and save through the normal TradeImageStore. The jobs
+# table is the source of truth, so unfinished jobs are requeued on startup.
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Mapping
+
+from sqlalchemy import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.deps_storage import build_trade_image_store
+from app.core.executors import ExecutorSaturatedError, run_in_image_pool
+from app.crud.chart_ingest import requeue_unfinished_chart_ingest_jobs
+from app.models.chart_ingest_job import ChartIngestJob
+from app.schemas.trade_image import ChartIngestStatus
+from app.services.storage.base import TradeImageStore
+from app.services.storage.image_processing import (
+    CHART_KIND, ImageTooLargeError, InvalidImageError, compress_chart_renditions
+)
+
+logger = logging.getLogger(__name__)
+
+SPOOL_COPY_CHUNK = 1024 * 1024
+
+# Backoff while sync uploads hold every image pool slot
+SATURATED_RETRY_S = 0.2
+
+
+def spool_chart_upload(src: BinaryIO, *, max_bytes: int | None = None) -> tuple[str, int]:
+    """
+    Copy an upload stream into the spool dir in fixed-size chunks; returns (path, byte_size).
+    Stops reading and removes the partial file as soon as max_bytes is exceeded.
+    """
+    spool_dir = Path(settings.CHART_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    path = spool_dir / f"{uuid.uuid4()}.raw"
+
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := src.read(SPOOL_COPY_CHUNK):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise ImageTooLargeError(f"Upload too large (>{max_bytes} bytes)")
+                out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return str(path), size
+
+
+def save_chart_renditions(
+    store: TradeImageStore, *, trade_id: str, renditions: Mapping[str, tuple[bytes, str, str]]
+) -> None:
+    """Store the output of compress_chart_renditions; the full chart last, so it never points at missing thumbs."""
+    for kind, (data, mime, _sha) in sorted(renditions.items(), key=lambda kv: kv[0] == CHART_KIND):
+        store.save(trade_id=trade_id, kind=kind, data=data, mime=mime)
+
+
+def _compress(spool_path: str) -> dict[str, tuple[bytes, str, str]]:
+    while True:
+        try:
+            return run_in_image_pool(compress_chart_renditions, spool_path)
+        except ExecutorSaturatedError:
+            time.sleep(SATURATED_RETRY_S)
+
+
+def process_chart_ingest_job(job_id: str, bind: Engine | Connection) -> None:
+    with Session(bind=bind, autoflush=False) as db:
+        job = db.get(ChartIngestJob, job_id)
+        if job is None or job.status != ChartIngestStatus.QUEUED.value:
+            return  # trade deleted (cascade) or already handled
+
+        job.status = ChartIngestStatus.PROCESSING.value
+        db.commit()
+
+        spool = Path(job.spool_path)
+        try:
+            renditions = _compress(str(spool))
+            save_chart_renditions(build_trade_image_store(db), trade_id=job.trade_id, renditions=renditions)
+            job.status, job.error = ChartIngestStatus.DONE.value, None
+        except (ImageTooLargeError, InvalidImageError) as e:
+            db.rollback()
+            job.status, job.error = ChartIngestStatus.FAILED.value, str(e) or "Invalid image"
+        except Exception:
+            logger.exception("Chart ingest job %s failed", job_id)
+            db.rollback()
+            if db.get(ChartIngestJob, job_id) is None:
+                return
+            job.status, job.error = ChartIngestStatus.FAILED.value, "Internal error"
+        finally:
+            spool.unlink(missing_ok=True)
+        db.commit()
+
+
+class ChartIngestWorker:
+    """Daemon threads draining an in-process queue of (job_id, bind); started on first submit."""
+
+    def __init__(self, threads: int):
+        self.threads = threads
+        self._queue: queue.Queue[tuple[str, Engine | Connection] | None] = queue.Queue()
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, bind: Engine | Connection) -> None:
+        self._ensure_started()
+        self._queue.put((job_id, bind))
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.threads):
+                t = threading.Thread(target=self._run, name=f"chart-ingest-{i}", daemon=True)
+                t.start()
+                self._workers.append(t)
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            try:
+                process_chart_ingest_job(*item)
+            except Exception:
+                logger.exception("Chart ingest worker error")
+
+    def stop(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for t in workers:
+            t.join()
+
+
+chart_ingest_worker = ChartIngestWorker(settings.CHART_INGEST_WORKERS)
+
+
+def resume_chart_ingest_jobs(db: Session) -> int:
+    """Startup: hand jobs left QUEUED/PROCESSING by a previous process back to the worker."""
+    ids = requeue_unfinished_chart_ingest_jobs(db)
+    for job_id in ids:
+        chart_ingest_worker.submit(job_id, db.get_bind())
+    return len(ids)
@@ -0,0 +1,85 @@
+# app/services/export.py
+
+from __future__ import annotations
+
+import csv
+import json
+import zipfile
+from datetime import datetime
+from io import RawIOBase, StringIO
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import Row
+
+
+def _json_default(v: object) -> str:
+    if isinstance(v, datetime):
+        return v.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(v).__name__}")
+
+
+def iter_csv(columns: Sequence[str], batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """One header chunk, then one text chunk per DB batch."""
+    buf = StringIO()
+    writer = csv.writer(buf)
+
+    writer.writerow(columns)
+    yield buf.getvalue()
+
+    for batch in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(
+            [v.isoformat() if isinstance(v, datetime) else v for v in row]
+            for row in batch
+        )
+        yield buf.getvalue()
+
+
+def iter_ndjson(columns: Sequence[str], batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """One JSON object per line, one text chunk per DB batch."""
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n"
+            for row in batch
+        )
+
+
+class _ZipSink(RawIOBase):
+    """Write-only, unseekable buffer; zipfile then emits data descriptors instead of seeking back."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def iter_zip(entries: Iterable[tuple[str, int, Iterable[bytes]]]) -> Iterator[bytes]:
+    """
+    Stream a ZIP of (name, byte_size, chunks) entries without buffering whole files.
+    Entries are stored, not deflated: chart images are already compressed.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        for name, byte_size, chunks in entries:
+            info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+            info.file_size = byte_size
+            with zf.open(info, mode="w") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():  # central directory
+        yield data
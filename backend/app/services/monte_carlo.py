@@ -0,0 +1,167 @@
+# app/services/monte_carlo.py
+
+# Bootstrap Monte Carlo over a user's historical R multiples, compounding at a fixed
+# risk %: equity_t = equity_{t-1} * (1 + risk_pct/100 * R_t), starting at 1.0.
+# Paths are simulated in fixed-size chunks (independent of the worker count, so a seed
+# reproduces the same result everywhere) and chunks fan out to the CPU process pool.
+
+from __future__ import annotations
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.executors import get_cpu_pool
+from app.models.trade import Trade
+from app.schemas.analytics import (
+    EquityBands, MaxDrawdownDistribution, MonteCarloOut, MonteCarloRequest
+)
+from app.schemas.trade import TradeStatus
+
+BAND_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+MAX_BAND_POINTS = 101
+DRAWDOWN_EDGES = np.linspace(0.0, 1.0, 21)
+
+# Paths x trades per chunk: ~16 MB per float64 working array in the worker
+CHUNK_CELLS = 2_000_000
+
+
+class MonteCarloError(ValueError):
+    pass
+
+
+def load_r_sample(
+    db: Session, *, user_id: str, symbol: str | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """(realized_r_multiple, risk_pct) of CLOSED trades that have an R; risk_pct may be NaN."""
+    stmt = select(Trade.realized_r_multiple, Trade.risk_pct).where(
+        Trade.user_id == user_id,
+        Trade.status == TradeStatus.CLOSED.value,
+        Trade.realized_r_multiple.is_not(None),
+    )
+    if symbol is not None:
+        stmt = stmt.where(Trade.symbol == symbol)
+
+    rows = db.execute(stmt).all()
+    if not rows:
+        return np.empty(0), np.empty(0)
+    r, risk_pct = zip(*rows)
+    return np.array(r, dtype=np.float64), np.array(risk_pct, dtype=np.float64)
+
+
+def _simulate_chunk(
+    r: np.ndarray,
+    risk_frac: float,
+    n_paths: int,
+    n_trades: int,
+    band_idx: np.ndarray,
+    ruin_level: float,
+    seed: np.random.SeedSequence,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Runs in a pool worker. Returns (equity at band_idx trades as float32 [k, paths],
+    max drawdown per path as float32, number of ruined paths).
+    """
+    rng = np.random.default_rng(seed)
+
+    # A loss beyond -100% of the risked amount cannot take equity below zero
+    growth = np.maximum(1.0 + risk_frac * r, 0.0)
+    equity = growth[rng.integers(0, r.size, size=(n_paths, n_trades), dtype=np.int32)]
+    np.cumprod(equity, axis=1, out=equity)
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)  # the starting balance is the first peak
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = 1.0 - equity / peak
+    max_dd = np.nan_to_num(drawdown.max(axis=1), nan=1.0)
+
+    ruined = int(np.count_nonzero(equity.min(axis=1) <= ruin_level))
+    # Transposed so the parent's per-step percentiles scan contiguous rows
+    bands = np.ascontiguousarray(equity[:, band_idx].T, dtype=np.float32)
+    return bands, max_dd.astype(np.float32), ruined
+
+
+def _band_steps(n_trades: int) -> np.ndarray:
+    return np.unique(np.linspace(0, n_trades, min(n_trades + 1, MAX_BAND_POINTS)).round().astype(int))
+
+
+def _chunks(paths: int, trades: int) -> list[int]:
+    size = max(1, CHUNK_CELLS // trades)
+    full, rest = divmod(paths, size)
+    return [size] * full + ([rest] if rest else [])
+
+
+def simulate(
+    r: np.ndarray,
+    *,
+    risk_pct: float,
+    paths: int,
+    trades: int,
+    ruin_drawdown_pct: float,
+    seed: int | None = None,
+) -> MonteCarloOut:
+    if r.size == 0:
+        raise MonteCarloError("No closed trades with a realized R multiple to resample.")
+
+    steps = _band_steps(trades)
+    band_idx = steps[1:] - 1  # step 0 is the starting balance, not simulated
+    ruin_level = 1.0 - ruin_drawdown_pct / 100.0
+
+    sizes = _chunks(paths, trades)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (r, risk_pct / 100.0, n, trades, band_idx, ruin_level, s)
+        for n, s in zip(sizes, seeds)
+    ]
+    if len(args) == 1:
+        results = [_simulate_chunk(*args[0])]  # not worth a round-trip to the pool
+    else:
+        results = list(get_cpu_pool().map(_simulate_chunk, *zip(*args)))
+
+    bands = np.concatenate([b for b, _, _ in results], axis=1)
+    max_dd = np.concatenate([d for _, d, _ in results])
+    ruined = sum(n for _, _, n in results)
+
+    equity = np.percentile(bands, BAND_PERCENTILES, axis=1)
+    equity = np.concatenate([np.ones((len(BAND_PERCENTILES), 1)), equity], axis=1)
+    counts, _ = np.histogram(np.clip(max_dd, 0.0, 1.0), bins=DRAWDOWN_EDGES)
+
+    return MonteCarloOut(
+        paths=paths,
+        trades=trades,
+        risk_pct=risk_pct,
+        sample_size=int(r.size),
+        risk_of_ruin=ruined / paths,
+        equity_bands=EquityBands(
+            percentiles=list(BAND_PERCENTILES),
+            step=steps.tolist(),
+            equity=equity.tolist(),
+        ),
+        max_drawdown=MaxDrawdownDistribution(
+            percentiles=list(BAND_PERCENTILES),
+            values=np.percentile(max_dd, BAND_PERCENTILES).tolist(),
+            mean=float(max_dd.mean()),
+            edges=DRAWDOWN_EDGES.tolist(),
+            counts=counts.tolist(),
+        ),
+    )
+
+
+def monte_carlo_for_user(db: Session, *, user_id: str, req: MonteCarloRequest) -> MonteCarloOut:
+    r, trade_risk_pct = load_r_sample(db, user_id=user_id, symbol=req.symbol)
+
+    risk_pct = req.risk_pct
+    if risk_pct is None:
+        known = trade_risk_pct[~np.isnan(trade_risk_pct)]
+        if known.size == 0:
+            raise MonteCarloError("risk_pct is required: no risk % recorded on the sampled trades.")
+        risk_pct = float(np.median(known))
+
+    return simulate(
+        r,
+        risk_pct=risk_pct,
+        paths=req.paths,
+        trades=req.trades,
+        ruin_drawdown_pct=req.ruin_drawdown_pct,
+        seed=req.seed,
+    )
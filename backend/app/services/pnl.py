@@ -1,2 +1,171 @@
 # app/services/pnl.py
 
+# Realized PnL from an exit price, using the planner snapshot stored on the trade:
+#   CHF per 1.0 price move per lot = stop_value_1lot_chf / |entry_price - sl_price|
+#   realized_pnl_chf    = signed move * that * lots
+#   realized_r_multiple = realized_pnl_chf / risk_chf
+# realized_pnls() is the NumPy batch path; derive_realized_pnl() runs it on one trade.
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.crud.trade_stats import rebuild_trade_stats
+from app.models.trade import Trade
+from app.schemas.trade import TradeStatus
+
+
+def realized_pnls(
+    *,
+    direction: ArrayLike,
+    entry_price: ArrayLike,
+    exit_price: ArrayLike,
+    sl_price: ArrayLike,
+    lots: ArrayLike,
+    stop_value_1lot_chf: ArrayLike,
+    risk_chf: ArrayLike,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized (realized_pnl_chf, realized_r_multiple). Arguments broadcast against
+    each other; rows that cannot be priced (missing stop value, stop at entry) are NaN,
+    and R is NaN where risk_chf is not > 0.
+    """
+    sign = np.where(np.asarray(direction, dtype=str) == "LONG", 1.0, -1.0)
+    entry = np.asarray(entry_price, dtype=np.float64)
+    exit_ = np.asarray(exit_price, dtype=np.float64)
+    sl = np.asarray(sl_price, dtype=np.float64)
+    lots_a = np.asarray(lots, dtype=np.float64)
+    stop_value = np.asarray(stop_value_1lot_chf, dtype=np.float64)
+    risk = np.asarray(risk_chf, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_distance = np.abs(entry - sl)
+        chf_per_price = np.where(risk_distance > 0, stop_value / risk_distance, np.nan)
+        pnl = sign * (exit_ - entry) * chf_per_price * lots_a
+        r = np.where(risk > 0, pnl / risk, np.nan)
+    return pnl, r
+
+
+def _optional(x: np.ndarray) -> float | None:
+    v = float(x)
+    return None if np.isnan(v) else v
+
+
+def derive_realized_pnl(trade: Trade) -> bool:
+    """
+    Set realized_pnl_chf / realized_r_multiple from trade.exit_price.
+    Only CLOSED trades with an exit price are touched; returns whether anything was set.
+    """
+    if trade.status != TradeStatus.CLOSED.value or trade.exit_price is None:
+        return False
+    pnl, r = realized_pnls(
+        direction=trade.direction,
+        entry_price=trade.entry_price,
+        exit_price=trade.exit_price,
+        sl_price=trade.sl_price,
+        lots=trade.lots,
+        stop_value_1lot_chf=np.nan if trade.stop_value_1lot_chf is None else trade.stop_value_1lot_chf,
+        risk_chf=trade.risk_chf,
+    )
+    trade.realized_pnl_chf = _optional(pnl)
+    trade.realized_r_multiple = _optional(r)
+    return True
+
+
+def _rate_scale(symbol: np.ndarray, old_rate: np.ndarray, new_rate: float) -> np.ndarray:
+    # CHF-quoted pairs do not go through USD->CHF (see sizing.fx_value_per_pip_per_lot_chf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(old_rate > 0, new_rate / old_rate, np.nan)
+    return np.where(np.char.endswith(symbol, "CHF"), 1.0, scale)
+
+
+def recompute_realized_pnl(
+    db: Session,
+    *,
+    user_id: str,
+    symbol: str | None = None,
+    usdchf_rate: float | None = None,
+) -> int:
+    """
+    Bulk recompute for a user's CLOSED trades that have an exit price: one column-only
+    SELECT, one vectorized pass, one executemany UPDATE, then a rollup rebuild. Commits.
+
+    With usdchf_rate, the stored rate is corrected first and every CHF value derived from
+    it (value per unit, stop value, reward) is rescaled before PnL is recomputed.
+    Returns the number of trades updated; rows that cannot be priced are left as they are.
+    """
+    stmt = select(
+        Trade.id,
+        Trade.symbol,
+        Trade.direction,
+        Trade.entry_price,
+        Trade.exit_price,
+        Trade.sl_price,
+        Trade.lots,
+        Trade.risk_chf,
+        Trade.reward_chf,
+        Trade.usdchf_rate,
+        Trade.value_per_unit_1lot_chf,
+        Trade.stop_value_1lot_chf,
+    ).where(
+        Trade.user_id == user_id,
+        Trade.status == TradeStatus.CLOSED.value,
+        Trade.exit_price.is_not(None),
+    )
+    if symbol:
+        stmt = stmt.where(Trade.symbol == symbol)
+
+    rows = db.execute(stmt).all()
+    if not rows:
+        return 0
+
+    (
+        ids, symbols, directions, entry, exit_, sl, lots, risk,
+        reward, old_rate, value_per_unit, stop_value,
+    ) = zip(*rows)
+
+    def col(values: tuple) -> np.ndarray:
+        return np.array(values, dtype=np.float64)  # None -> NaN
+
+    stop_value_a = col(stop_value)
+    extra: dict[str, np.ndarray] = {}
+    if usdchf_rate is not None:
+        scale = _rate_scale(np.array(symbols, dtype=str), col(old_rate), usdchf_rate)
+        stop_value_a = stop_value_a * scale
+        extra = {
+            "usdchf_rate": np.full(len(rows), usdchf_rate),
+            "value_per_unit_1lot_chf": col(value_per_unit) * scale,
+            "stop_value_1lot_chf": stop_value_a,
+            "reward_chf": col(reward) * scale,
+        }
+
+    pnl, r = realized_pnls(
+        direction=np.array(directions, dtype=str),
+        entry_price=col(entry),
+        exit_price=col(exit_),
+        sl_price=col(sl),
+        lots=col(lots),
+        stop_value_1lot_chf=stop_value_a,
+        risk_chf=col(risk),
+    )
+
+    idx = np.flatnonzero(~np.isnan(pnl))
+    if idx.size == 0:
+        return 0
+
+    params = [
+        {
+            "id": ids[i],
+            "realized_pnl_chf": float(pnl[i]),
+            "realized_r_multiple": _optional(r[i]),
+            **{k: _optional(v[i]) for k, v in extra.items()},
+        }
+        for i in idx
+    ]
+    # ORM bulk UPDATE by primary key -> a single executemany
+    db.execute(update(Trade), params)
+    rebuild_trade_stats(db, user_ids=[user_id])  # commits
+    return len(params)
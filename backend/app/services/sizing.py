@@ -0,0 +1,256 @@
+# app/services/sizing.py
+
+# Server-side port of the frontend planner math (lib/calc/*, lib/tradePlanner).
+# compute_position_sizes() is the NumPy batch path; compute_position_size() validates
+# like validate.ts and then runs the batch path on one row, so both share the arithmetic.
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.schemas.trade import OutputsPolicy, TradeInputs, TradeOutputs
+
+FX_CONTRACT_SIZE = 100_000
+GOLD_SYMBOL = "XAUUSD"
+
+# Planner (lib/tradePlanner) converts gold ticks to price with a fixed 0.01 step
+GOLD_PLANNER_PRICE_STEP = 0.01
+
+MAX_RISK_PCT = 5.0
+
+
+class SizingError(ValueError):
+    pass
+
+
+def pip_size(symbol: str) -> float:
+    return 0.01 if symbol.endswith("JPY") else 0.0001
+
+
+def fx_value_per_pip_per_lot_chf(symbol: str, usdchf_rate: float) -> float:
+    ps = pip_size(symbol)
+    if symbol.endswith("CHF"):
+        return FX_CONTRACT_SIZE * ps
+    # MVP approximation for EURUSD / USDJPY
+    return FX_CONTRACT_SIZE * ps * usdchf_rate
+
+
+def gold_value_per_tick_per_lot_chf(contract_size: float, tick_size: float, usdchf_rate: float) -> float:
+    if not contract_size > 0:
+        raise SizingError("Gold contract size must be > 0.")
+    if not tick_size > 0:
+        raise SizingError("Gold tick size must be > 0.")
+    return contract_size * tick_size * usdchf_rate
+
+
+def _js_round(x: np.ndarray) -> np.ndarray:
+    # Math.round semantics (half up), not numpy's banker's rounding
+    return np.floor(x + 0.5)
+
+
+def compute_position_sizes(
+    *,
+    symbol: ArrayLike,
+    direction: ArrayLike,
+    entry_price: ArrayLike,
+    stop_distance: ArrayLike,
+    balance_chf: ArrayLike,
+    risk_pct: ArrayLike,
+    tp_r_multiple: ArrayLike,
+    lot_step: ArrayLike,
+    usdchf_rate: ArrayLike,
+    tick_size: ArrayLike = GOLD_PLANNER_PRICE_STEP,
+    contract_size: ArrayLike = 100.0,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized sizing. All arguments broadcast against each other (scalars, 1-D rows
+    or a meshgrid all work). Returns arrays keyed by TradeOutputs field names plus
+    "valid"; rows that fail validation or round down to 0 lots are NaN with valid=False.
+    """
+    # Symbol/direction masks are derived before broadcasting so string ops run once
+    # per distinct input, not once per grid point.
+    symbol_a = np.asarray(symbol, dtype=str)
+    is_long = np.asarray(direction, dtype=str) == "LONG"
+    is_gold = symbol_a == GOLD_SYMBOL
+    fx_pip = np.where(np.char.endswith(symbol_a, "JPY"), 0.01, 0.0001)
+    quoted_in_chf = np.char.endswith(symbol_a, "CHF")
+
+    (
+        is_long, is_gold, fx_pip, quoted_in_chf,
+        entry, stop, balance, risk, rr, step, usdchf, tick, contract,
+    ) = np.broadcast_arrays(
+        is_long, is_gold, fx_pip, quoted_in_chf,
+        *(
+            np.asarray(v, dtype=np.float64)
+            for v in (
+                entry_price, stop_distance, balance_chf, risk_pct, tp_r_multiple,
+                lot_step, usdchf_rate, tick_size, contract_size,
+            )
+        ),
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_money = balance * (risk / 100.0)
+
+        value_per_unit = np.where(
+            is_gold,
+            contract * tick * usdchf,
+            np.where(quoted_in_chf, FX_CONTRACT_SIZE * fx_pip, FX_CONTRACT_SIZE * fx_pip * usdchf),
+        )
+        stop_value = stop * value_per_unit
+
+        inv = 1.0 / step
+        lots = np.floor((risk_money / stop_value) * inv) / inv
+
+        exposure = _js_round(lots * np.where(is_gold, contract, FX_CONTRACT_SIZE))
+
+        price_step = np.where(is_gold, GOLD_PLANNER_PRICE_STEP, fx_pip)
+        risk_distance = stop * price_step
+        reward_distance = risk_distance * rr
+
+        sl = np.where(is_long, entry - risk_distance, entry + risk_distance)
+        tp = np.where(is_long, entry + reward_distance, entry - reward_distance)
+
+        # Reward in CHF reuses value-per-unit (ticks use the actual tick size for gold)
+        unit_size = np.where(is_gold, tick, fx_pip)
+        reward_chf = (reward_distance / unit_size) * value_per_unit * lots
+
+    valid = (
+        (balance > 0)
+        & (risk > 0) & (risk <= MAX_RISK_PCT)
+        & (stop > 0)
+        & (step > 0)
+        & (usdchf > 0)
+        & (entry > 0)
+        & (rr > 0)
+        & (~is_gold | ((contract > 0) & (tick > 0)))
+        & (lots > 0)
+    )
+
+    out = {
+        "sl_price": sl,
+        "tp_price": tp,
+        "risk_distance_price": risk_distance,
+        "reward_distance_price": reward_distance,
+        "lots": lots,
+        "risk_chf": risk_money,
+        "reward_chf": reward_chf,
+        "reward_to_risk": rr,
+        "value_per_unit_1lot_chf": value_per_unit,
+        "stop_value_1lot_chf": stop_value,
+        "exposure_units": exposure,
+    }
+    out = {k: np.where(valid, np.asarray(v, dtype=np.float64), np.nan) for k, v in out.items()}
+    out["valid"] = valid
+    return out
+
+
+def _require(value: float | None, name: str) -> float:
+    if value is None:
+        raise SizingError(f"{name} is required for server-side sizing.")
+    return value
+
+
+def compute_position_size(inputs: TradeInputs) -> TradeOutputs:
+    """Size a single planned trade. Raises SizingError with the same messages as the UI."""
+    balance = _require(inputs.balance_chf, "balance_chf")
+    risk_pct = _require(inputs.risk_pct, "risk_pct")
+    tp_r_multiple = _require(inputs.tp_r_multiple, "tp_r_multiple")
+    lot_step = _require(inputs.lot_step, "lot_step")
+    usdchf_rate = _require(inputs.usdchf_rate, "usdchf_rate")
+
+    if not balance > 0:
+        raise SizingError("Balance must be > 0.")
+    if not (0 < risk_pct <= MAX_RISK_PCT):
+        raise SizingError("Risk % must be between 0 and 5.")
+    if not inputs.stop_distance > 0:
+        raise SizingError("Stop distance must be > 0.")
+    if not lot_step > 0:
+        raise SizingError("Lot step must be > 0.")
+    if not usdchf_rate > 0:
+        raise SizingError("USD→CHF rate must be > 0.")
+    if not inputs.entry_price > 0:
+        raise SizingError("Entry price must be > 0.")
+    if not tp_r_multiple > 0:
+        raise SizingError("R multiple must be > 0.")
+
+    tick_size = GOLD_PLANNER_PRICE_STEP
+    contract_size = 100.0
+    if inputs.symbol == GOLD_SYMBOL:
+        tick_size = _require(inputs.tick_size, "tick_size")
+        contract_size = _require(inputs.contract_size, "contract_size")
+        gold_value_per_tick_per_lot_chf(contract_size, tick_size, usdchf_rate)  # validates
+
+    r = compute_position_sizes(
+        symbol=inputs.symbol,
+        direction=inputs.direction.value,
+        entry_price=inputs.entry_price,
+        stop_distance=inputs.stop_distance,
+        balance_chf=balance,
+        risk_pct=risk_pct,
+        tp_r_multiple=tp_r_multiple,
+        lot_step=lot_step,
+        usdchf_rate=usdchf_rate,
+        tick_size=tick_size,
+        contract_size=contract_size,
+    )
+    if not bool(r["valid"]):
+        raise SizingError("Lot size rounded down to 0.")
+
+    return TradeOutputs(**{k: float(v) for k, v in r.items() if k != "valid"})
+
+
+def resolve_outputs(inputs: TradeInputs, outputs: TradeOutputs, policy: OutputsPolicy) -> TradeOutputs:
+    """
+    Apply an OutputsPolicy to client-posted outputs.
+    VERIFY compares every field the client sent (non-null) against the server values.
+    """
+    if policy == OutputsPolicy.CLIENT:
+        return outputs
+
+    server = compute_position_size(inputs)
+    if policy == OutputsPolicy.RECOMPUTE:
+        return server
+
+    mismatched = [
+        name
+        for name, posted in outputs.model_dump().items()
+        if posted is not None
+        and not math.isclose(posted, getattr(server, name), rel_tol=1e-6, abs_tol=1e-9)
+    ]
+    if mismatched:
+        raise SizingError(f"Outputs do not match server sizing: {', '.join(mismatched)}")
+    return outputs
+
+
+def size_grid(
+    *,
+    symbol: str,
+    direction: str,
+    entry_price: float,
+    balance_chf: float,
+    lot_step: float,
+    usdchf_rate: float,
+    risk_pct: np.ndarray,
+    stop_distance: np.ndarray,
+    tp_r_multiple: np.ndarray,
+    tick_size: float | None = None,
+    contract_size: float | None = None,
+) -> dict[str, np.ndarray]:
+    """Scenario grid over risk % x stop distance x TP R-multiple; arrays have shape (nr, ns, nt)."""
+    return compute_position_sizes(
+        symbol=symbol,
+        direction=direction,
+        entry_price=entry_price,
+        stop_distance=np.asarray(stop_distance, dtype=np.float64)[None, :, None],
+        balance_chf=balance_chf,
+        risk_pct=np.asarray(risk_pct, dtype=np.float64)[:, None, None],
+        tp_r_multiple=np.asarray(tp_r_multiple, dtype=np.float64)[None, None, :],
+        lot_step=lot_step,
+        usdchf_rate=usdchf_rate,
+        tick_size=GOLD_PLANNER_PRICE_STEP if tick_size is None else tick_size,
+        contract_size=100.0 if contract_size is None else contract_size,
+    )
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Protocol
+from pathlib import Path
+from typing import Iterator, Protocol, runtime_checkable
 
 from pydantic import BaseModel, ConfigDict
 
@@ -30,8 +31,38 @@ class TradeImageStore(Protocol):
     def save(self, *, trade_id: str, kind: str, data: bytes, mime: str) -> StoredImage:
         ...
 
+    def head(self, *, trade_id: str, kind: str) -> StoredImage | None:
+        """Metadata only; must not read the image bytes."""
+        ...
+
     def get(self, *, trade_id: str, kind: str) -> StoredImageData | None:
         ...
 
+    def iter_bytes(self, image: StoredImage, *, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        """
+        Bytes [start, end) of a stored image (from head()), in chunks, so memory per
+        download is bounded by the store's chunk size rather than the image size.
+        """
+        ...
+
     def delete(self, *, trade_id: str, kind: str) -> None:
+        """Drops the row; the blob goes too once nothing else references it."""
+        ...
+
+    def collect_garbage(self) -> int:
+        """Remove blobs whose refcount dropped to 0 outside save/delete (e.g. account deletion)."""
+        ...
+
+
+@runtime_checkable
+class FileBackedImageStore(Protocol):
+    """Optional capability: images live in local files the API can hand to FileResponse (sendfile)."""
+    def open_path(self, *, trade_id: str, kind: str) -> tuple[StoredImage, Path] | None:
+        ...
+
+
+@runtime_checkable
+class PresignedUrlImageStore(Protocol):
+    """Optional capability: a short-lived URL the client can fetch the image from directly."""
+    def presigned_url(self, *, trade_id: str, kind: str, expires_in: int) -> tuple[StoredImage, str] | None:
         ...
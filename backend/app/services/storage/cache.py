@@ -0,0 +1,140 @@
+# app/services/storage/cache.py
+
+# In-process LRU for chart bytes, in front of any TradeImageStore. Entries are
+# keyed by (trade_id, kind, sha256) and looked up after store.head(), so a
+# replaced image is a different key: another process's write can never make
+# this one serve stale bytes, and invalidation on save/delete only frees memory.
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Iterator
+
+from app.core.config import settings
+from app.services.storage.base import StoredImage, StoredImageData, TradeImageStore
+
+CacheKey = tuple[str, str, str]  # (trade_id, kind, sha256)
+
+
+class ImageByteCache:
+    """Thread-safe LRU bounded by the total size of the cached images, not their count."""
+
+    def __init__(self, *, max_bytes: int, max_item_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        # One huge chart shouldn't flush every thumbnail
+        self.max_item_bytes = max_item_bytes if max_item_bytes is not None else max_bytes // 8
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: CacheKey, data: bytes) -> None:
+        if len(data) > self.max_item_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._entries[key] = data
+            self.bytes += len(data)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, trade_id: str, kind: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == trade_id and k[1] == kind]:
+                self.bytes -= len(self._entries.pop(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachingTradeImageStore(TradeImageStore):
+    """Wraps a store; metadata still comes from the inner store, bytes from the cache when possible."""
+
+    def __init__(self, inner: TradeImageStore, cache: ImageByteCache):
+        self.inner = inner
+        self.cache = cache
+
+    @staticmethod
+    def _key(image: StoredImage) -> CacheKey:
+        return image.trade_id, image.kind, image.sha256
+
+    def save(self, *, trade_id: str, kind: str, data: bytes, mime: str) -> StoredImage:
+        meta = self.inner.save(trade_id=trade_id, kind=kind, data=data, mime=mime)
+        self.cache.invalidate(trade_id, kind)
+        return meta
+
+    def head(self, *, trade_id: str, kind: str) -> StoredImage | None:
+        return self.inner.head(trade_id=trade_id, kind=kind)
+
+    def get(self, *, trade_id: str, kind: str) -> StoredImageData | None:
+        meta = self.inner.head(trade_id=trade_id, kind=kind)
+        if meta is None:
+            return None
+        data = self.cache.get(self._key(meta))
+        if data is not None:
+            return StoredImageData(**meta.model_dump(), data=data)
+
+        img = self.inner.get(trade_id=trade_id, kind=kind)
+        if img is not None:
+            self.cache.put(self._key(img), img.data)
+        return img
+
+    def iter_bytes(self, image: StoredImage, *, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        end = image.byte_size if end is None else min(end, image.byte_size)
+        key = self._key(image)
+        data = self.cache.get(key)
+        if data is not None:
+            return iter((data[start:end],)) if start < end else iter(())
+
+        if image.byte_size > self.cache.max_item_bytes:
+            return self.inner.iter_bytes(image, start=start, end=end)
+
+        # Small enough to keep: read it whole once, then serve the requested slice
+        data = b"".join(self.inner.iter_bytes(image))
+        if len(data) == image.byte_size:
+            self.cache.put(key, data)
+        return iter((data[start:end],)) if start < end else iter(())
+
+    def delete(self, *, trade_id: str, kind: str) -> None:
+        self.inner.delete(trade_id=trade_id, kind=kind)
+        self.cache.invalidate(trade_id, kind)
+
+    def collect_garbage(self) -> int:
+        # Bytes of collected blobs are unreachable (no row has their sha) and age out
+        return self.inner.collect_garbage()
+
+
+chart_image_cache = ImageByteCache(
+    max_bytes=settings.TRADE_IMAGE_CACHE_BYTES,
+    max_item_bytes=settings.TRADE_IMAGE_CACHE_MAX_ITEM_BYTES,
+)
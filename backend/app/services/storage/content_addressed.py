@@ -0,0 +1,163 @@
+# app/services/storage/content_addressed.py
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.blob import acquire_blob, blob_has_data, read_blob_data, release_blob, take_garbage
+from app.models.blob import Blob
+from app.models.trade_image import TradeImage
+from app.services.storage.base import StoredImage, StoredImageData, TradeImageStore
+from app.services.storage.db_store import DbTradeImageStore
+from app.services.storage.image_processing import sha256_hex
+
+
+def stored_image(row: TradeImage) -> StoredImage:
+    return StoredImage(
+        trade_id=row.trade_id,
+        kind=row.kind,
+        mime=row.mime,
+        sha256=row.sha256,
+        byte_size=row.byte_size,
+    )
+
+
+class ContentAddressedImageStore(TradeImageStore, ABC):
+    """
+    Shared logic for stores that keep bytes outside the DB, addressed by sha256:
+    the blobs row (data = NULL) carries the refcount, identical images share one
+    object, and it is removed once no trade_images row references it. Images written
+    by DbTradeImageStore (blobs.data set) are still readable.
+
+    Subclasses implement the blob primitives.
+    """
+
+    def __init__(self, db: Session, *, chunk_size: int = 64 * 1024):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    # --- blob primitives -------------------------------------------------
+    @abstractmethod
+    def _blob_exists(self, sha256: str) -> bool:
+        ...
+
+    @abstractmethod
+    def _put_blob(self, sha256: str, data: bytes, mime: str) -> None:
+        ...
+
+    @abstractmethod
+    def _read_blob(self, sha256: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    def _delete_blob(self, sha256: str) -> None:
+        ...
+
+    @abstractmethod
+    def _iter_blob(self, sha256: str, start: int, end: int) -> Iterator[bytes] | None:
+        """Chunks of bytes [start, end); None if the blob is not in this store."""
+
+    # --- metadata ----------------------------------------------------------
+    def _row(self, trade_id: str, kind: str) -> TradeImage | None:
+        return self.db.scalars(
+            select(TradeImage).where(TradeImage.trade_id == trade_id, TradeImage.kind == kind)
+        ).first()
+
+    def _is_db_resident(self, row: TradeImage) -> bool:
+        return blob_has_data(self.db, row.sha256)
+
+    def _release_blob(self, sha: str) -> list[str]:
+        """Drop one reference; returns the hashes collected (delete their bytes after commit)."""
+        # Other rows (any trade) may still point at the same content
+        release_blob(self.db, sha)
+        return take_garbage(self.db, [sha])
+
+    def _delete_collected(self, shas: list[str]) -> None:
+        # Only after the commit: a failed commit must not leave rows pointing at
+        # deleted objects. A save that re-created the row meanwhile keeps its bytes.
+        if not shas:
+            return
+        revived = set(self.db.scalars(select(Blob.sha256).where(Blob.sha256.in_(shas))))
+        for sha in shas:
+            if sha not in revived:
+                self._delete_blob(sha)
+
+    # --- TradeImageStore ---------------------------------------------------
+    def save(self, *, trade_id: str, kind: str, data: bytes, mime: str) -> StoredImage:
+        sha = sha256_hex(data)
+        row = self._row(trade_id, kind)
+
+        # If identical image already stored, be idempotent (re-putting a lost object;
+        # the row's own reference keeps the blob from being collected meanwhile)
+        if row and row.sha256 == sha:
+            if not self._blob_exists(sha):
+                self._put_blob(sha, data, mime)
+            return stored_image(row)
+
+        # Reference first, then bytes: once our +1 is in, a concurrent delete of the
+        # same content elsewhere can't collect the blob between the check and the put
+        acquire_blob(self.db, sha256=sha, byte_size=len(data))
+        self.db.flush()
+        if not self._blob_exists(sha):  # dedupe: same content already stored
+            self._put_blob(sha, data, mime)
+
+        old_sha = row.sha256 if row else None
+        if row is None:
+            row = TradeImage(trade_id=trade_id, kind=kind)
+        row.mime = mime
+        row.sha256 = sha
+        row.byte_size = len(data)
+        self.db.add(row)
+        self.db.flush()
+
+        collected = self._release_blob(old_sha) if old_sha else []
+        self.db.commit()
+        self._delete_collected(collected)
+        self.db.refresh(row)
+        return stored_image(row)
+
+    def head(self, *, trade_id: str, kind: str) -> StoredImage | None:
+        row = self._row(trade_id, kind)
+        return stored_image(row) if row else None
+
+    def get(self, *, trade_id: str, kind: str) -> StoredImageData | None:
+        row = self._row(trade_id, kind)
+        if not row:
+            return None
+        data = self._read_blob(row.sha256)
+        if data is None:
+            data = read_blob_data(self.db, row.sha256)  # bytes kept by DbTradeImageStore
+            if data is None:
+                return None
+        return StoredImageData(**stored_image(row).model_dump(), data=data)
+
+    def iter_bytes(self, image: StoredImage, *, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        end = image.byte_size if end is None else min(end, image.byte_size)
+        if start >= end:
+            return iter(())
+        chunks = self._iter_blob(image.sha256, start, end)
+        if chunks is not None:
+            return chunks
+        # Bytes kept by DbTradeImageStore: chunked reads from blobs.data
+        return DbTradeImageStore(self.db, chunk_size=self.chunk_size).iter_bytes(image, start=start, end=end)
+
+    def delete(self, *, trade_id: str, kind: str) -> None:
+        row = self._row(trade_id, kind)
+        if not row:
+            return
+        sha = row.sha256
+        self.db.delete(row)
+        self.db.flush()
+        collected = self._release_blob(sha)
+        self.db.commit()
+        self._delete_collected(collected)
+
+    def collect_garbage(self) -> int:
+        removed = take_garbage(self.db)
+        self.db.commit()
+        self._delete_collected(removed)
+        return len(removed)
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+import sqlite3
+from typing import Iterator
+
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.orm import Session
 
+from app.crud.blob import (
+    acquire_blob, blob_has_data, release_blob, take_garbage, write_blob_data
+)
+from app.models.blob import Blob
 from app.models.trade_image import TradeImage
 from app.services.storage.base import StoredImage, StoredImageData, TradeImageStore
 from app.services.storage.image_processing import sha256_hex
 
 
 class DbTradeImageStore(TradeImageStore):
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, *, chunk_size: int = 64 * 1024):
         self.db = db
+        self.chunk_size = chunk_size
 
     def save(self, *, trade_id: str, kind: str, data: bytes, mime: str) -> StoredImage:
         sha = sha256_hex(data)
@@ -31,31 +39,22 @@ class DbTradeImageStore(TradeImageStore):
                 byte_size=row.byte_size,
             )
 
-        if row:
-            row.data = data
-            row.mime = mime
-            row.sha256 = sha
-            row.byte_size = len(data)
-            self.db.add(row)
-            self.db.commit()
-            self.db.refresh(row)
-            return StoredImage(
-                trade_id=trade_id,
-                kind=kind,
-                mime=row.mime,
-                sha256=row.sha256,
-                byte_size=row.byte_size,
-            )
+        acquire_blob(self.db, sha256=sha, byte_size=len(data))
+        if not blob_has_data(self.db, sha):  # dedupe: bytes only written once per hash
+            write_blob_data(self.db, sha, data)
 
-        row = TradeImage(
-            trade_id=trade_id,
-            kind=kind,
-            mime=mime,
-            sha256=sha,
-            byte_size=len(data),
-            data=data,
-        )
+        old_sha = row.sha256 if row else None
+        if row is None:
+            row = TradeImage(trade_id=trade_id, kind=kind)
+        row.mime = mime
+        row.sha256 = sha
+        row.byte_size = len(data)
         self.db.add(row)
+        self.db.flush()
+
+        if old_sha:
+            release_blob(self.db, old_sha)
+            take_garbage(self.db, [old_sha])
         self.db.commit()
         self.db.refresh(row)
         return StoredImage(
@@ -66,19 +65,37 @@ class DbTradeImageStore(TradeImageStore):
             byte_size=row.byte_size,
         )
 
-    def get(self, *, trade_id: str, kind: str) -> StoredImageData | None:
+    def head(self, *, trade_id: str, kind: str) -> StoredImage | None:
+        # Bytes live in blobs, so this never reads them
         row = self.db.scalars(
             select(TradeImage).where(TradeImage.trade_id == trade_id, TradeImage.kind == kind)
         ).first()
         if not row:
             return None
+        return StoredImage(
+            trade_id=trade_id,
+            kind=kind,
+            mime=row.mime,
+            sha256=row.sha256,
+            byte_size=row.byte_size,
+        )
+
+    def get(self, *, trade_id: str, kind: str) -> StoredImageData | None:
+        found = self.db.execute(
+            select(TradeImage, Blob.data)
+            .join(Blob, Blob.sha256 == TradeImage.sha256)
+            .where(TradeImage.trade_id == trade_id, TradeImage.kind == kind)
+        ).first()
+        if not found or found.data is None:
+            return None
+        row, data = found
         return StoredImageData(
             trade_id=trade_id,
             kind=kind,
             mime=row.mime,
             sha256=row.sha256,
             byte_size=row.byte_size,
-            data=row.data,
+            data=data,
         )
 
     def delete(self, *, trade_id: str, kind: str) -> None:
@@ -87,5 +104,61 @@ class DbTradeImageStore(TradeImageStore):
         ).first()
         if not row:
             return
+        sha = row.sha256
         self.db.delete(row)
+        self.db.flush()
+        release_blob(self.db, sha)
+        take_garbage(self.db, [sha])
+        self.db.commit()
+
+    def collect_garbage(self) -> int:
+        removed = take_garbage(self.db)
         self.db.commit()
+        return len(removed)
+
+    def iter_bytes(self, image: StoredImage, *, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        """
+        Chunked reads of blobs.data. Blobs are immutable per sha, so a concurrent
+        re-upload can't splice two images together; a GC'd blob just ends the stream.
+
+        SQLite reads through incremental blob I/O, so only the requested pages are
+        touched. Elsewhere it is one substr() per chunk: bounded on Postgres, where
+        blobs.data is stored EXTERNAL (uncompressed TOAST, sliceable); on a DB that
+        detoasts whole values for substr, each chunk costs a full read of the blob.
+        """
+        end = image.byte_size if end is None else min(end, image.byte_size)
+        if start >= end:
+            return iter(())
+        dbapi_conn = self.db.connection().connection.dbapi_connection
+        if hasattr(dbapi_conn, "blobopen"):  # sqlite3, Python 3.11+
+            return self._iter_sqlite_blob(dbapi_conn, image.sha256, start, end)
+        return self._iter_substr(image.sha256, start, end)
+
+    def _iter_sqlite_blob(self, dbapi_conn, sha256: str, start: int, end: int) -> Iterator[bytes]:
+        rowid = self.db.scalar(select(literal_column("rowid")).select_from(Blob).where(Blob.sha256 == sha256))
+        pos = start
+        while rowid is not None and pos < end:
+            # Reopened per chunk: a handle expires when anything in the row changes
+            # (refcount updates), and an open one would pin a read snapshot meanwhile
+            try:
+                with dbapi_conn.blobopen("blobs", "data", rowid, readonly=True) as blob:
+                    blob.seek(pos)
+                    chunk = blob.read(min(self.chunk_size, end - pos))
+            except sqlite3.Error:  # row collected, or data is NULL
+                return
+            if not chunk:
+                return
+            yield chunk
+            pos += len(chunk)
+
+    def _iter_substr(self, sha256: str, start: int, end: int) -> Iterator[bytes]:
+        pos = start
+        while pos < end:
+            n = min(self.chunk_size, end - pos)
+            chunk = self.db.scalar(
+                select(func.substr(Blob.data, pos + 1, n)).where(Blob.sha256 == sha256)
+            )
+            if not chunk:
+                return
+            yield bytes(chunk)
+            pos += len(chunk)
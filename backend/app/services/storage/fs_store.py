@@ -0,0 +1,74 @@
+# app/services/storage/fs_store.py
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from app.services.storage.base import StoredImage
+from app.services.storage.content_addressed import ContentAddressedImageStore, stored_image
+
+
+class FsTradeImageStore(ContentAddressedImageStore):
+    """Blobs on local disk: <root>/<sha[:2]>/<sha[2:4]>/<sha>."""
+
+    def __init__(self, db: Session, root: str | Path, *, chunk_size: int = 64 * 1024):
+        super().__init__(db, chunk_size=chunk_size)
+        self.root = Path(root)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def _blob_exists(self, sha256: str) -> bool:
+        return self.blob_path(sha256).is_file()
+
+    def _put_blob(self, sha256: str, data: bytes, mime: str) -> None:
+        path = self.blob_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write + rename so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _read_blob(self, sha256: str) -> bytes | None:
+        path = self.blob_path(sha256)
+        return path.read_bytes() if path.is_file() else None
+
+    def _delete_blob(self, sha256: str) -> None:
+        self.blob_path(sha256).unlink(missing_ok=True)
+
+    def _iter_blob(self, sha256: str, start: int, end: int) -> Iterator[bytes] | None:
+        try:
+            f = open(self.blob_path(sha256), "rb")
+        except FileNotFoundError:
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with f:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0 and (chunk := f.read(min(self.chunk_size, remaining))):
+                    remaining -= len(chunk)
+                    yield chunk
+
+        return chunks()
+
+    def open_path(self, *, trade_id: str, kind: str) -> tuple[StoredImage, Path] | None:
+        """Metadata + on-disk path, for FileResponse; None if missing or DB-resident."""
+        row = self._row(trade_id, kind)
+        if not row:
+            return None
+        path = self.blob_path(row.sha256)
+        if not path.is_file():
+            return None
+        return stored_image(row), path
@@ -3,11 +3,37 @@
 from __future__ import annotations
 
 import hashlib
+import math
+import os
 from io import BytesIO
+from pathlib import Path
+from typing import Mapping
 
 from PIL import Image
 
 
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+
+# Decompression-bomb guard: a few KB of PNG can declare a gigapixel canvas
+MAX_IMAGE_PIXELS = 40_000_000  # e.g. 8000x5000
+
+# Above this, WebP method=6 costs ~2x method=4 for ~3% smaller output
+WEBP_SLOW_METHOD_MAX_PIXELS = 1_000_000
+
+CHART_KIND = "CHART"
+CHART_MEDIUM_KIND = "CHART_MEDIUM"
+CHART_THUMB_KIND = "CHART_THUMB"
+
+# Smaller copies stored next to the full chart (trade_images.kind -> longest side in px)
+CHART_RENDITIONS: dict[str, int] = {
+    CHART_MEDIUM_KIND: 800,
+    CHART_THUMB_KIND: 320,
+}
+
+# Every trade_images.kind one upload writes
+CHART_KINDS: tuple[str, ...] = (CHART_KIND, *CHART_RENDITIONS)
+
+
 class ImageTooLargeError(ValueError):
     pass
 
@@ -20,10 +46,15 @@ def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+# Raw upload: bytes, or the path of a spooled file (decoded straight from disk)
+ImageSource = bytes | str | Path
+
+
 def compress_chart_image(
-    raw: bytes,
+    source: ImageSource,
     *,
-    max_upload_bytes: int = 10 * 1024 * 1024,  # 10MB
+    max_upload_bytes: int = MAX_UPLOAD_BYTES,
+    max_pixels: int = MAX_IMAGE_PIXELS,
     max_dim: int = 1600,
     webp_quality: int = 80,
 ) -> tuple[bytes, str, str]:
@@ -31,14 +62,35 @@ def compress_chart_image(
     Returns (compressed_bytes, mime, sha256_hex).
     Output is always WebP for consistent storage and small size.
     """
-    if len(raw) > max_upload_bytes:
+    return compress_chart_renditions(
+        source,
+        renditions={},
+        max_upload_bytes=max_upload_bytes,
+        max_pixels=max_pixels,
+        max_dim=max_dim,
+        webp_quality=webp_quality,
+    )[CHART_KIND]
+
+
+def compress_chart_renditions(
+    source: ImageSource,
+    *,
+    renditions: Mapping[str, int] = CHART_RENDITIONS,
+    max_upload_bytes: int = MAX_UPLOAD_BYTES,
+    max_pixels: int = MAX_IMAGE_PIXELS,
+    max_dim: int = 1600,
+    webp_quality: int = 80,
+) -> dict[str, tuple[bytes, str, str]]:
+    """
+    Full chart under CHART_KIND plus one WebP per rendition kind, from a single decode:
+    each smaller rendition is downscaled from the previous one rather than the original.
+    Returns {kind: (compressed_bytes, mime, sha256_hex)}.
+    """
+    size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+    if size > max_upload_bytes:
         raise ImageTooLargeError(f"Upload too large (>{max_upload_bytes} bytes)")
 
-    try:
-        img = Image.open(BytesIO(raw))
-        img.load()
-    except Exception as e:
-        raise InvalidImageError("Invalid image") from e
+    img = _decode(source, max_pixels=max_pixels, max_dim=max_dim)
 
     # Normalize mode for WebP
     if img.mode not in ("RGB", "L"):
@@ -46,8 +98,44 @@ def compress_chart_image(
 
     img.thumbnail((max_dim, max_dim))
 
-    out = BytesIO()
-    img.save(out, format="WEBP", quality=webp_quality, method=6)
-    compressed = out.getvalue()
+    out = {CHART_KIND: _encode_webp(img, webp_quality)}
+    for kind, dim in sorted(renditions.items(), key=lambda kv: -kv[1]):
+        img.thumbnail((dim, dim))  # in place; the larger one is already encoded
+        out[kind] = _encode_webp(img, webp_quality)
+    return out
+
+
+def _decode(source: ImageSource, *, max_pixels: int, max_dim: int) -> Image.Image:
+    # Image.open only parses the header, so dimensions are checked before any pixel is decoded
+    try:
+        img = Image.open(BytesIO(source) if isinstance(source, bytes) else source)
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError("Image dimensions too large") from e
+    except Exception as e:
+        raise InvalidImageError("Invalid image") from e
+
+    width, height = img.size
+    if width * height > max_pixels:
+        img.close()
+        raise ImageTooLargeError(f"Image dimensions too large ({width}x{height} > {max_pixels} pixels)")
+
+    if img.format == "JPEG" and max(width, height) > max_dim:
+        # DCT scaling: decode straight at 1/2, 1/4 or 1/8 size, as long as the
+        # result still covers the thumbnail() target size
+        scale = max(width, height) / max_dim
+        img.draft("RGB", (math.ceil(width / scale), math.ceil(height / scale)))
+
+    try:
+        img.load()
+    except Exception as e:
+        img.close()
+        raise InvalidImageError("Invalid image") from e
+    return img
+
 
-    return compressed, "image/webp", sha256_hex(compressed)
+def _encode_webp(img: Image.Image, quality: int) -> tuple[bytes, str, str]:
+    method = 4 if img.width * img.height > WEBP_SLOW_METHOD_MAX_PIXELS else 6
+    buf = BytesIO()
+    img.save(buf, format="WEBP", quality=quality, method=method)
+    data = buf.getvalue()
+    return data, "image/webp", sha256_hex(data)
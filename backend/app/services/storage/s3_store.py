@@ -0,0 +1,167 @@
+# app/services/storage/s3_store.py
+
+# S3-compatible object storage (AWS S3, MinIO, ...). Needs the optional `s3` extra
+# (boto3); boto3 is only imported when this backend is selected.
+
+from __future__ import annotations
+
+import threading
+from io import BytesIO
+from typing import Any, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.storage.base import StoredImage
+from app.services.storage.content_addressed import ContentAddressedImageStore, stored_image
+
+_client_lock = threading.Lock()
+_client: Any = None
+
+
+def get_s3_client() -> Any:
+    """
+    One client per process: boto3 clients are thread-safe and keep a pool of
+    S3_MAX_POOL_CONNECTIONS keep-alive HTTP connections.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError as e:  # pragma: no cover - depends on installed extras
+                raise RuntimeError("TRADE_IMAGE_STORE=s3 needs boto3 (poetry install -E s3)") from e
+
+            config = Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 3, "mode": "standard"},
+            )
+            if settings.S3_ENDPOINT_URL:  # MinIO & co. want path-style URLs
+                config = config.merge(Config(s3={"addressing_style": "path"}))
+
+            _client = boto3.client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                region_name=settings.S3_REGION,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                config=config,
+            )
+        return _client
+
+
+def reset_s3_client() -> None:
+    global _client
+    with _client_lock:
+        _client = None
+
+
+class S3TradeImageStore(ContentAddressedImageStore):
+    """Blobs as objects <prefix>/<sha[:2]>/<sha>; trade_images keeps metadata only."""
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        client: Any,
+        bucket: str,
+        prefix: str = "trade-images",
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+    ):
+        super().__init__(db, chunk_size=chunk_size)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunksize = multipart_chunksize
+
+    def key(self, sha256: str) -> str:
+        return f"{self.prefix}/{sha256[:2]}/{sha256}" if self.prefix else f"{sha256[:2]}/{sha256}"
+
+    @staticmethod
+    def _is_not_found(e: Exception) -> bool:
+        code = getattr(e, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def _blob_exists(self, sha256: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(sha256))
+        except Exception as e:
+            if self._is_not_found(e):
+                return False
+            raise
+        return True
+
+    def _put_blob(self, sha256: str, data: bytes, mime: str) -> None:
+        from boto3.s3.transfer import TransferConfig
+
+        # upload_fileobj switches to a multipart upload above the threshold
+        self.client.upload_fileobj(
+            BytesIO(data),
+            self.bucket,
+            self.key(sha256),
+            ExtraArgs={"ContentType": mime},
+            Config=TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                multipart_chunksize=self.multipart_chunksize,
+            ),
+        )
+
+    def _get_object(self, sha256: str) -> Any | None:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.key(sha256))
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+
+    def _read_blob(self, sha256: str) -> bytes | None:
+        obj = self._get_object(sha256)
+        if obj is None:
+            return None
+        body = obj["Body"]
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def _delete_blob(self, sha256: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(sha256))
+
+    def _iter_blob(self, sha256: str, start: int, end: int) -> Iterator[bytes] | None:
+        try:
+            obj = self.client.get_object(
+                Bucket=self.bucket, Key=self.key(sha256), Range=f"bytes={start}-{end - 1}"
+            )
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+
+        def chunks() -> Iterator[bytes]:
+            # Closing returns the pooled connection even if the client disconnects early
+            body = obj["Body"]
+            try:
+                yield from body.iter_chunks(self.chunk_size)
+            finally:
+                body.close()
+
+        return chunks()
+
+    def presigned_url(self, *, trade_id: str, kind: str, expires_in: int) -> tuple[StoredImage, str] | None:
+        row = self._row(trade_id, kind)
+        if not row or self._is_db_resident(row):
+            return None
+        url = self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.key(row.sha256),
+                "ResponseContentType": row.mime,
+            },
+            ExpiresIn=expires_in,
+        )
+        return stored_image(row), url
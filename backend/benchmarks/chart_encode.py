@@ -0,0 +1,77 @@
+# benchmarks/chart_encode.py
+
+# Chart ingest encode time: the original pipeline (full decode, WebP method=6)
+# against compress_chart_image (header check, JPEG draft decode, adaptive method).
+#
+#   cd backend && python -m benchmarks.chart_encode [--repeat 5]
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image
+
+from app.services.storage.image_processing import compress_chart_image, compress_chart_renditions
+
+ASSET = Path(__file__).resolve().parents[1] / "tests" / "assets" / "MT5_chart.png"
+
+
+def legacy_compress(raw: bytes, *, max_dim: int = 1600, webp_quality: int = 80) -> bytes:
+    img = Image.open(BytesIO(raw))
+    img.load()
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.thumbnail((max_dim, max_dim))
+    out = BytesIO()
+    img.save(out, format="WEBP", quality=webp_quality, method=6)
+    return out.getvalue()
+
+
+def _samples() -> dict[str, bytes]:
+    samples = {"MT5 chart PNG 1807x867": ASSET.read_bytes()}
+
+    # Phone-camera sized photo of a screen, with some texture for the encoder
+    size = (6000, 4000)
+    photo = Image.merge(
+        "RGB",
+        [Image.effect_noise(size, 8), Image.linear_gradient("L").resize(size), Image.radial_gradient("L").resize(size)],
+    )
+    buf = BytesIO()
+    photo.save(buf, format="JPEG", quality=80)
+    samples["JPEG 6000x4000"] = buf.getvalue()
+    return samples
+
+
+def _time(fn: Callable[[], object], repeat: int) -> tuple[float, object]:
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chart ingest encode benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'input':<24} {'pipeline':<22} {'median ms':>10} {'webp bytes':>11}")
+    for name, raw in _samples().items():
+        rows = [
+            ("legacy", lambda: legacy_compress(raw)),
+            ("compress_chart_image", lambda: compress_chart_image(raw)[0]),
+            ("+ 800/320 renditions", lambda: compress_chart_renditions(raw)["CHART"][0]),
+        ]
+        for label, fn in rows:
+            ms, out = _time(fn, args.repeat)
+            print(f"{name:<24} {label:<22} {ms:>10.1f} {len(out):>11}")
+
+
+if __name__ == "__main__":
+    main()
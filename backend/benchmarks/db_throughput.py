@@ -0,0 +1,145 @@
+# benchmarks/db_throughput.py
+
+# Concurrent journal throughput on a scratch SQLite file: async writers creating
+# trades (crud.trade.create_trade, rollup upsert included) while readers page the
+# journal, with SQLite's own defaults (rollback journal, synchronous=FULL, 2 MB
+# cache, no mmap) against the pool + pragma settings app/db/session.py now applies.
+# Each configuration runs in a fresh interpreter, since settings are read at import.
+#
+#   cd backend && python -m benchmarks.db_throughput [--seconds 5] [--writers 8] [--readers 8]
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# SQLite's defaults, and what the engine used before the pool settings existed
+BEFORE = {
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_BUSY_TIMEOUT_MS": "5000",  # pysqlite's default timeout=5.0
+    "SQLITE_MMAP_SIZE_BYTES": "0",
+    "SQLITE_CACHE_SIZE_KB": "2000",
+    "DB_POOL_PRE_PING": "false",
+    "DB_POOL_RECYCLE_S": "-1",
+}
+AFTER: dict[str, str] = {}  # Settings defaults
+
+PAYLOAD = {
+    "inputs": {
+        "balance_chf": 1000.0, "risk_pct": 1.0, "symbol": "XAUUSD", "direction": "LONG",
+        "entry_price": 2400.0, "stop_distance": 500.0, "stop_unit": "TICKS", "tp_r_multiple": 2.0,
+    },
+    "outputs": {"sl_price": 2395.0, "tp_price": 2410.0, "lots": 0.02, "risk_chf": 10.0, "reward_chf": 20.0, "reward_to_risk": 2.0},
+    "journal": {"status": "CLOSED", "closed_at": "2026-03-02T12:00:00", "realized_pnl_chf": 5.0, "realized_r_multiple": 0.5},
+}
+
+
+async def _workload(seconds: float, writers: int, readers: int) -> dict:
+    from app import models  # noqa: F401  (register every table on Base.metadata)
+    from app.crud.trade import create_trade, list_trades_for_user_with_chart_flag
+    from app.db.base import Base
+    from app.db.session import AsyncSessionLocal, async_engine, engine
+    from app.models.user import User
+    from app.schemas.trade import TradeCreate
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert().values(id="bench", email="bench@example.com", username="bench", password_hash="x"))
+    payload = TradeCreate.model_validate(PAYLOAD)
+
+    deadline = time.perf_counter() + seconds
+    latencies: dict[str, list[float]] = {"create": [], "list": []}
+    errors = 0
+
+    async def create() -> None:
+        async with AsyncSessionLocal() as db:
+            await create_trade(db, user_id="bench", payload=payload)
+
+    async def list_page() -> None:
+        async with AsyncSessionLocal() as db:
+            await list_trades_for_user_with_chart_flag(db, user_id="bench", limit=50)
+
+    async def client(op: str, fn) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                await fn()
+            except Exception:  # "database is locked" once busy_timeout runs out
+                errors += 1
+                continue
+            latencies[op].append(time.perf_counter() - t0)
+
+    await asyncio.gather(
+        *(client("create", create) for _ in range(writers)),
+        *(client("list", list_page) for _ in range(readers)),
+    )
+    await async_engine.dispose()
+    engine.dispose()
+
+    def p95_ms(xs: list[float]) -> float:
+        return statistics.quantiles(xs, n=20)[-1] * 1000 if len(xs) >= 2 else float("nan")
+
+    return {
+        "creates_per_s": len(latencies["create"]) / seconds,
+        "lists_per_s": len(latencies["list"]) / seconds,
+        "create_p95_ms": p95_ms(latencies["create"]),
+        "list_p95_ms": p95_ms(latencies["list"]),
+        "errors": errors,
+    }
+
+
+def _run_config(overrides: dict[str, str], args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            **overrides,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'bench.db'}",
+        }
+        env.pop("ASYNC_DATABASE_URL", None)
+        out = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.db_throughput", "--child",
+                "--seconds", str(args.seconds), "--writers", str(args.writers), "--readers", str(args.readers),
+            ],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent trade create/list throughput on SQLite")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_workload(args.seconds, args.writers, args.readers))))
+        return
+
+    print(f"{args.writers} writers + {args.readers} readers, {args.seconds:g} s each")
+    print(f"{'config':<8} {'creates/s':>10} {'lists/s':>10} {'create p95 ms':>14} {'list p95 ms':>12} {'errors':>7}")
+    for label, overrides in (("before", BEFORE), ("after", AFTER)):
+        r = _run_config(overrides, args)
+        print(
+            f"{label:<8} {r['creates_per_s']:>10.1f} {r['lists_per_s']:>10.1f} "
+            f"{r['create_p95_ms']:>14.1f} {r['list_p95_ms']:>12.1f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
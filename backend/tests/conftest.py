@@ -6,11 +6,16 @@ from pathlib import Path
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.core.deps import get_db
+from app.core.auth_cache import principal_cache, token_cache
+from app.core.deps import get_async_db, get_db
 from app.db.base import Base
+from app.db.session import async_database_url
 from app.main import app
+from app.services.storage.cache import chart_image_cache
 
 
 @pytest.fixture(scope="session")
@@ -27,6 +32,12 @@ def engine(test_db_url: str):
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_engine(test_db_url: str):
+    # NullPool: every TestClient runs its own event loop, so don't keep aiosqlite connections around
+    return create_async_engine(async_database_url(test_db_url), poolclass=NullPool, future=True)
+
+
 @pytest.fixture(scope="function")
 def db_session(engine):
     """
@@ -41,6 +52,9 @@ def db_session(engine):
     for table in reversed(Base.metadata.sorted_tables):
         session.execute(table.delete())
     session.commit()
+    chart_image_cache.clear()
+    token_cache.clear()
+    principal_cache.clear()
 
     try:
         yield session
@@ -49,7 +63,7 @@ def db_session(engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, async_engine):
     # Override app dependency so API uses our test DB session
     def override_get_db():
         try:
@@ -57,7 +71,15 @@ def client(db_session):
         finally:
             pass
 
+    # Async endpoints get their own session per request on the same DB file
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,260 @@
+# tests/test_analytics.py
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.executors import shutdown_executors
+from app.services import monte_carlo
+
+from tests.utils.auth import auth_headers, login_user, register_user
+from tests.utils.trades import create_trade
+
+
+def _close(client: TestClient, token: str, *, day: int, pnl: float, r: float, **overrides) -> dict:
+    return create_trade(
+        client,
+        token,
+        journal={
+            "status": "CLOSED",
+            "closed_at": f"2026-03-{day:02d}T12:00:00",
+            "realized_pnl_chf": pnl,
+            "realized_r_multiple": r,
+        },
+        **overrides,
+    )
+
+
+def test_analytics_summary_requires_auth(client: TestClient):
+    r = client.get("/api/v1/analytics/summary")
+    assert r.status_code == 401, r.text
+
+
+def test_analytics_summary_empty(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    r = client.get("/api/v1/analytics/summary", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["trade_count"] == 0
+    assert body["win_rate"] is None
+    assert body["max_drawdown_chf"] == 0.0
+    assert body["equity_curve"]["equity_chf"] == []
+
+
+def test_analytics_summary_stats(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    # Created out of order on purpose: the curve follows closed_at
+    _close(client, token, day=3, pnl=30.0, r=3.0)
+    _close(client, token, day=1, pnl=20.0, r=2.0)
+    _close(client, token, day=2, pnl=-10.0, r=-1.0)
+    _close(client, token, day=4, pnl=-25.0, r=-2.5)
+    _close(client, token, day=5, pnl=-5.0, r=-0.5)
+    create_trade(client, token)  # PLANNED, ignored
+
+    r = client.get("/api/v1/analytics/summary", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert body["trade_count"] == 5
+    assert body["win_count"] == 2
+    assert body["loss_count"] == 3
+    assert body["win_rate"] == pytest.approx(0.4)
+    assert body["total_pnl_chf"] == pytest.approx(10.0)
+    assert body["expectancy_chf"] == pytest.approx(2.0)
+    assert body["expectancy_r"] == pytest.approx(0.2)
+    assert body["profit_factor"] == pytest.approx(50.0 / 40.0)
+
+    assert body["equity_curve"]["equity_chf"] == pytest.approx([20, 10, 40, 15, 10])
+    assert body["equity_curve"]["drawdown_chf"] == pytest.approx([0, 10, 0, 25, 30])
+    assert body["max_drawdown_chf"] == pytest.approx(30.0)
+
+    hist = body["r_histogram"]
+    assert sum(hist["counts"]) == 5
+    assert len(hist["edges"]) == len(hist["counts"]) + 1
+
+
+def test_analytics_summary_symbol_filter(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    _close(client, token, day=1, pnl=20.0, r=2.0)
+    _close(client, token, day=2, pnl=-10.0, r=-1.0, inputs={"symbol": "EURUSD"})
+
+    r = client.get("/api/v1/analytics/summary", params={"symbol": "EURUSD"}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["trade_count"] == 1
+    assert body["total_pnl_chf"] == pytest.approx(-10.0)
+    assert body["profit_factor"] == 0.0
+
+
+def _stats(client: TestClient, token: str, **params) -> dict:
+    r = client.get("/api/v1/analytics/stats", params=params, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_analytics_stats_match_summary(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    _close(client, token, day=3, pnl=30.0, r=3.0)
+    _close(client, token, day=1, pnl=20.0, r=2.0)
+    _close(client, token, day=2, pnl=-10.0, r=-1.0, inputs={"symbol": "EURUSD"})
+    create_trade(client, token)  # PLANNED, ignored
+
+    summary = client.get("/api/v1/analytics/summary", headers=auth_headers(token)).json()
+    stats = _stats(client, token)
+    for key in ("trade_count", "win_count", "loss_count", "win_rate", "total_pnl_chf",
+                "expectancy_chf", "expectancy_r", "profit_factor"):
+        assert stats[key] == pytest.approx(summary[key]), key
+
+    eur = _stats(client, token, symbol="EURUSD")
+    assert eur["trade_count"] == 1
+    assert eur["total_pnl_chf"] == pytest.approx(-10.0)
+
+    march = _stats(client, token, month="2026-03")
+    assert march["trade_count"] == 3
+    assert _stats(client, token, month="2026-04")["trade_count"] == 0
+
+    r = client.get("/api/v1/analytics/stats", params={"month": "March"}, headers=auth_headers(token))
+    assert r.status_code == 422, r.text
+
+
+def test_analytics_stats_follow_trade_updates(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    trade = create_trade(client, token)
+    assert _stats(client, token)["trade_count"] == 0
+
+    r = client.patch(
+        f"/api/v1/trades/{trade['id']}",
+        json={"status": "CLOSED", "closed_at": "2026-03-01T12:00:00", "realized_pnl_chf": 15.0, "realized_r_multiple": 1.5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    stats = _stats(client, token)
+    assert stats["trade_count"] == 1
+    assert stats["total_pnl_chf"] == pytest.approx(15.0)
+    assert stats["expectancy_r"] == pytest.approx(1.5)
+
+    # Correcting the PnL replaces the old contribution (win -> loss), not adds to it
+    r = client.patch(
+        f"/api/v1/trades/{trade['id']}",
+        json={"realized_pnl_chf": -5.0, "realized_r_multiple": -0.5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    stats = _stats(client, token)
+    assert stats["trade_count"] == 1
+    assert stats["win_count"] == 0
+    assert stats["loss_count"] == 1
+    assert stats["total_pnl_chf"] == pytest.approx(-5.0)
+
+    # Moving the close date moves the trade between month buckets
+    r = client.patch(
+        f"/api/v1/trades/{trade['id']}",
+        json={"closed_at": "2026-04-02T12:00:00"},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert _stats(client, token, month="2026-03")["trade_count"] == 0
+    assert _stats(client, token, month="2026-04")["trade_count"] == 1
+
+    # Re-opening drops it from the rollup again
+    r = client.patch(f"/api/v1/trades/{trade['id']}", json={"status": "OPEN"}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert _stats(client, token)["trade_count"] == 0
+
+
+def test_rebuild_trade_stats_matches_incremental(client: TestClient, db_session):
+    from app.crud.trade_stats import rebuild_trade_stats
+
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    _close(client, token, day=1, pnl=20.0, r=2.0)
+    _close(client, token, day=2, pnl=-10.0, r=-1.0, inputs={"symbol": "EURUSD"})
+    before = [_stats(client, token), _stats(client, token, symbol="EURUSD"), _stats(client, token, month="2026-03")]
+
+    assert rebuild_trade_stats(db_session) == 6  # {*, XAUUSD, EURUSD} x {*, 2026-03}
+    db_session.expire_all()
+
+    after = [_stats(client, token), _stats(client, token, symbol="EURUSD"), _stats(client, token, month="2026-03")]
+    assert after == before
+
+
+def test_monte_carlo_requires_history(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    r = client.post("/api/v1/analytics/monte-carlo", json={}, headers=auth_headers(token))
+    assert r.status_code == 422, r.text
+
+    r = client.post("/api/v1/analytics/monte-carlo", json={"paths": 10**6}, headers=auth_headers(token))
+    assert r.status_code == 422, r.text
+
+
+def test_monte_carlo_bands_and_ruin(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    for day, r_mult in enumerate([2.0, -1.0, -1.0, 3.0, -1.0], start=1):
+        _close(client, token, day=day, pnl=r_mult * 10, r=r_mult)
+
+    body = {"paths": 2000, "trades": 50, "seed": 7}
+    r = client.post("/api/v1/analytics/monte-carlo", json=body, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    out = r.json()
+
+    assert out["sample_size"] == 5
+    assert out["risk_pct"] == pytest.approx(1.0)  # median of the trades' risk_pct
+    bands = out["equity_bands"]
+    assert bands["step"][0] == 0 and bands["step"][-1] == 50
+    assert all(row[0] == 1.0 for row in bands["equity"])
+    final = [row[-1] for row in bands["equity"]]
+    assert final == sorted(final)  # p5 <= ... <= p95
+    assert final[2] > 1.0  # positive expectancy (0.4R)
+    assert sum(out["max_drawdown"]["counts"]) == 2000
+    assert 0.0 <= out["risk_of_ruin"] <= 1.0
+
+    # Same seed, same answer
+    again = client.post("/api/v1/analytics/monte-carlo", json=body, headers=auth_headers(token)).json()
+    assert again == out
+
+    # Risking 5% per trade hits a 30% drawdown far more often than risking 0.1%
+    risky = client.post(
+        "/api/v1/analytics/monte-carlo",
+        json={**body, "risk_pct": 5.0, "trades": 200, "ruin_drawdown_pct": 30},
+        headers=auth_headers(token),
+    ).json()
+    safe = client.post(
+        "/api/v1/analytics/monte-carlo",
+        json={**body, "risk_pct": 0.1, "trades": 200, "ruin_drawdown_pct": 30},
+        headers=auth_headers(token),
+    ).json()
+    assert risky["risk_of_ruin"] > safe["risk_of_ruin"]
+    assert safe["risk_of_ruin"] == 0.0
+
+
+def test_monte_carlo_fans_chunks_out_to_pool():
+    r = np.array([2.0, -1.0, -1.0, 3.0, -1.0])
+    kwargs = dict(risk_pct=1.0, paths=3000, trades=100, ruin_drawdown_pct=50.0, seed=3)
+    cells = monte_carlo.CHUNK_CELLS
+    try:
+        monte_carlo.CHUNK_CELLS = 100_000  # 3 chunks -> process pool
+        pooled = monte_carlo.simulate(r, **kwargs)
+    finally:
+        monte_carlo.CHUNK_CELLS = cells
+        shutdown_executors()
+
+    assert pooled.paths == 3000
+    assert sum(pooled.max_drawdown.counts) == 3000
+    assert pooled.equity_bands.equity[0][-1] <= pooled.equity_bands.equity[-1][-1]
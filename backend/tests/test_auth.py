@@ -1,7 +1,13 @@
 # tests/test_auth.py
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi.testclient import TestClient
 
+from app.core import executors
+from app.core.executors import BoundedExecutor
+
 def register_user(client: TestClient, email: str, username: str, password: str):
     return client.post(
         "/api/v1/auth/register",
@@ -107,3 +113,30 @@ def test_me_with_token_returns_user(client: TestClient):
     assert body["email"] == "dimi@example.com"
     assert body["username"] == "dimi"
     assert "id" in body
+
+
+def test_login_503_when_password_pool_saturated(client: TestClient, monkeypatch):
+    reg = register_user(client, "dimi@example.com", "dimi", "test1234")
+    assert reg.status_code == 200, reg.text
+    token = login_user(client, email="dimi@example.com", password="test1234").json()["access_token"]
+
+    gate = threading.Event()
+    busy = BoundedExecutor(ThreadPoolExecutor(max_workers=1), capacity=1, workers=1)
+    busy.submit(gate.wait)
+    monkeypatch.setattr(executors, "_password_pool", busy)
+    try:
+        login = login_user(client, email="dimi@example.com", password="test1234")
+        assert login.status_code == 503, login.text
+        assert login.headers["retry-after"] == "1"
+
+        reg = register_user(client, "other@example.com", "other", "test1234")
+        assert reg.status_code == 503, reg.text
+
+        # Token-authenticated calls never touch bcrypt
+        me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert me.status_code == 200, me.text
+
+        assert client.get("/health").json()["executors"]["password"]["rejected"] == 2
+    finally:
+        gate.set()
+        busy.shutdown()
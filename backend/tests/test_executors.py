@@ -0,0 +1,78 @@
+# tests/test_executors.py
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.executors import BoundedExecutor, ExecutorSaturatedError, get_cpu_pool, get_image_pool
+
+
+def test_bounded_executor_rejects_beyond_capacity():
+    gate = threading.Event()
+    pool = BoundedExecutor(ThreadPoolExecutor(max_workers=1), capacity=2)
+    try:
+        running = pool.submit(gate.wait)
+        queued = pool.submit(gate.wait)
+        assert pool.in_flight == 2
+
+        with pytest.raises(ExecutorSaturatedError):
+            pool.submit(gate.wait)
+        assert pool.rejected == 1
+
+        gate.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert pool.in_flight == 0
+
+        # Slots are released as jobs finish
+        assert pool.run(sum, [1, 2, 3]) == 6
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_bounded_executor_propagates_job_errors():
+    pool = BoundedExecutor(ThreadPoolExecutor(max_workers=1), capacity=1)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            pool.run(divmod, 1, 0)
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_bounded_executor_stats_track_queueing():
+    gate = threading.Event()
+    pool = BoundedExecutor(ThreadPoolExecutor(max_workers=1), capacity=3, workers=1)
+    try:
+        futs = [pool.submit(gate.wait) for _ in range(3)]
+        stats = pool.stats()
+        assert stats["in_flight"] == 3
+        assert stats["queued"] == 2
+
+        with pytest.raises(ExecutorSaturatedError):
+            pool.submit(gate.wait)
+
+        gate.set()
+        for fut in futs:
+            fut.result(timeout=5)
+        pool.shutdown()  # joins the worker, so every done callback has run
+
+        stats = pool.stats()
+        assert stats["in_flight"] == stats["queued"] == 0
+        assert stats["peak_in_flight"] == 3
+        assert stats["submitted"] == stats["completed"] == 3
+        assert stats["rejected"] == 1
+        assert stats["latency_max_ms"] >= stats["latency_avg_ms"] > 0
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_process_pools_do_not_fork():
+    # Forking a process that already runs threads can hand the child a held lock
+    for executor in (get_cpu_pool(), get_image_pool().executor):
+        assert executor._mp_context.get_start_method() != "fork"
@@ -0,0 +1,114 @@
+# tests/test_pnl.py
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.pnl import realized_pnls
+from tests.utils.auth import auth_headers, login_user, register_user
+from tests.utils.trades import create_trade
+
+# Default test trade: XAUUSD SHORT @ 4600.5, SL 4601.0 (0.5 away), 9 CHF per lot at the stop,
+# 0.01 lots, 10 CHF risk -> 18 CHF per 1.0 price move per lot.
+
+
+def test_realized_pnls_long_short_and_unpriceable():
+    pnl, r = realized_pnls(
+        direction=["SHORT", "LONG", "SHORT", "LONG"],
+        entry_price=[4600.5, 1.1000, 4600.5, 1.1000],
+        exit_price=[4590.5, 1.0950, 4590.5, 1.1050],
+        sl_price=[4601.0, 1.0980, 4600.5, 1.0980],
+        lots=[0.01, 0.5, 0.01, 0.5],
+        stop_value_1lot_chf=[9.0, 180.0, 9.0, np.nan],
+        risk_chf=[10.0, 100.0, 10.0, 100.0],
+    )
+    # 10.0 move * 18 CHF * 0.01 lots
+    assert pnl[0] == pytest.approx(1.8)
+    assert r[0] == pytest.approx(0.18)
+    # LONG against the position: -50 pips at 9 CHF/pip/lot * 0.5 lots
+    assert pnl[1] == pytest.approx(-225.0)
+    assert r[1] == pytest.approx(-2.25)
+    # Stop at entry / missing stop value cannot be priced
+    assert np.isnan(pnl[2]) and np.isnan(pnl[3])
+
+
+def test_closing_with_exit_price_derives_realized(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade = create_trade(client, token)
+
+    r = client.patch(
+        f"/api/v1/trades/{trade['id']}",
+        json={"status": "CLOSED", "closed_at": "2026-03-01T12:00:00", "exit_price": 4590.5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    journal = r.json()["journal"]
+    assert journal["exit_price"] == 4590.5
+    assert journal["realized_pnl_chf"] == pytest.approx(1.8)
+    assert journal["realized_r_multiple"] == pytest.approx(0.18)
+
+    # The rollup sees the derived values
+    stats = client.get("/api/v1/analytics/stats", headers=auth_headers(token)).json()
+    assert stats["total_pnl_chf"] == pytest.approx(1.8)
+
+    # Explicit realized values (fees, swaps, ...) take precedence over the exit price
+    r = client.patch(
+        f"/api/v1/trades/{trade['id']}",
+        json={"exit_price": 4580.5, "realized_pnl_chf": 3.5, "realized_r_multiple": 0.35},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["journal"]["realized_pnl_chf"] == pytest.approx(3.5)
+
+
+def test_create_closed_trade_with_exit_price(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    trade = create_trade(client, token, journal={"status": "CLOSED", "exit_price": 4601.0})
+    # Stopped out: exactly -1R of the actual position risk (0.09 CHF of the 10 CHF budget)
+    assert trade["journal"]["realized_pnl_chf"] == pytest.approx(-0.09)
+    assert trade["journal"]["realized_r_multiple"] == pytest.approx(-0.009)
+
+    planned = create_trade(client, token, journal={"exit_price": 4590.5})
+    assert planned["journal"]["realized_pnl_chf"] is None
+
+
+def test_recompute_pnl_with_rate_correction(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    closed = [
+        create_trade(
+            client, token,
+            journal={"status": "CLOSED", "closed_at": f"2026-03-{d:02d}T12:00:00", "exit_price": 4590.5},
+        )
+        for d in (1, 2, 3)
+    ]
+    create_trade(client, token)  # PLANNED, untouched
+
+    # The recorded 0.90 USD->CHF rate was wrong; 0.81 scales every CHF value by 0.9
+    r = client.post("/api/v1/trades/recompute-pnl", json={"usdchf_rate": 0.81}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert r.json() == {"updated": 3}
+
+    got = client.get(f"/api/v1/trades/{closed[0]['id']}", headers=auth_headers(token)).json()
+    assert got["inputs"]["usdchf_rate"] == pytest.approx(0.81)
+    assert got["outputs"]["stop_value_1lot_chf"] == pytest.approx(8.1)
+    assert got["outputs"]["reward_chf"] == pytest.approx(18.0)
+    assert got["outputs"]["risk_chf"] == pytest.approx(10.0)  # CHF budget, not rate-dependent
+    assert got["journal"]["realized_pnl_chf"] == pytest.approx(1.62)
+    assert got["journal"]["realized_r_multiple"] == pytest.approx(0.162)
+
+    stats = client.get("/api/v1/analytics/stats", headers=auth_headers(token)).json()
+    assert stats["trade_count"] == 3
+    assert stats["total_pnl_chf"] == pytest.approx(3 * 1.62)
+
+    # Other users are not affected
+    register_user(client, "b@example.com", "bob", "test1234")
+    token_b = login_user(client, "b@example.com", "test1234")
+    r = client.post("/api/v1/trades/recompute-pnl", json={}, headers=auth_headers(token_b))
+    assert r.json() == {"updated": 0}
@@ -1,6 +1,10 @@
 # tests/test_profile.py
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core import auth_cache
+from app.core.auth_cache import principal_cache, token_cache
 
 from tests.utils.auth import (
     register_user, login_user,
@@ -118,3 +122,69 @@ def test_profile_delete_account(client: TestClient):
     # login should fail now
     bad = login_user_raw(client, "a@example.com", "test1234")
     assert bad.status_code == 401, bad.text
+
+
+def test_authenticated_requests_reuse_cached_user(client: TestClient, engine):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    assert client.get("/api/v1/profile", headers=auth_headers(token)).status_code == 200
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for _ in range(3):
+            r = client.get("/api/v1/profile", headers=auth_headers(token))
+            assert r.json()["username"] == "alice"
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert not any("FROM users" in s for s in statements)
+    assert token_cache.hits >= 3 and principal_cache.hits >= 3
+
+
+def test_profile_changes_invalidate_cached_user(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    headers = auth_headers(token)
+    client.get("/api/v1/profile", headers=headers)  # warm the cache
+
+    r = client.patch("/api/v1/profile", json={"username": "alice2"}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert client.get("/api/v1/profile", headers=headers).json()["username"] == "alice2"
+
+    r = client.post(
+        "/api/v1/profile/password",
+        json={"current_password": "test1234", "new_password": "newpass123"},
+        headers=headers,
+    )
+    assert r.status_code == 204, r.text
+
+    # A stale cached password_hash would still accept the old password here
+    stale = client.request("DELETE", "/api/v1/profile", json={"current_password": "test1234"}, headers=headers)
+    assert stale.status_code == 401, stale.text
+    r = client.request("DELETE", "/api/v1/profile", json={"current_password": "newpass123"}, headers=headers)
+    assert r.status_code == 204, r.text
+
+    gone = client.get("/api/v1/profile", headers=headers)
+    assert gone.status_code == 401
+    assert gone.json()["detail"] == "User not found"
+
+
+def test_ttl_cache_expiry_and_bound(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth_cache.time, "monotonic", lambda: now[0])
+    cache = auth_cache.TTLCache(max_entries=2, ttl_s=30)
+
+    cache.put("a", 1)
+    cache.put("b", 2, ttl_s=5)  # e.g. a token expiring sooner than the TTL
+    cache.put("c", 3)  # over max_entries: "a" is dropped
+    assert cache.get("a") is None and cache.get("b") == 2
+
+    now[0] += 10
+    assert cache.get("b") is None and cache.get("c") == 3
+    cache.put("d", 4, ttl_s=-1)  # already expired token: not cached
+    assert cache.get("d") is None
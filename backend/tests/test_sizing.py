@@ -0,0 +1,218 @@
+# tests/test_sizing.py
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas.trade import TradeInputs
+from app.services.sizing import (
+    SizingError,
+    compute_position_size,
+    compute_position_sizes,
+    fx_value_per_pip_per_lot_chf,
+    gold_value_per_tick_per_lot_chf,
+)
+from tests.utils.auth import auth_headers, login_user, register_user
+from tests.utils.trades import create_trade, make_trade_payload
+
+
+def _inputs(**overrides) -> TradeInputs:
+    return TradeInputs.model_validate({**make_trade_payload()["inputs"], **overrides})
+
+
+def test_value_per_unit_matches_frontend():
+    assert fx_value_per_pip_per_lot_chf("USDCHF", 0.9) == pytest.approx(10.0)
+    assert fx_value_per_pip_per_lot_chf("EURUSD", 0.9) == pytest.approx(9.0)
+    assert fx_value_per_pip_per_lot_chf("USDJPY", 0.9) == pytest.approx(900.0)
+    assert gold_value_per_tick_per_lot_chf(100, 0.01, 0.9) == pytest.approx(0.9)
+
+    with pytest.raises(SizingError):
+        gold_value_per_tick_per_lot_chf(0, 0.01, 0.9)
+
+
+def test_compute_position_size_gold_short():
+    out = compute_position_size(_inputs())
+
+    # 1000 CHF * 1% = 10 CHF risk; 20 ticks * 0.9 CHF = 18 CHF per lot -> 0.555.. -> 0.55
+    assert out.risk_chf == pytest.approx(10.0)
+    assert out.stop_value_1lot_chf == pytest.approx(18.0)
+    assert out.lots == pytest.approx(0.55)
+    assert out.exposure_units == 55
+    assert out.sl_price == pytest.approx(4600.7)
+    assert out.tp_price == pytest.approx(4600.1)
+    assert out.reward_chf == pytest.approx(19.8)
+
+
+def test_compute_position_size_validation_errors():
+    with pytest.raises(SizingError, match="Risk %"):
+        compute_position_size(_inputs(risk_pct=6))
+    with pytest.raises(SizingError, match="rounded down to 0"):
+        compute_position_size(_inputs(balance_chf=1))
+    with pytest.raises(SizingError, match="required"):
+        compute_position_size(_inputs(usdchf_rate=None))
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(7)
+    n = 2000
+    symbols = rng.choice(["XAUUSD", "EURUSD", "USDCHF"], size=n)
+    directions = rng.choice(["LONG", "SHORT"], size=n)
+    stops = rng.uniform(5, 80, size=n).round(1)
+    risks = rng.uniform(0.25, 2, size=n).round(2)
+
+    batch = compute_position_sizes(
+        symbol=symbols,
+        direction=directions,
+        entry_price=1.2,
+        stop_distance=stops,
+        balance_chf=25_000,
+        risk_pct=risks,
+        tp_r_multiple=2.5,
+        lot_step=0.01,
+        usdchf_rate=0.88,
+        tick_size=0.01,
+        contract_size=100,
+    )
+    assert batch["lots"].shape == (n,)
+    assert batch["valid"].all()
+
+    for i in range(0, n, 97):
+        single = compute_position_size(
+            _inputs(
+                symbol=symbols[i], direction=directions[i], entry_price=1.2,
+                stop_distance=stops[i], balance_chf=25_000, risk_pct=risks[i],
+                tp_r_multiple=2.5, usdchf_rate=0.88,
+                stop_unit="TICKS" if symbols[i] == "XAUUSD" else "PIPS",
+            )
+        )
+        for name, value in single.model_dump().items():
+            assert batch[name][i] == pytest.approx(value), name
+
+
+def test_batch_marks_invalid_rows():
+    batch = compute_position_sizes(
+        symbol="EURUSD",
+        direction="LONG",
+        entry_price=1.1,
+        stop_distance=[20, 0, 20],
+        balance_chf=[1000, 1000, 1],
+        risk_pct=1,
+        tp_r_multiple=2,
+        lot_step=0.01,
+        usdchf_rate=0.9,
+    )
+    assert batch["valid"].tolist() == [True, False, False]
+    assert np.isnan(batch["lots"][1:]).all()
+
+
+def test_create_trade_outputs_policy(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    # The default test payload carries hand-written outputs: stored as-is by default
+    created = create_trade(client, token)
+    assert created["outputs"]["lots"] == 0.01
+
+    payload = make_trade_payload()
+    r = client.post(
+        "/api/v1/trades",
+        params={"outputs_policy": "verify"},
+        json=payload,
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 422, r.text
+    assert "lots" in r.json()["detail"]
+
+    r = client.post(
+        "/api/v1/trades",
+        params={"outputs_policy": "recompute"},
+        json=payload,
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 201, r.text
+    server_outputs = r.json()["outputs"]
+    assert server_outputs["lots"] == pytest.approx(0.55)
+
+    # Posting the server's own outputs verifies cleanly
+    r = client.post(
+        "/api/v1/trades",
+        params={"outputs_policy": "verify"},
+        json={**payload, "outputs": server_outputs},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 201, r.text
+
+
+def _grid_payload(**overrides) -> dict:
+    payload = {
+        "symbol": "XAUUSD",
+        "direction": "LONG",
+        "entry_price": 2400.0,
+        "balance_chf": 10_000.0,
+        "lot_step": 0.01,
+        "usdchf_rate": 0.9,
+        "tick_size": 0.01,
+        "contract_size": 100.0,
+        "risk_pct": {"start": 0.5, "stop": 2.0, "num": 4},
+        "stop_distance": {"start": 100, "stop": 500, "num": 5},
+        "tp_r_multiple": {"start": 1, "stop": 3, "num": 3},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_sizing_grid_requires_auth(client: TestClient):
+    r = client.post("/api/v1/sizing/grid", json=_grid_payload())
+    assert r.status_code == 401, r.text
+
+
+def test_sizing_grid_columnar_matches_scalar(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    r = client.post("/api/v1/sizing/grid", json=_grid_payload(), headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert body["shape"] == [4, 5, 3]
+    assert len(body["lots"]) == 4 * 5 * 3
+    assert body["tp_r_multiple"] == [1.0, 2.0, 3.0]
+
+    # C order: index = (i_risk * n_stop + i_stop) * n_tp + i_tp
+    i_risk, i_stop, i_tp = 2, 3, 1
+    idx = (i_risk * 5 + i_stop) * 3 + i_tp
+    single = compute_position_size(
+        _inputs(
+            direction="LONG",
+            entry_price=2400.0,
+            balance_chf=10_000.0,
+            risk_pct=body["risk_pct"][i_risk],
+            stop_distance=body["stop_distance"][i_stop],
+            tp_r_multiple=body["tp_r_multiple"][i_tp],
+        )
+    )
+    assert body["lots"][idx] == pytest.approx(single.lots)
+    assert body["reward_chf"][idx] == pytest.approx(single.reward_chf)
+    assert body["tp_price"][idx] == pytest.approx(single.tp_price)
+
+
+def test_sizing_grid_unsizable_points_are_null_and_size_capped(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    r = client.post(
+        "/api/v1/sizing/grid",
+        json=_grid_payload(balance_chf=100.0, stop_distance={"start": 10, "stop": 5000, "num": 2}),
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert None in r.json()["lots"]
+
+    too_big = _grid_payload(
+        risk_pct={"start": 0.1, "stop": 2, "num": 1000},
+        stop_distance={"start": 10, "stop": 500, "num": 1000},
+    )
+    r = client.post("/api/v1/sizing/grid", json=too_big, headers=auth_headers(token))
+    assert r.status_code == 422, r.text
@@ -2,10 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import threading
+import time
+import zipfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+from PIL import Image
 from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from sqlalchemy import event, func, select
 
+from app.core import executors
+from app.core.config import settings
+from app.core.deps import get_async_db
+from app.core.executors import BoundedExecutor
+from app.core.middleware import BodySizeLimitMiddleware
+from app.main import app
+from app.models.blob import Blob
+from app.models.trade_image import TradeImage
+from app.services.chart_ingest import spool_chart_upload
+from app.services.storage.cache import ImageByteCache, chart_image_cache
+from app.services.storage.content_addressed import ContentAddressedImageStore
+from app.services.storage.db_store import DbTradeImageStore
+from app.services.storage.fs_store import FsTradeImageStore
+from app.services.storage.image_processing import ImageTooLargeError, compress_chart_renditions
 from tests.utils.auth import auth_headers, login_user, register_user
 from tests.utils.trades import create_trade
 
@@ -23,7 +50,7 @@ def test_trade_list_has_charts_false_then_true_after_upload(client: TestClient):
 
     lst = client.get("/api/v1/trades", headers=auth_headers(token))
     assert lst.status_code == 200, lst.text
-    found = [t for t in lst.json() if t["id"] == trade_id][0]
+    found = [t for t in lst.json()["items"] if t["id"] == trade_id][0]
     assert found["has_charts"] is False
 
     img_bytes = CHART_PATH.read_bytes()
@@ -36,7 +63,7 @@ def test_trade_list_has_charts_false_then_true_after_upload(client: TestClient):
 
     lst2 = client.get("/api/v1/trades", headers=auth_headers(token))
     assert lst2.status_code == 200, lst2.text
-    found2 = [t for t in lst2.json() if t["id"] == trade_id][0]
+    found2 = [t for t in lst2.json()["items"] if t["id"] == trade_id][0]
     assert found2["has_charts"] is True
 
 
@@ -96,3 +123,629 @@ def test_trade_chart_rejects_large_upload(client: TestClient):
         files={"file": ("big.png", too_big, "image/png")},
     )
     assert up.status_code == 413, up.text
+
+
+def test_trade_chart_upload_503_when_image_pool_saturated(client: TestClient, monkeypatch):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    gate = threading.Event()
+    busy = BoundedExecutor(ThreadPoolExecutor(max_workers=1), capacity=1)
+    busy.submit(gate.wait)
+    monkeypatch.setattr(executors, "_image_pool", busy)
+    try:
+        up = client.post(
+            f"/api/v1/trades/{trade_id}/chart",
+            headers=auth_headers(token),
+            files={"file": ("mt5_chart.png", CHART_PATH.read_bytes(), "image/png")},
+        )
+        assert up.status_code == 503, up.text
+        assert up.headers["retry-after"] == "1"
+
+        # Ordinary API calls are unaffected
+        assert client.get("/api/v1/trades", headers=auth_headers(token)).status_code == 200
+    finally:
+        gate.set()
+        busy.shutdown()
+
+
+def _wait_for_chart_job(client: TestClient, token: str, trade_id: str, timeout_s: float = 20.0) -> dict:
+    deadline = time.monotonic() + timeout_s
+    while True:
+        r = client.get(f"/api/v1/trades/{trade_id}/chart/status", headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        job = r.json()
+        if job["status"] in ("DONE", "FAILED") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_trade_chart_async_upload(client: TestClient, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CHART_SPOOL_DIR", str(tmp_path))
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    r = client.get(f"/api/v1/trades/{trade_id}/chart/status", headers=auth_headers(token))
+    assert r.status_code == 404, r.text
+
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        params={"mode": "async"},
+        headers=auth_headers(token),
+        files={"file": ("mt5_chart.png", CHART_PATH.read_bytes(), "image/png")},
+    )
+    assert up.status_code == 202, up.text
+    assert up.json()["status"] in ("QUEUED", "PROCESSING", "DONE")
+    assert up.headers["location"] == f"/api/v1/trades/{trade_id}/chart/status"
+
+    job = _wait_for_chart_job(client, token, trade_id)
+    assert job["status"] == "DONE", job
+    assert job["id"] == up.json()["id"]
+    assert list(tmp_path.iterdir()) == []  # spool cleaned up
+
+    get_img = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token))
+    assert get_img.status_code == 200, get_img.text
+    assert get_img.headers["content-type"] == "image/webp"
+
+
+def test_trade_chart_async_upload_invalid_image_fails_job(client: TestClient, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CHART_SPOOL_DIR", str(tmp_path))
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        params={"mode": "async"},
+        headers=auth_headers(token),
+        files={"file": ("broken.png", b"not an image", "image/png")},
+    )
+    assert up.status_code == 202, up.text
+
+    job = _wait_for_chart_job(client, token, trade_id)
+    assert job["status"] == "FAILED"
+    assert job["error"] == "Invalid image"
+
+    r = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token))
+    assert r.status_code == 404, r.text
+
+
+@pytest.fixture
+def fs_image_store(tmp_path, monkeypatch) -> Path:
+    root = tmp_path / "images"
+    monkeypatch.setattr(settings, "TRADE_IMAGE_STORE", "fs")
+    monkeypatch.setattr(settings, "TRADE_IMAGE_FS_ROOT", str(root))
+    return root
+
+
+def _upload_chart(client: TestClient, token: str, trade_id: str) -> None:
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        headers=auth_headers(token),
+        files={"file": ("mt5_chart.png", CHART_PATH.read_bytes(), "image/png")},
+    )
+    assert up.status_code == 204, up.text
+
+
+def test_chart_endpoints_never_open_an_async_session(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    async def no_async_db():
+        raise AssertionError("sync chart endpoint opened an AsyncSession")
+        yield  # pragma: no cover
+
+    app.dependency_overrides[get_async_db] = no_async_db
+    _upload_chart(client, token, trade_id)
+    url = f"/api/v1/trades/{trade_id}/chart"
+    assert client.get(url, headers=auth_headers(token)).status_code == 200
+    batch = client.post(
+        "/api/v1/trades/charts:batchGet",
+        headers=auth_headers(token),
+        json={"trade_ids": [trade_id], "format": "zip"},
+    )
+    assert batch.status_code == 200, batch.text
+    assert client.delete(url, headers=auth_headers(token)).status_code == 204
+    assert client.get(f"/api/v1/trades/{trade_id + 'x'}/chart", headers=auth_headers(token)).status_code == 404
+
+
+def test_fs_store_upload_and_get(client: TestClient, db_session, fs_image_store: Path):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    _upload_chart(client, token, trade_id)
+
+    row = db_session.scalars(
+        select(TradeImage).where(TradeImage.trade_id == trade_id, TradeImage.kind == "CHART")
+    ).one()
+    assert db_session.get(Blob, row.sha256).data is None  # bytes on disk only
+    blob = fs_image_store / row.sha256[:2] / row.sha256[2:4] / row.sha256
+    assert blob.is_file()
+
+    get_img = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token))
+    assert get_img.status_code == 200, get_img.text
+    assert get_img.headers["content-type"] == "image/webp"
+    assert get_img.headers["etag"] == row.sha256
+    assert get_img.content == blob.read_bytes()
+
+
+def test_fs_store_dedupes_identical_content(client: TestClient, db_session, fs_image_store: Path):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    first = create_trade(client, token)["id"]
+    second = create_trade(client, token)["id"]
+
+    _upload_chart(client, token, first)
+    _upload_chart(client, token, second)
+
+    blobs = [p for p in fs_image_store.rglob("*") if p.is_file()]
+    assert len(blobs) == 3  # full chart + 2 renditions, shared by both trades
+
+    # The shared blob survives until its last reference is gone
+    store = FsTradeImageStore(db_session, fs_image_store)
+    chart_blob = store.blob_path(store.head(trade_id=first, kind="CHART").sha256)
+    store.delete(trade_id=first, kind="CHART")
+    assert chart_blob.is_file()
+    assert store.get(trade_id=second, kind="CHART") is not None
+
+    store.delete(trade_id=second, kind="CHART")
+    assert not chart_blob.exists()
+
+
+def test_fs_store_references_blob_before_writing_bytes(client: TestClient, db_session, fs_image_store: Path):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    seen: list[int | None] = []
+
+    class CheckingStore(FsTradeImageStore):
+        def _blob_exists(self, sha256: str) -> bool:
+            seen.append(self.db.scalar(select(Blob.refcount).where(Blob.sha256 == sha256)))
+            return super()._blob_exists(sha256)
+
+    CheckingStore(db_session, fs_image_store).save(trade_id=trade_id, kind="CHART", data=b"abc", mime="image/webp")
+    assert seen == [1]  # our reference was already in when the bytes were checked/written
+
+
+def test_fs_store_keeps_bytes_when_delete_commit_fails(
+    client: TestClient, db_session, fs_image_store: Path, monkeypatch
+):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    store = FsTradeImageStore(db_session, fs_image_store)
+    meta = store.save(trade_id=trade_id, kind="CHART", data=b"abc", mime="image/webp")
+
+    def failing_commit():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        store.delete(trade_id=trade_id, kind="CHART")
+    db_session.rollback()
+    monkeypatch.undo()
+
+    assert store.blob_path(meta.sha256).is_file()
+    assert store.get(trade_id=trade_id, kind="CHART").data == b"abc"
+
+
+def test_content_addressed_store_requires_every_blob_primitive(db_session, tmp_path: Path):
+    class NoIterStore(FsTradeImageStore):
+        _iter_blob = ContentAddressedImageStore._iter_blob  # still abstract
+
+    with pytest.raises(TypeError, match="_iter_blob"):
+        NoIterStore(db_session, tmp_path)
+
+
+def test_trade_chart_conditional_get_skips_blob(client: TestClient, engine):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+
+    first = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token))
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for value in (etag, f'"{etag}"', f'W/"{etag}", "other"', "*"):
+            r = client.get(
+                f"/api/v1/trades/{trade_id}/chart",
+                headers={**auth_headers(token), "If-None-Match": value},
+            )
+            assert r.status_code == 304, (value, r.text)
+            assert r.headers["etag"] == etag
+            assert r.content == b""
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert any("FROM trade_images" in s for s in statements)
+    assert not any("blobs" in s for s in statements)
+
+    stale = client.get(
+        f"/api/v1/trades/{trade_id}/chart",
+        headers={**auth_headers(token), "If-None-Match": '"0000"'},
+    )
+    assert stale.status_code == 200
+    assert stale.content == first.content
+
+
+def test_trade_chart_range_requests(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "TRADE_IMAGE_CHUNK_BYTES", 1000)  # several chunked reads
+    monkeypatch.setattr(settings, "TRADE_IMAGE_CACHE_BYTES", 0)
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+    url = f"/api/v1/trades/{trade_id}/chart"
+
+    full = client.get(url, headers=auth_headers(token))
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+    body, etag = full.content, full.headers["etag"]
+    size = len(body)
+    assert int(full.headers["content-length"]) == size
+
+    part = client.get(url, headers={**auth_headers(token), "Range": "bytes=100-2599"})
+    assert part.status_code == 206, part.text
+    assert part.headers["content-range"] == f"bytes 100-2599/{size}"
+    assert part.content == body[100:2600]
+
+    tail = client.get(url, headers={**auth_headers(token), "Range": "bytes=-500"})
+    assert tail.status_code == 206
+    assert tail.content == body[-500:]
+
+    open_ended = client.get(url, headers={**auth_headers(token), "Range": f"bytes={size - 10}-"})
+    assert open_ended.content == body[-10:]
+
+    bad = client.get(url, headers={**auth_headers(token), "Range": f"bytes={size}-"})
+    assert bad.status_code == 416
+    assert bad.headers["content-range"] == f"bytes */{size}"
+
+    # Stale If-Range -> whole image
+    stale = client.get(url, headers={**auth_headers(token), "Range": "bytes=0-9", "If-Range": '"0000"'})
+    assert stale.status_code == 200
+    assert stale.content == body
+    fresh = client.get(url, headers={**auth_headers(token), "Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206
+    assert fresh.content == body[:10]
+
+
+def test_db_store_iter_bytes_uses_incremental_blob_io(client: TestClient, db_session, engine):
+    # sqlite substr() loads the whole value per call; blobopen reads only the pages asked for
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    data = os.urandom(2 * 1024 * 1024 + 123)
+    store = DbTradeImageStore(db_session, chunk_size=64 * 1024)
+    meta = store.save(trade_id=trade_id, kind="CHART", data=data, mime="image/webp")
+
+    statements: list[str] = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        chunks = list(store.iter_bytes(meta))
+        assert b"".join(chunks) == data
+        assert max(len(c) for c in chunks) == 64 * 1024
+        assert b"".join(store.iter_bytes(meta, start=70_000, end=200_001)) == data[70_000:200_001]
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert not any("substr" in s.lower() for s in statements)
+
+    # Blob collected mid-download: the stream just ends
+    stream = store.iter_bytes(meta)
+    next(stream)
+    store.delete(trade_id=trade_id, kind="CHART")
+    assert list(stream) == []
+
+
+def test_fs_store_range_request(client: TestClient, fs_image_store: Path):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+    url = f"/api/v1/trades/{trade_id}/chart"
+
+    body = client.get(url, headers=auth_headers(token)).content
+    part = client.get(url, headers={**auth_headers(token), "Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.content == body[10:20]
+
+
+def test_trade_chart_thumbnail_renditions(client: TestClient, db_session):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+
+    kinds = set(db_session.scalars(select(TradeImage.kind).where(TradeImage.trade_id == trade_id)))
+    assert kinds == {"CHART", "CHART_MEDIUM", "CHART_THUMB"}
+
+    url = f"/api/v1/trades/{trade_id}/chart"
+    sizes = {}
+    for size in ("full", "medium", "thumb"):
+        r = client.get(url, params={"size": size}, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        with Image.open(BytesIO(r.content)) as img:
+            sizes[size] = (max(img.size), len(r.content))
+
+    assert sizes["medium"][0] <= 800 and sizes["thumb"][0] <= 320
+    assert sizes["thumb"][1] < sizes["medium"][1] < sizes["full"][1]
+
+
+def test_trade_chart_thumb_falls_back_to_full_chart(client: TestClient, db_session):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    # Uploaded before renditions existed
+    DbTradeImageStore(db_session).save(trade_id=trade_id, kind="CHART", data=b"legacy", mime="image/webp")
+
+    r = client.get(f"/api/v1/trades/{trade_id}/chart?size=thumb", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.content == b"legacy"
+
+
+def _encoded(img: Image.Image, fmt: str, **kw) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format=fmt, **kw)
+    return buf.getvalue()
+
+
+def test_compress_rejects_decompression_bomb_before_decoding():
+    # ~50M pixels declared in a few KB of PNG
+    bomb = _encoded(Image.new("1", (10_000, 5_000)), "PNG")
+    assert len(bomb) < 100_000
+
+    with pytest.raises(ImageTooLargeError):
+        compress_chart_renditions(bomb)
+
+
+def test_compress_large_jpeg_uses_draft_decode(monkeypatch):
+    jpeg = _encoded(Image.linear_gradient("L").resize((4000, 3000)).convert("RGB"), "JPEG", quality=85)
+
+    loaded_sizes = []
+    real_load = Image.Image.load
+
+    def spy_load(self):
+        out = real_load(self)
+        loaded_sizes.append(self.size)
+        return out
+
+    monkeypatch.setattr(Image.Image, "load", spy_load)
+    renditions = compress_chart_renditions(jpeg)
+
+    # Decoded at 1/2 scale (2000x1500), never at 4000x3000
+    assert (4000, 3000) not in loaded_sizes
+    monkeypatch.undo()
+    with Image.open(BytesIO(renditions["CHART"][0])) as out:
+        assert out.size == (1600, 1200)
+
+
+def test_image_byte_cache_evicts_by_size():
+    cache = ImageByteCache(max_bytes=10, max_item_bytes=6)
+    cache.put(("t1", "CHART", "a"), b"aaaa")
+    cache.put(("t2", "CHART", "b"), b"bbbb")
+    assert cache.get(("t1", "CHART", "a")) == b"aaaa"  # t1 is now most recent
+
+    cache.put(("t3", "CHART", "c"), b"cccc")  # 12 bytes > 10: drop LRU (t2)
+    assert cache.get(("t2", "CHART", "b")) is None
+    assert cache.get(("t1", "CHART", "a")) == b"aaaa"
+
+    cache.put(("t4", "CHART", "d"), b"d" * 7)  # over the per-item cap, not cached
+    assert cache.get(("t4", "CHART", "d")) is None
+
+    cache.invalidate("t1", "CHART")
+    assert cache.get(("t1", "CHART", "a")) is None
+    assert cache.stats() == {
+        "entries": 1, "bytes": 4, "max_bytes": 10, "hits": 2, "misses": 3, "evictions": 1,
+    }
+
+
+def test_trade_chart_repeat_get_served_from_cache(client: TestClient, engine):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+    url = f"/api/v1/trades/{trade_id}/chart"
+
+    first = client.get(url, headers=auth_headers(token))
+    hits = chart_image_cache.hits
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        again = client.get(url, headers=auth_headers(token))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert again.content == first.content
+    assert chart_image_cache.hits == hits + 1
+    assert not any("blobs" in s for s in statements)
+
+    # Re-upload evicts the old bytes; the new ETag is a different key anyway
+    client.post(
+        url, headers=auth_headers(token),
+        files={"file": ("chart.png", _encoded(Image.new("RGB", (64, 64), "red"), "PNG"), "image/png")},
+    )
+    fresh = client.get(url, headers=auth_headers(token))
+    assert fresh.headers["etag"] != first.headers["etag"]
+    assert fresh.content != first.content
+
+
+def _blob_refs(db_session) -> dict[str, int]:
+    db_session.expire_all()
+    return dict(db_session.execute(select(Blob.sha256, Blob.refcount)).all())
+
+
+def test_db_store_dedupes_blobs_and_delete_chart_collects_them(client: TestClient, db_session):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    first = create_trade(client, token)["id"]
+    second = create_trade(client, token)["id"]
+    _upload_chart(client, token, first)
+    _upload_chart(client, token, second)
+
+    # Full chart + 2 renditions, each stored once and used by both trades
+    refs = _blob_refs(db_session)
+    assert len(refs) == 3 and set(refs.values()) == {2}
+    assert db_session.scalar(select(func.count()).where(Blob.data.is_not(None))) == 3
+
+    r = client.delete(f"/api/v1/trades/{first}/chart", headers=auth_headers(token))
+    assert r.status_code == 204, r.text
+    assert set(_blob_refs(db_session).values()) == {1}
+    assert client.get(f"/api/v1/trades/{first}/chart", headers=auth_headers(token)).status_code == 404
+    assert client.get(f"/api/v1/trades/{second}/chart", headers=auth_headers(token)).status_code == 200
+
+    assert client.delete(f"/api/v1/trades/{second}/chart", headers=auth_headers(token)).status_code == 204
+    assert _blob_refs(db_session) == {}
+    assert client.delete(f"/api/v1/trades/{second}/chart", headers=auth_headers(token)).status_code == 404
+
+
+def test_account_deletion_releases_chart_blobs(client: TestClient, db_session):
+    register_user(client, "a@example.com", "alice", "test1234")
+    register_user(client, "b@example.com", "bob", "test1234")
+    token_a = login_user(client, "a@example.com", "test1234")
+    token_b = login_user(client, "b@example.com", "test1234")
+    _upload_chart(client, token_a, create_trade(client, token_a)["id"])
+    shared = create_trade(client, token_b)["id"]
+    _upload_chart(client, token_b, shared)
+
+    r = client.request(
+        "DELETE", "/api/v1/profile", headers=auth_headers(token_a), json={"current_password": "test1234"}
+    )
+    assert r.status_code == 204, r.text
+    assert set(_blob_refs(db_session).values()) == {1}  # bob's references remain
+
+    r = client.request(
+        "DELETE", "/api/v1/profile", headers=auth_headers(token_b), json={"current_password": "test1234"}
+    )
+    assert r.status_code == 204, r.text
+    assert _blob_refs(db_session) == {}
+
+
+def test_batch_get_chart_metadata_and_zip(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    register_user(client, "b@example.com", "bob", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    token_b = login_user(client, "b@example.com", "test1234")
+    with_chart = create_trade(client, token)["id"]
+    without_chart = create_trade(client, token)["id"]
+    foreign = create_trade(client, token_b)["id"]
+    _upload_chart(client, token, with_chart)
+    _upload_chart(client, token_b, foreign)
+
+    ids = [with_chart, without_chart, foreign, "nope"]
+    r = client.post(
+        "/api/v1/trades/charts:batchGet",
+        headers=auth_headers(token),
+        json={"trade_ids": ids, "size": "thumb"},
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [i["trade_id"] for i in body["items"]] == [with_chart]
+    assert body["items"][0]["kind"] == "CHART_THUMB"
+    assert body["missing"] == [without_chart, foreign, "nope"]
+
+    thumb = client.get(f"/api/v1/trades/{with_chart}/chart?size=thumb", headers=auth_headers(token))
+    assert body["items"][0]["sha256"] == thumb.headers["etag"]
+
+    z = client.post(
+        "/api/v1/trades/charts:batchGet",
+        headers=auth_headers(token),
+        json={"trade_ids": ids, "size": "thumb", "format": "zip"},
+    )
+    assert z.status_code == 200, z.text
+    assert z.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(BytesIO(z.content)) as zf:
+        assert zf.namelist() == ["manifest.json", f"{with_chart}.webp"]
+        assert json.loads(zf.read("manifest.json")) == body
+        assert zf.read(f"{with_chart}.webp") == thumb.content
+
+
+def test_upload_rejected_from_content_length_before_parsing(client: TestClient, monkeypatch):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    spooled = []
+    monkeypatch.setattr("app.api.v1.endpoints.trades.spool_chart_upload", lambda *a, **kw: spooled.append(1))
+
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        headers=auth_headers(token),
+        files={"file": ("big.png", b"x" * (settings.MAX_REQUEST_BODY_BYTES + 1), "image/png")},
+    )
+    assert up.status_code == 413, up.text
+    assert "Request body too large" in up.json()["detail"]
+    assert spooled == []
+
+
+def test_body_limit_rejection_keeps_cors_headers(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    origin = "http://localhost:3000"
+
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        headers={**auth_headers(token), "Origin": origin},
+        files={"file": ("big.png", b"x" * (settings.MAX_REQUEST_BODY_BYTES + 1), "image/png")},
+    )
+    assert up.status_code == 413, up.text
+    assert up.headers["access-control-allow-origin"] == origin
+
+
+def test_body_limit_aborts_chunked_body_while_receiving():
+    async def read_all(scope, receive, send):
+        await Request(scope, receive).body()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    limited = BodySizeLimitMiddleware(read_all, max_bytes=1024 * 1024)
+    received = 0
+    sent: list[dict] = []
+
+    async def receive():  # endless chunked body, no Content-Length
+        nonlocal received
+        received += 1
+        return {"type": "http.request", "body": b"x" * (256 * 1024), "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": [], "query_string": b""}
+    asyncio.run(limited(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert received == 5  # stopped on the chunk that crossed 1 MB
+
+
+def test_spool_chart_upload_stops_at_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CHART_SPOOL_DIR", str(tmp_path))
+
+    class Source:
+        reads = 0
+
+        def read(self, n: int) -> bytes:
+            self.reads += 1
+            return b"x" * n
+
+    src = Source()  # endless stream
+    with pytest.raises(ImageTooLargeError):
+        spool_chart_upload(src, max_bytes=3 * 1024 * 1024)
+    assert src.reads == 4  # 1 MB chunks: the 4th one crosses the cap
+    assert list(tmp_path.iterdir()) == []
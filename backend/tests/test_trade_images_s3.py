@@ -0,0 +1,131 @@
+# tests/test_trade_images_s3.py
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from app.core.config import settings
+from app.models.blob import Blob
+from app.models.trade_image import TradeImage
+from app.services.storage import s3_store
+from app.services.storage.s3_store import S3TradeImageStore
+from tests.utils.auth import auth_headers, login_user, register_user
+from tests.utils.trades import create_trade
+
+CHART_PATH = Path(__file__).parent / "assets" / "MT5_chart.png"
+BUCKET = "trade-calc-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "TRADE_IMAGE_STORE", "s3")
+    monkeypatch.setattr(settings, "S3_BUCKET", BUCKET)
+    monkeypatch.setattr(settings, "S3_REGION", "us-east-1")
+    monkeypatch.setattr(settings, "S3_ENDPOINT_URL", None)
+
+    with moto.mock_aws():
+        s3_store.reset_s3_client()
+        client = s3_store.get_s3_client()
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+    s3_store.reset_s3_client()
+
+
+def _upload_chart(client: TestClient, token: str, trade_id: str) -> None:
+    up = client.post(
+        f"/api/v1/trades/{trade_id}/chart",
+        headers=auth_headers(token),
+        files={"file": ("mt5_chart.png", CHART_PATH.read_bytes(), "image/png")},
+    )
+    assert up.status_code == 204, up.text
+
+
+def test_s3_store_upload_and_streamed_get(client: TestClient, db_session, s3):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    _upload_chart(client, token, trade_id)
+
+    row = db_session.scalars(
+        select(TradeImage).where(TradeImage.trade_id == trade_id, TradeImage.kind == "CHART")
+    ).one()
+    assert db_session.get(Blob, row.sha256).data is None
+    obj = s3.get_object(Bucket=BUCKET, Key=f"trade-images/{row.sha256[:2]}/{row.sha256}")
+    assert obj["ContentType"] == "image/webp"
+    stored = obj["Body"].read()
+
+    get_img = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token))
+    assert get_img.status_code == 200, get_img.text
+    assert get_img.headers["etag"] == row.sha256
+    assert get_img.content == stored
+
+
+def test_s3_store_dedupe_and_delete(db_session, client: TestClient, s3):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    first = create_trade(client, token)["id"]
+    second = create_trade(client, token)["id"]
+    _upload_chart(client, token, first)
+    _upload_chart(client, token, second)
+
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 3  # full chart + 2 renditions
+
+    store = S3TradeImageStore(db_session, client=s3, bucket=BUCKET)
+    store.delete(trade_id=first, kind="CHART")
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 3
+    store.delete(trade_id=second, kind="CHART")
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 2
+
+
+def test_s3_store_multipart_upload(db_session, client: TestClient, s3):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+
+    part = 5 * 1024 * 1024  # S3 minimum part size
+    store = S3TradeImageStore(
+        db_session, client=s3, bucket=BUCKET, multipart_threshold=part, multipart_chunksize=part
+    )
+    data = os.urandom(part + 1024)
+    meta = store.save(trade_id=trade_id, kind="CHART", data=data, mime="image/webp")
+
+    head = s3.head_object(Bucket=BUCKET, Key=store.key(meta.sha256))
+    assert head["ETag"].strip('"').endswith("-2")  # two parts
+    assert store.get(trade_id=trade_id, kind="CHART").data == data
+
+
+def test_s3_store_presigned_redirect(client: TestClient, s3, monkeypatch):
+    monkeypatch.setattr(settings, "S3_PRESIGNED_REDIRECTS", True)
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+
+    r = client.get(f"/api/v1/trades/{trade_id}/chart", headers=auth_headers(token), follow_redirects=False)
+    assert r.status_code == 307, r.text
+    location = r.headers["location"]
+    assert BUCKET in location and "Signature" in location
+
+
+def test_s3_store_range_request(client: TestClient, s3):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    trade_id = create_trade(client, token)["id"]
+    _upload_chart(client, token, trade_id)
+    url = f"/api/v1/trades/{trade_id}/chart"
+
+    body = client.get(url, headers=auth_headers(token)).content
+    part = client.get(url, headers={**auth_headers(token), "Range": "bytes=-256"})
+    assert part.status_code == 206, part.text
+    assert part.content == body[-256:]
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import csv
+import io
+import json
+
+import httpx
 from fastapi.testclient import TestClient
 
+from app.db.session import async_database_url, pool_kwargs
+from app.main import app
 from tests.utils.auth import auth_headers, login_user, register_user
-from tests.utils.trades import create_trade
+from tests.utils.trades import create_trade, make_trade_payload
 
 
 def test_trades_create_requires_auth(client: TestClient):
@@ -41,7 +49,7 @@ def test_trades_create_and_get_and_list(client: TestClient):
     # list (newest first)
     lst = client.get("/api/v1/trades", headers=auth_headers(token))
     assert lst.status_code == 200, lst.text
-    items = lst.json()
+    items = lst.json()["items"]
     assert len(items) >= 1
     assert items[0]["id"] == trade_id
 
@@ -100,3 +108,208 @@ def test_trades_patch_limited_fields(client: TestClient):
         headers=auth_headers(token),
     )
     assert bad.status_code == 422, bad.text
+
+
+def test_trades_list_keyset_pagination(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    created_ids = [create_trade(client, token)["id"] for _ in range(5)]
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/trades", params=params, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert len(body["items"]) <= 2
+        seen.extend(t["id"] for t in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 5
+    # newest first
+    assert seen == list(reversed(created_ids))
+
+
+def test_trades_list_invalid_cursor(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    r = client.get("/api/v1/trades", params={"cursor": "not-a-cursor"}, headers=auth_headers(token))
+    assert r.status_code == 400, r.text
+
+
+def test_trades_list_filters(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    closed_gold = create_trade(
+        client, token,
+        journal={"status": "CLOSED", "closed_at": "2026-02-10T12:00:00", "realized_pnl_chf": 25.0},
+    )
+    create_trade(
+        client, token,
+        journal={"status": "CLOSED", "closed_at": "2025-11-10T12:00:00", "realized_pnl_chf": -10.0},
+    )
+    create_trade(client, token, inputs={"symbol": "EURUSD", "direction": "LONG"})
+    create_trade(client, token)
+
+    r = client.get(
+        "/api/v1/trades",
+        params={
+            "status": "CLOSED",
+            "symbol": "XAUUSD",
+            "closed_from": "2026-01-01T00:00:00",
+            "closed_to": "2026-04-01T00:00:00",
+        },
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert [t["id"] for t in r.json()["items"]] == [closed_gold["id"]]
+
+    r = client.get("/api/v1/trades", params={"direction": "LONG"}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    items = r.json()["items"]
+    assert len(items) == 1
+    assert items[0]["symbol"] == "EURUSD"
+
+    bad = client.get("/api/v1/trades", params={"status": "NOPE"}, headers=auth_headers(token))
+    assert bad.status_code == 422, bad.text
+
+
+def test_trades_list_sort_paginates_with_nulls_last(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    for pnl in (5.0, -3.0, 12.0):
+        create_trade(client, token, journal={"status": "CLOSED", "realized_pnl_chf": pnl})
+    open_ids = {create_trade(client, token)["id"] for _ in range(2)}  # realized_pnl_chf is NULL
+
+    pnls: list[float | None] = []
+    ids: list[str] = []
+    cursor = None
+    while True:
+        params = {"sort_by": "realized_pnl_chf", "sort_dir": "desc", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/trades", params=params, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        body = r.json()
+        ids.extend(t["id"] for t in body["items"])
+        for t in body["items"]:
+            got = client.get(f"/api/v1/trades/{t['id']}", headers=auth_headers(token)).json()
+            pnls.append(got["journal"]["realized_pnl_chf"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pnls[:3] == [12.0, 5.0, -3.0]
+    assert set(ids[3:]) == open_ids
+    assert len(ids) == len(set(ids)) == 5
+
+    # A cursor only makes sense for the sort order it was issued for
+    first = client.get(
+        "/api/v1/trades",
+        params={"sort_by": "realized_pnl_chf", "limit": 1},
+        headers=auth_headers(token),
+    ).json()
+    mismatched = client.get(
+        "/api/v1/trades",
+        params={"sort_by": "created_at", "cursor": first["next_cursor"]},
+        headers=auth_headers(token),
+    )
+    assert mismatched.status_code == 400, mismatched.text
+
+
+def test_trades_export_csv_and_ndjson(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+
+    first = create_trade(client, token)
+    second = create_trade(client, token, journal={"status": "CLOSED", "realized_pnl_chf": 12.5})
+
+    r = client.get("/api/v1/trades/export", params={"format": "csv"}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "attachment" in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["id"] for row in rows] == [first["id"], second["id"]]  # oldest first
+    assert rows[1]["realized_pnl_chf"] == "12.5"
+    assert rows[0]["realized_pnl_chf"] == ""
+
+    r = client.get(
+        "/api/v1/trades/export",
+        params={"format": "ndjson", "status": "CLOSED"},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["id"] == second["id"]
+    assert lines[0]["symbol"] == "XAUUSD"
+
+
+def test_trades_export_only_own_trades(client: TestClient):
+    register_user(client, "a@example.com", "alice", "test1234")
+    register_user(client, "b@example.com", "bob", "test1234")
+    token_a = login_user(client, "a@example.com", "test1234")
+    token_b = login_user(client, "b@example.com", "test1234")
+
+    create_trade(client, token_a)
+
+    r = client.get("/api/v1/trades/export", params={"format": "ndjson"}, headers=auth_headers(token_b))
+    assert r.status_code == 200, r.text
+    assert r.text == ""
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert async_database_url("postgresql+psycopg://u:p@db/trades") == "postgresql+asyncpg://u:p@db/trades"
+
+
+def test_sqlite_connections_get_pragmas_and_pool_settings(engine):
+    with engine.connect() as conn:
+        pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()  # noqa: E731
+        assert pragma("foreign_keys") == 1
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 5000
+        assert pragma("cache_size") == -64 * 1024
+
+    assert pool_kwargs("sqlite:///./dev.db")["pool_size"] == 5
+    assert "pool_size" not in pool_kwargs("sqlite://")  # in-memory: single-connection pool
+
+
+def test_trades_concurrent_creates_on_async_session(client: TestClient):
+    # TestClient serializes requests; an ASGI transport lets the async endpoints overlap
+    register_user(client, "a@example.com", "alice", "test1234")
+    token = login_user(client, "a@example.com", "test1234")
+    closed = make_trade_payload(
+        journal={"status": "CLOSED", "closed_at": "2026-03-02T12:00:00", "realized_pnl_chf": 5.0, "realized_r_multiple": 0.5}
+    )
+
+    async def burst() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            creates = [ac.post("/api/v1/trades", json=closed, headers=auth_headers(token)) for _ in range(8)]
+            lists = [ac.get("/api/v1/trades", headers=auth_headers(token)) for _ in range(4)]
+            return await asyncio.gather(*creates, *lists)
+
+    responses = asyncio.run(burst())
+    assert [r.status_code for r in responses] == [201] * 8 + [200] * 4
+
+    lst = client.get("/api/v1/trades", params={"limit": 20}, headers=auth_headers(token))
+    assert len(lst.json()["items"]) == 8
+
+    # Rollup updates ran (via run_sync) in each create's transaction
+    stats = client.get("/api/v1/analytics/stats", headers=auth_headers(token)).json()
+    assert stats["trade_count"] == 8
+    assert stats["total_pnl_chf"] == 40.0